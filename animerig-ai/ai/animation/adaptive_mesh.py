@@ -0,0 +1,189 @@
+"""
+Landmark-adaptive animation mesh
+Dense vertices around facial features and along the silhouette, sparse inside the body, triangulated over the foreground mask
+"""
+
+import logging
+from typing import Dict, Mapping, Optional, Tuple
+
+import cv2
+import numpy as np
+from scipy.spatial import Delaunay, QhullError
+
+logger = logging.getLogger(__name__)
+
+# Vertex spacing per zone, in cells of the uniform mesh_density grid
+FEATURE_SPACING = 1.0
+SILHOUETTE_SPACING = 1.0
+INTERIOR_SPACING = 3.0
+FEATURE_MARGIN = 0.25  # Facial boxes are grown by this fraction of their size on each side
+
+
+def foreground_mask(image: np.ndarray, threshold: int = 16) -> np.ndarray:
+    """
+    Character segmentation as a uint8 0/255 mask
+
+    Uses the alpha channel when the image has a non-trivial one; otherwise
+    pixels that differ from the median border colour by more than threshold.
+    Falls back to the whole image when nothing is found.
+    """
+    if image.ndim == 3 and image.shape[2] == 4 and image[:, :, 3].min() < 255:
+        mask = np.where(image[:, :, 3] > threshold, 255, 0).astype(np.uint8)
+    else:
+        color = image[:, :, :3] if image.ndim == 3 else image[:, :, np.newaxis]
+        border = np.concatenate([color[0], color[-1], color[:, 0], color[:, -1]])
+        difference = np.abs(color.astype(np.int16) - np.median(border, axis=0)).max(axis=2)
+        mask = np.where(difference > threshold, 255, 0).astype(np.uint8)
+
+        kernel = np.ones((5, 5), np.uint8)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+
+    if not mask.any():
+        mask[:] = 255
+    return mask
+
+
+def resample_contour(contour: np.ndarray, spacing: float) -> np.ndarray:
+    """Points at (approximately) equal arc-length spacing around a closed (N, 2) polyline"""
+    closed = np.vstack([contour, contour[:1]]).astype(np.float64)
+    arc = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(closed, axis=0), axis=1))])
+    count = max(3, int(round(arc[-1] / spacing)))
+    targets = np.arange(count) * (arc[-1] / count)
+    return np.column_stack([np.interp(targets, arc, closed[:, 0]), np.interp(targets, arc, closed[:, 1])])
+
+
+def silhouette_points(mask: np.ndarray, spacing: float) -> np.ndarray:
+    """Resampled outer contours of every foreground blob larger than one spacing cell"""
+    contours = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)[-2]
+    points = [resample_contour(contour[:, 0, :], spacing) for contour in contours
+              if cv2.contourArea(contour) >= spacing * spacing]
+    return np.vstack(points) if points else np.zeros((0, 2))
+
+
+def lattice_points(x1: float, y1: float, x2: float, y2: float, spacing: float) -> np.ndarray:
+    """Hexagonal lattice (alternate rows offset by half a spacing) covering a box"""
+    row_step = spacing * np.sqrt(3.0) / 2.0
+    ys = np.arange(y1, y2 + 1e-9, row_step)
+    xs = np.arange(x1, x2 + 1e-9, spacing)
+    offsets = (np.arange(len(ys)) % 2) * (spacing / 2.0)
+    x = (xs[np.newaxis, :] + offsets[:, np.newaxis]).ravel()
+    y = np.repeat(ys, len(xs))
+    keep = x <= x2
+    return np.column_stack([x[keep], y[keep]])
+
+
+def feature_boxes(regions: Mapping[str, Tuple[float, float, float, float]], width: int,
+                  height: int) -> np.ndarray:
+    """Normalized facial region boxes grown by FEATURE_MARGIN, in pixels, (R, 4)"""
+    if not regions:
+        return np.zeros((0, 4))
+    boxes = np.array(list(regions.values()), dtype=np.float64) * np.array([width, height, width, height])
+    grow = (boxes[:, 2:] - boxes[:, :2]) * FEATURE_MARGIN
+    boxes[:, :2] -= grow
+    boxes[:, 2:] += grow
+    return np.clip(boxes, 0.0, [width - 1, height - 1, width - 1, height - 1])
+
+
+def _inside_boxes(points: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    if len(boxes) == 0:
+        return np.zeros(len(points), dtype=bool)
+    x = points[:, 0:1]
+    y = points[:, 1:2]
+    return np.any((x >= boxes[:, 0]) & (x <= boxes[:, 2]) & (y >= boxes[:, 1]) & (y <= boxes[:, 3]), axis=1)
+
+
+def _sample(field: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Nearest-pixel lookup of a 2D array at (x, y) points"""
+    height, width = field.shape
+    x = np.clip(np.rint(points[:, 0]).astype(np.intp), 0, width - 1)
+    y = np.clip(np.rint(points[:, 1]).astype(np.intp), 0, height - 1)
+    return field[y, x]
+
+
+def triangulate_in_mask(points: np.ndarray, mask: np.ndarray, min_area: float = 1e-6) -> np.ndarray:
+    """
+    Delaunay triangles of the points that stay inside the mask
+
+    The silhouette is densely sampled, so it is (nearly) conforming; a
+    triangle is kept only if its centroid and edge midpoints all fall in
+    the mask, which drops the hull triangles that bridge concavities.
+    Slivers under min_area (e.g. along straight silhouette runs) are dropped.
+    Triangles are wound like the uniform grid's (positive cross product in
+    image coordinates). Returns no triangles when the points cannot be
+    triangulated (fewer than three, or all collinear).
+    """
+    if len(points) < 3:
+        return np.zeros((0, 3), dtype=np.intp)
+    try:
+        triangles = Delaunay(points).simplices
+    except QhullError as e:
+        logger.debug(f"Adaptive mesh triangulation failed: {e}")
+        return np.zeros((0, 3), dtype=np.intp)
+    corners = points[triangles]
+
+    probes = np.concatenate([corners.mean(axis=1, keepdims=True),
+                             (corners + corners[:, [1, 2, 0]]) / 2.0], axis=1)
+    inside = _sample(mask, probes.reshape(-1, 2)).reshape(-1, 4) > 0
+    cross = ((corners[:, 1, 0] - corners[:, 0, 0]) * (corners[:, 2, 1] - corners[:, 0, 1])
+             - (corners[:, 1, 1] - corners[:, 0, 1]) * (corners[:, 2, 0] - corners[:, 0, 0]))
+    keep = inside.all(axis=1) & (np.abs(cross) > 2.0 * min_area)
+
+    triangles = triangles[keep]
+    flip = cross[keep] < 0
+    triangles[flip] = triangles[flip][:, [0, 2, 1]]
+    return triangles
+
+
+def build_adaptive_mesh(image: np.ndarray, regions: Mapping[str, Tuple[float, float, float, float]],
+                        mesh_density: int = 50, mask: Optional[np.ndarray] = None) -> Optional[Dict]:
+    """
+    Animation mesh with vertices where deformation happens
+
+    Spacings are multiples of the cell size of a mesh_density x mesh_density
+    grid: facial feature boxes and the silhouette get grid-cell spacing, the
+    rest of the foreground INTERIOR_SPACING cells, and the background none.
+    Returns the same keys as the uniform grid mesh plus 'layout', or None
+    when the foreground is too small to triangulate at this density.
+    """
+    height, width = image.shape[:2]
+    mask = foreground_mask(image) if mask is None else mask
+    cell = max(width, height) / mesh_density
+
+    # A 1px dilation keeps probes on anti-aliased edges inside the mask
+    probe_mask = cv2.dilate(mask, np.ones((3, 3), np.uint8))
+    depth = cv2.distanceTransform(mask, cv2.DIST_L2, 3)
+
+    boundary = silhouette_points(mask, cell * SILHOUETTE_SPACING)
+
+    boxes = feature_boxes(regions, width, height)
+    features = [lattice_points(*box, cell * FEATURE_SPACING) for box in boxes]
+    features = np.vstack(features) if features else np.zeros((0, 2))
+    features = features[_sample(depth, features) >= cell * FEATURE_SPACING * 0.5]
+
+    interior = lattice_points(0.0, 0.0, width - 1, height - 1, cell * INTERIOR_SPACING)
+    interior = interior[(_sample(depth, interior) >= cell * INTERIOR_SPACING * 0.5)
+                        & ~_inside_boxes(interior, boxes)]
+
+    points = np.unique(np.round(np.vstack([boundary, features, interior]), 2), axis=0)
+    triangles = triangulate_in_mask(points, probe_mask, min_area=0.01 * cell * cell)
+    if len(triangles) == 0:
+        logger.debug(f"Adaptive mesh: no triangles from {len(points)} points at density {mesh_density}")
+        return None
+
+    # Drop vertices no kept triangle uses
+    used, triangles = np.unique(triangles, return_inverse=True)
+    vertices = points[used].astype(np.float32)
+    triangles = triangles.reshape(-1, 3).astype(np.int32)
+
+    logger.debug(f"Adaptive mesh: {len(vertices)} vertices ({len(boundary)} silhouette, "
+                 f"{len(features)} feature, {len(interior)} interior), {len(triangles)} triangles")
+    return {
+        'vertices': vertices,
+        'triangles': triangles,
+        'uv_coords': vertices / np.array([width, height], dtype=np.float32),
+        'bone_weights': np.zeros((len(vertices), 4), dtype=np.float32),
+        'bone_indices': np.zeros((len(vertices), 4), dtype=np.int32),
+        'mesh_density': mesh_density,
+        'layout': 'adaptive'
+    }
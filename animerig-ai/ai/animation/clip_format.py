@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Binary animation clip container
+A fixed header, a JSON directory and 64-byte aligned little-endian track blocks that load via np.memmap
+
+Layout:
+    header     magic 'ACLP', version, directory offset/length, data offset
+    directory  UTF-8 JSON: duration, metadata, and per track name/keys/dimensions/offsets
+    blocks     per track: float64 times (N,) then float32 values (N, D), each 64-byte aligned
+
+Usage:
+    python -m ai.animation.clip_format animation.json animation.aclip
+    python -m ai.animation.clip_format animation.aclip animation.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import struct
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from ..animation_synthesis.tracks import Track
+
+logger = logging.getLogger(__name__)
+
+CLIP_MAGIC = b'ACLP'
+CLIP_FORMAT_VERSION = 1
+CLIP_EXTENSION = '.aclip'
+BLOCK_ALIGNMENT = 64
+
+_HEADER = struct.Struct('<4sHHQQQ')  # magic, version, flags, directory offset, directory length, data offset
+_HEADER_SIZE = BLOCK_ALIGNMENT
+
+# Field order of a skeleton transform track row
+SKELETON_FIELDS = ('position', 'rotation', 'scale')
+
+
+@dataclass
+class AnimationClip:
+    """Named tracks plus JSON-safe metadata; arrays may be read-only views into a mapped file"""
+    tracks: Dict[str, Track] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    duration: float = 0.0
+
+    def iter_tracks(self):
+        """Yield (name, track) pairs - lets a clip be passed straight to SequenceSampler"""
+        return iter(self.tracks.items())
+
+    @property
+    def nbytes(self) -> int:
+        return sum(track.nbytes for track in self.tracks.values())
+
+
+def _align(offset: int) -> int:
+    return (offset + BLOCK_ALIGNMENT - 1) // BLOCK_ALIGNMENT * BLOCK_ALIGNMENT
+
+
+def json_safe(value: Any) -> Any:
+    """Convert numpy scalars/arrays (and tuples) into plain JSON types"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(k): json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(v) for v in value]
+    return value
+
+
+def write_clip(path: str, tracks: Union[AnimationClip, Dict[str, Track], Iterable[Tuple[str, Track]]],
+               metadata: Optional[Dict[str, Any]] = None, duration: Optional[float] = None):
+    """
+    Write tracks to a clip file
+
+    Accepts an AnimationClip, an AnimationSequence (anything with iter_tracks()),
+    a mapping or an iterable of (name, track) pairs. The file is written to a
+    temporary path and moved into place, so readers never see a partial clip.
+    """
+    if isinstance(tracks, AnimationClip):
+        metadata = tracks.metadata if metadata is None else metadata
+        duration = tracks.duration if duration is None else duration
+    if duration is None:
+        duration = getattr(tracks, 'duration', None)
+
+    if hasattr(tracks, 'iter_tracks'):
+        named_tracks = list(tracks.iter_tracks())
+    elif isinstance(tracks, dict):
+        named_tracks = list(tracks.items())
+    else:
+        named_tracks = list(tracks)
+
+    if duration is None:
+        duration = max((float(track.times[-1]) for _, track in named_tracks if len(track)), default=0.0)
+
+    # Lay out every block before writing so the directory can record absolute offsets
+    entries = []
+    offset = 0
+    for name, track in named_tracks:
+        times_offset = _align(offset)
+        values_offset = _align(times_offset + len(track) * 8)
+        offset = values_offset + len(track) * track.dimensions * 4
+        entries.append({
+            'name': name,
+            'keys': len(track),
+            'dimensions': track.dimensions,
+            'times_offset': times_offset,
+            'values_offset': values_offset
+        })
+
+    directory = json.dumps({
+        'duration': float(duration),
+        'metadata': json_safe(metadata or {}),
+        'tracks': entries
+    }).encode('utf-8')
+    data_offset = _align(_HEADER_SIZE + len(directory))
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        header = _HEADER.pack(CLIP_MAGIC, CLIP_FORMAT_VERSION, 0, _HEADER_SIZE, len(directory), data_offset)
+        f.write(header.ljust(_HEADER_SIZE, b'\0'))
+        f.write(directory)
+
+        for entry, (_, track) in zip(entries, named_tracks):
+            f.seek(data_offset + entry['times_offset'])
+            f.write(np.ascontiguousarray(track.times, dtype='<f8').tobytes())
+            f.seek(data_offset + entry['values_offset'])
+            f.write(np.ascontiguousarray(track.values, dtype='<f4').tobytes())
+
+        # Pad so the last block is followed by a whole alignment unit
+        f.truncate(_align(data_offset + offset))
+    os.replace(temp_path, path)
+
+    logger.info(f"Wrote clip {path}: {len(entries)} tracks, {duration:.2f}s")
+
+
+def read_clip_header(path: str) -> Dict[str, Any]:
+    """Read only the header and directory of a clip (no track data is touched)"""
+    with open(path, 'rb') as f:
+        header = f.read(_HEADER_SIZE)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"Not an animation clip: {path}")
+
+        magic, version, _, directory_offset, directory_length, data_offset = _HEADER.unpack_from(header)
+        if magic != CLIP_MAGIC:
+            raise ValueError(f"Not an animation clip: {path}")
+        if version != CLIP_FORMAT_VERSION:
+            raise ValueError(f"Unsupported clip version {version}: {path}")
+
+        f.seek(directory_offset)
+        directory = json.loads(f.read(directory_length).decode('utf-8'))
+
+    directory['data_offset'] = data_offset
+    return directory
+
+
+def load_clip(path: str, mmap: bool = True) -> AnimationClip:
+    """
+    Open a clip file
+
+    With mmap=True the track arrays are read-only views into one memory map, so
+    opening is near-instant and samples are served from the page cache on demand.
+    """
+    directory = read_clip_header(path)
+    data_offset = directory['data_offset']
+
+    if mmap:
+        buffer = np.memmap(path, dtype=np.uint8, mode='r')
+    else:
+        with open(path, 'rb') as f:
+            buffer = np.frombuffer(f.read(), dtype=np.uint8)
+
+    tracks = {}
+    for entry in directory['tracks']:
+        keys = entry['keys']
+        dimensions = entry['dimensions']
+        times = np.ndarray((keys,), dtype='<f8', buffer=buffer,
+                           offset=data_offset + entry['times_offset'])
+        values = np.ndarray((keys, dimensions), dtype='<f4', buffer=buffer,
+                            offset=data_offset + entry['values_offset'])
+        tracks[entry['name']] = Track(times, values)
+
+    return AnimationClip(tracks=tracks, metadata=directory.get('metadata', {}),
+                         duration=float(directory.get('duration', 0.0)))
+
+
+def is_clip_file(path: str) -> bool:
+    """True if path starts with the clip magic"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(CLIP_MAGIC)) == CLIP_MAGIC
+    except OSError:
+        return False
+
+
+def clip_from_animation_data(animation_data: Dict[str, Any]) -> AnimationClip:
+    """
+    Convert the ProfessionalAnimator.export_animation_data JSON layout into a clip
+
+    Bones become 'skeleton.<bone>' tracks (position, rotation, scale per row),
+    blend shapes become one-channel 'face.<shape>' tracks, and render data and
+    animation state are carried as metadata. Static snapshots are single-key
+    tracks; keyed layouts ({'times': [...], 'values': [...]}) keep every key.
+    """
+    tracks: Dict[str, Track] = {}
+
+    for bone_name, transform in animation_data.get('skeletal_data', {}).items():
+        if 'times' in transform:
+            tracks[f"skeleton.{bone_name}"] = Track(transform['times'], transform['values'])
+            continue
+        row = np.concatenate([np.asarray(transform.get(name, [1.0, 1.0, 1.0] if name == 'scale' else [0.0, 0.0, 0.0]),
+                                         dtype=np.float32) for name in SKELETON_FIELDS])
+        tracks[f"skeleton.{bone_name}"] = Track(np.zeros(1), row[np.newaxis, :])
+
+    for shape_name, weight in animation_data.get('facial_data', {}).items():
+        if isinstance(weight, dict):
+            tracks[f"face.{shape_name}"] = Track(weight['times'], weight['values'])
+        else:
+            tracks[f"face.{shape_name}"] = Track(np.zeros(1), [[float(weight)]])
+
+    metadata = {
+        'render_data': json_safe(animation_data.get('render_data', {})),
+        'animation_state': json_safe(animation_data.get('animation_state', {}))
+    }
+    return AnimationClip(tracks=tracks, metadata=metadata)
+
+
+def clip_to_animation_data(clip: AnimationClip, time: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Convert a clip back into the export_animation_data JSON layout
+
+    Each track is reduced to its pose at the given time (the final key by default).
+    """
+    def pose_at(track: Track) -> np.ndarray:
+        if time is None or len(track) == 1:
+            return np.asarray(track.values[-1])
+        return np.array([np.interp(time, track.times, track.values[:, column])
+                         for column in range(track.dimensions)], dtype=np.float32)
+
+    skeletal_data = {}
+    facial_data = {}
+    for name, track in clip.tracks.items():
+        if len(track) == 0:
+            continue
+        group, _, channel = name.partition('.')
+        row = pose_at(track)
+        if group == 'skeleton':
+            skeletal_data[channel] = {field_name: row[i * 3:(i + 1) * 3].tolist()
+                                      for i, field_name in enumerate(SKELETON_FIELDS)}
+        elif group == 'face':
+            facial_data[channel] = float(row[0])
+
+    return {
+        'skeletal_data': skeletal_data,
+        'facial_data': facial_data,
+        'render_data': clip.metadata.get('render_data', {}),
+        'animation_state': clip.metadata.get('animation_state', {})
+    }
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Convert between the JSON export layout and binary clips (direction chosen by input type)"""
+    parser = argparse.ArgumentParser(description="Convert animation data between JSON and binary clips")
+    parser.add_argument('input', help="JSON export or .aclip file")
+    parser.add_argument('output', help="Output path")
+    args = parser.parse_args(argv)
+
+    if is_clip_file(args.input):
+        with open(args.output, 'w') as f:
+            json.dump(clip_to_animation_data(load_clip(args.input)), f, indent=2)
+    else:
+        with open(args.input, 'r') as f:
+            write_clip(args.output, clip_from_animation_data(json.load(f)))
+
+    print(f"Converted {args.input} -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Emotion preset blend matrix
+One (emotions x blend shapes) table so any emotion mixture resolves to blend shape weights in a single product
+"""
+
+import logging
+from typing import Dict, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Canonical emotion presets, keyed by facial blend shape name
+EMOTION_PRESETS: Dict[str, Dict[str, float]] = {
+    'happy': {
+        'eye_happy_L': 0.7, 'eye_happy_R': 0.7,
+        'mouth_smile_L': 0.8, 'mouth_smile_R': 0.8,
+        'cheek_puff_L': 0.3, 'cheek_puff_R': 0.3,
+        'brow_up_L': 0.2, 'brow_up_R': 0.2
+    },
+    'excited': {
+        'eye_wide_L': 0.9, 'eye_wide_R': 0.9,
+        'brow_up_L': 0.8, 'brow_up_R': 0.8,
+        'mouth_open': 0.6,
+        'mouth_smile_L': 0.9, 'mouth_smile_R': 0.9
+    },
+    'sad': {
+        'brow_down_L': 0.6, 'brow_down_R': 0.6,
+        'eye_squint_L': 0.4, 'eye_squint_R': 0.4,
+        'mouth_frown_L': 0.7, 'mouth_frown_R': 0.7
+    },
+    'surprised': {
+        'eye_wide_L': 1.0, 'eye_wide_R': 1.0,
+        'brow_up_L': 1.0, 'brow_up_R': 1.0,
+        'mouth_open': 0.8, 'jaw_open': 0.5
+    },
+    'angry': {
+        'brow_angry_L': 0.9, 'brow_angry_R': 0.9,
+        'eye_squint_L': 0.6, 'eye_squint_R': 0.6,
+        'mouth_frown_L': 0.8, 'mouth_frown_R': 0.8
+    }
+}
+
+EmotionMixture = Union[Mapping[str, float], np.ndarray]
+
+
+class EmotionBlendMatrix:
+    """
+    Precomputed emotion -> blend shape weight table
+
+    Row e holds the full weight vector of emotion e over shape_names, so a
+    mixture vector m (one weight per emotion) blends to m @ matrix. Rigs whose
+    shape names differ from the canonical ones pass aliases mapping each of
+    their shapes to the canonical shapes it averages.
+    """
+
+    def __init__(self, shape_names: Sequence[str],
+                 presets: Mapping[str, Mapping[str, float]] = EMOTION_PRESETS,
+                 aliases: Optional[Mapping[str, Sequence[str]]] = None):
+        self.emotions = tuple(presets)
+        self.shape_names = tuple(shape_names)
+        self.emotion_index = {name: i for i, name in enumerate(self.emotions)}
+        self.shape_index = {name: i for i, name in enumerate(self.shape_names)}
+
+        aliases = aliases or {}
+        self.matrix = np.zeros((len(self.emotions), len(self.shape_names)), dtype=np.float32)
+        for row, emotion in enumerate(self.emotions):
+            preset = presets[emotion]
+            for column, shape in enumerate(self.shape_names):
+                sources = aliases.get(shape, (shape,))
+                self.matrix[row, column] = sum(preset.get(source, 0.0) for source in sources) / len(sources)
+
+        self._mixture = np.zeros(len(self.emotions), dtype=np.float32)
+
+    def __contains__(self, emotion: str) -> bool:
+        return emotion in self.emotion_index
+
+    def mixture_vector(self, mixture: EmotionMixture, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Per-emotion weight vector for a {emotion: weight} mapping (unknown emotions are ignored)"""
+        if isinstance(mixture, np.ndarray):
+            return mixture
+        vector = self._mixture if out is None else out
+        vector[:] = 0.0
+        for emotion, weight in mixture.items():
+            index = self.emotion_index.get(emotion)
+            if index is not None:
+                vector[index] = weight
+        return vector
+
+    def blend(self, mixture: EmotionMixture, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Blend shape weights (clipped to 0..1) for an emotion mixture such as {'happy': 0.6, 'surprised': 0.3}"""
+        weights = np.matmul(self.mixture_vector(mixture), self.matrix, out=out)
+        return np.clip(weights, 0.0, 1.0, out=weights)
+
+    def preset(self, emotion: str) -> Dict[str, float]:
+        """Non-zero weights of a single emotion, keyed by shape name"""
+        row = self.matrix[self.emotion_index[emotion]]
+        return {self.shape_names[i]: float(row[i]) for i in np.flatnonzero(row)}
+
+    def to_dict(self, weights: np.ndarray) -> Dict[str, float]:
+        """Map a blended weight vector back to shape names"""
+        return dict(zip(self.shape_names, weights.tolist()))
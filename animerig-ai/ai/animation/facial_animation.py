@@ -11,9 +11,23 @@ from dataclasses import dataclass
 from enum import Enum
 import math
 import logging
+import os
+
+from .emotion_matrix import EMOTION_PRESETS, EmotionBlendMatrix, EmotionMixture
 
 logger = logging.getLogger(__name__)
 
+
+def _load_cascade(name: str) -> Optional['cv2.CascadeClassifier']:
+    """OpenCV's bundled Haar cascade, or None when the build or data files don't include it"""
+    directory = getattr(getattr(cv2, 'data', None), 'haarcascades', None)
+    path = os.path.join(directory, name) if directory else ''
+    if not hasattr(cv2, 'CascadeClassifier') or not os.path.exists(path):
+        return None
+    cascade = cv2.CascadeClassifier(path)
+    return None if cascade.empty() else cascade
+
+
 class BlendShapeType(Enum):
     # Eye blend shapes
     EYE_BLINK_L = "eye_blink_L"
@@ -85,73 +99,32 @@ class EmotionPreset:
         self.duration: float = 0.5
         self.transition_curve: str = "smooth"
     
+    @classmethod
+    def from_table(cls, name: str) -> 'EmotionPreset':
+        """Build a preset from the shared EMOTION_PRESETS table"""
+        emotion = cls(name)
+        emotion.blend_weights = {BlendShapeType(shape): weight for shape, weight in EMOTION_PRESETS[name].items()}
+        return emotion
+    
     @staticmethod
     def create_happy() -> 'EmotionPreset':
-        emotion = EmotionPreset("happy")
-        emotion.blend_weights = {
-            BlendShapeType.EYE_HAPPY_L: 0.7,
-            BlendShapeType.EYE_HAPPY_R: 0.7,
-            BlendShapeType.MOUTH_SMILE_L: 0.8,
-            BlendShapeType.MOUTH_SMILE_R: 0.8,
-            BlendShapeType.CHEEK_PUFF_L: 0.3,
-            BlendShapeType.CHEEK_PUFF_R: 0.3,
-            BlendShapeType.BROW_UP_L: 0.2,
-            BlendShapeType.BROW_UP_R: 0.2
-        }
-        return emotion
+        return EmotionPreset.from_table("happy")
     
     @staticmethod
     def create_excited() -> 'EmotionPreset':
-        emotion = EmotionPreset("excited")
-        emotion.blend_weights = {
-            BlendShapeType.EYE_WIDE_L: 0.9,
-            BlendShapeType.EYE_WIDE_R: 0.9,
-            BlendShapeType.BROW_UP_L: 0.8,
-            BlendShapeType.BROW_UP_R: 0.8,
-            BlendShapeType.MOUTH_OPEN: 0.6,
-            BlendShapeType.MOUTH_SMILE_L: 0.9,
-            BlendShapeType.MOUTH_SMILE_R: 0.9
-        }
-        return emotion
+        return EmotionPreset.from_table("excited")
     
     @staticmethod
     def create_sad() -> 'EmotionPreset':
-        emotion = EmotionPreset("sad")
-        emotion.blend_weights = {
-            BlendShapeType.BROW_DOWN_L: 0.6,
-            BlendShapeType.BROW_DOWN_R: 0.6,
-            BlendShapeType.EYE_SQUINT_L: 0.4,
-            BlendShapeType.EYE_SQUINT_R: 0.4,
-            BlendShapeType.MOUTH_FROWN_L: 0.7,
-            BlendShapeType.MOUTH_FROWN_R: 0.7
-        }
-        return emotion
+        return EmotionPreset.from_table("sad")
     
     @staticmethod
     def create_surprised() -> 'EmotionPreset':
-        emotion = EmotionPreset("surprised")
-        emotion.blend_weights = {
-            BlendShapeType.EYE_WIDE_L: 1.0,
-            BlendShapeType.EYE_WIDE_R: 1.0,
-            BlendShapeType.BROW_UP_L: 1.0,
-            BlendShapeType.BROW_UP_R: 1.0,
-            BlendShapeType.MOUTH_OPEN: 0.8,
-            BlendShapeType.JAW_OPEN: 0.5
-        }
-        return emotion
+        return EmotionPreset.from_table("surprised")
     
     @staticmethod
     def create_angry() -> 'EmotionPreset':
-        emotion = EmotionPreset("angry")
-        emotion.blend_weights = {
-            BlendShapeType.BROW_ANGRY_L: 0.9,
-            BlendShapeType.BROW_ANGRY_R: 0.9,
-            BlendShapeType.EYE_SQUINT_L: 0.6,
-            BlendShapeType.EYE_SQUINT_R: 0.6,
-            BlendShapeType.MOUTH_FROWN_L: 0.8,
-            BlendShapeType.MOUTH_FROWN_R: 0.8
-        }
-        return emotion
+        return EmotionPreset.from_table("angry")
 
 class LipSyncProcessor:
     """Advanced lip sync using phoneme detection"""
@@ -257,6 +230,10 @@ class AdvancedFacialAnimator:
         self.eye_movement_timer = 0.0
         self.micro_expression_timer = 0.0
         
+        # Gaze and facial layout
+        self.eye_direction = (0.0, 0.0)
+        self.facial_regions: Dict[str, Tuple[float, float, float, float]] = {}
+        
         self._initialize_blend_shapes()
         self._initialize_emotion_presets()
         
@@ -280,34 +257,50 @@ class AdvancedFacialAnimator:
             return 5.0   # Standard expression changes
     
     def _initialize_emotion_presets(self):
-        """Initialize emotion presets"""
-        self.emotion_presets = {
-            "happy": EmotionPreset.create_happy(),
-            "excited": EmotionPreset.create_excited(),
-            "sad": EmotionPreset.create_sad(),
-            "surprised": EmotionPreset.create_surprised(),
-            "angry": EmotionPreset.create_angry()
-        }
+        """Initialize emotion presets and the matrix used to blend them"""
+        self.emotion_presets = {name: EmotionPreset.from_table(name) for name in EMOTION_PRESETS}
+        self._blend_types = list(self.blend_shapes)
+        self.emotion_matrix = EmotionBlendMatrix([blend_type.value for blend_type in self._blend_types])
+        self.emotion_mixture: Dict[str, float] = {}
     
-    def set_emotion(self, emotion_name: str, intensity: float = 1.0, transition_time: float = 0.5):
+    def set_emotion(self, emotion_name: str, intensity: float = 1.0, transition_time: float = 0.5) -> bool:
         """Set character emotion with smooth transition"""
         if emotion_name not in self.emotion_presets:
             logger.warning(f"Unknown emotion: {emotion_name}")
-            return
+            return False
         
-        self.current_emotion = emotion_name
-        self.emotion_intensity = np.clip(intensity, 0.0, 1.0)
+        self.set_emotion_mix({emotion_name: float(np.clip(intensity, 0.0, 1.0))}, transition_time)
+        return True
+    
+    def set_emotion_mix(self, mixture: EmotionMixture, transition_time: float = 0.5):
+        """
+        Blend several emotions at once, e.g. {'happy': 0.6, 'surprised': 0.3}
         
-        # Clear current emotion
-        for blend_shape in self.blend_shapes.values():
-            blend_shape.target_weight = 0.0
+        Every blend shape target is resolved by one product with the emotion
+        matrix, so this is cheap enough to call every frame from continuous input.
+        """
+        if isinstance(mixture, np.ndarray):
+            # Weights in emotion_matrix.emotions order
+            positive = np.where(mixture > 0.0, mixture, 0.0)
+            self.emotion_mixture = {name: float(weight) for name, weight
+                                    in zip(self.emotion_matrix.emotions, positive) if weight > 0.0}
+        else:
+            self.emotion_mixture = {name: weight for name, weight in mixture.items() if weight > 0.0}
         
-        # Apply new emotion
-        emotion = self.emotion_presets[emotion_name]
-        for blend_type, weight in emotion.blend_weights.items():
-            if blend_type in self.blend_shapes:
-                self.blend_shapes[blend_type].target_weight = weight * self.emotion_intensity
-                self.blend_shapes[blend_type].transition_speed = 1.0 / transition_time
+        if self.emotion_mixture:
+            dominant = max(self.emotion_mixture, key=self.emotion_mixture.get)
+            self.current_emotion = dominant
+            self.emotion_intensity = float(np.clip(self.emotion_mixture[dominant], 0.0, 1.0))
+        else:
+            self.current_emotion = "neutral"
+        
+        targets = self.emotion_matrix.blend(mixture)
+        speed = 1.0 / max(transition_time, 1e-3)
+        for blend_type, target in zip(self._blend_types, targets.tolist()):
+            blend_shape = self.blend_shapes[blend_type]
+            blend_shape.target_weight = target
+            if target > 0.0:
+                blend_shape.transition_speed = speed
     
     def start_speaking(self, text: str, speaking_speed: float = 1.0):
         """Start speaking with lip sync"""
@@ -438,6 +431,93 @@ class AdvancedFacialAnimator:
         return {bs_type: bs.weight for bs_type, bs in self.blend_shapes.items() 
                 if bs.weight > threshold}
     
+    def get_blend_shape_weights(self) -> Dict[str, float]:
+        """Get current weights keyed by blend shape name"""
+        return {bs_type.value: bs.weight for bs_type, bs in self.blend_shapes.items()}
+    
+    def get_blend_shape_deltas(self, blend_name: str) -> Optional[np.ndarray]:
+        """Get per-vertex deltas for a blend shape, if any were authored"""
+        for bs_type, blend_shape in self.blend_shapes.items():
+            if bs_type.value == blend_name:
+                return blend_shape.vertex_deltas
+        return None
+    
+    def export_blend_shapes(self) -> Dict[str, float]:
+        """Export current blend shape weights keyed by name"""
+        return {name: float(weight) for name, weight in self.get_blend_shape_weights().items()}
+    
+    def import_blend_shapes(self, weights: Dict[str, float]):
+        """Restore blend shape weights written by export_blend_shapes"""
+        for bs_type, blend_shape in self.blend_shapes.items():
+            if bs_type.value in weights:
+                weight = float(np.clip(weights[bs_type.value], 0.0, 1.0))
+                blend_shape.weight = weight
+                blend_shape.target_weight = weight
+    
+    def speak_text(self, text: str, speaking_speed: float = 1.0):
+        """Speak text with automatic lip sync"""
+        self.start_speaking(text, speaking_speed)
+    
+    def set_eye_direction(self, horizontal: float, vertical: float):
+        """Set gaze direction (-1.0 to 1.0 on each axis)"""
+        self.eye_direction = (float(np.clip(horizontal, -1.0, 1.0)), float(np.clip(vertical, -1.0, 1.0)))
+    
+    def detect_face_landmarks(self, image: np.ndarray) -> Optional[List[Tuple[float, float]]]:
+        """
+        Detect facial landmarks as normalized (left eye, right eye, mouth) centers
+        
+        Uses OpenCV's bundled Haar cascades: the largest face, then the two
+        eyes inside its upper half (falling back to their usual place in the
+        face box). Returns None when no cascade is installed or no face is found.
+        """
+        face_cascade = _load_cascade('haarcascade_frontalface_default.xml')
+        if face_cascade is None:
+            return None
+        
+        gray = image if image.ndim == 2 else cv2.cvtColor(image[:, :, :3], cv2.COLOR_BGR2GRAY)
+        faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5)
+        if len(faces) == 0:
+            return None
+        x, y, w, h = max(faces, key=lambda face: face[2] * face[3])
+        
+        eyes = [(x + 0.3 * w, y + 0.4 * h), (x + 0.7 * w, y + 0.4 * h)]
+        eye_cascade = _load_cascade('haarcascade_eye.xml')
+        if eye_cascade is not None:
+            found = eye_cascade.detectMultiScale(gray[y:y + h // 2, x:x + w], scaleFactor=1.1, minNeighbors=5)
+            if len(found) >= 2:
+                found = sorted(found, key=lambda eye: eye[2] * eye[3], reverse=True)[:2]
+                eyes = sorted((x + ex + ew / 2, y + ey + eh / 2) for ex, ey, ew, eh in found)
+        mouth = (x + 0.5 * w, y + 0.78 * h)
+        
+        height, width = gray.shape[:2]
+        return [(px / width, py / height) for px, py in (*eyes, mouth)]
+    
+    def setup_facial_regions(self, landmarks: List[Tuple[float, float]]):
+        """Derive facial region boxes from normalized (left eye, right eye, mouth) centers"""
+        (left_x, left_y), (right_x, right_y), (mouth_x, mouth_y) = landmarks[:3]
+        spacing = max(abs(right_x - left_x), 1e-3)
+        
+        def box(cx: float, cy: float, half_width: float, half_height: float) -> Tuple[float, float, float, float]:
+            return (cx - half_width, cy - half_height, cx + half_width, cy + half_height)
+        
+        self.facial_regions = {
+            'left_eye': box(left_x, left_y, 0.3 * spacing, 0.2 * spacing),
+            'right_eye': box(right_x, right_y, 0.3 * spacing, 0.2 * spacing),
+            'mouth': box(mouth_x, mouth_y, 0.4 * spacing, 0.3 * spacing)
+        }
+    
+    def setup_default_facial_regions(self):
+        """Set up facial regions as normalized (x1, y1, x2, y2) boxes"""
+        self.facial_regions = {
+            'left_eye': (0.30, 0.30, 0.45, 0.40),
+            'right_eye': (0.55, 0.30, 0.70, 0.40),
+            'mouth': (0.40, 0.55, 0.60, 0.70)
+        }
+    
+    def get_facial_regions(self) -> Dict[str, Tuple[float, float, float, float]]:
+        """Get facial regions as normalized boxes"""
+        return self.facial_regions
+    
     def start_auto_blink(self):
         """Start automatic blinking"""
         self.auto_blink_enabled = True
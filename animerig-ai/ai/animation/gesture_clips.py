@@ -0,0 +1,385 @@
+"""
+Compiled gesture clips and a layered clip player
+Gestures are compiled once into stacked time/rotation arrays; playback samples every bone of a clip in one vectorized step
+"""
+
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..animation_synthesis.tracks import Track
+from .clip_format import AnimationClip
+
+logger = logging.getLogger(__name__)
+
+BLEND_MODES = ('override', 'additive')
+
+# Seconds a 'hold' gesture keeps its final pose before fading out on its own
+DEFAULT_HOLD_TIME = 2.0
+
+
+def finger_curl_keyframes(hand: str, curls: Mapping[str, float], duration: float,
+                          first_joint: int = 1) -> Dict[str, List[Tuple[float, np.ndarray]]]:
+    """Keyframes curling each finger from open to the given amount (0 open, 1 fully curled)"""
+    keyframes = {}
+    for finger, curl in curls.items():
+        for joint in range(3):
+            joint_curl = curl * ((joint + 1) / 3.0) * math.pi / 3
+            keyframes[f"{hand}_{finger}_{joint + first_joint}"] = [
+                (0.0, np.zeros(3)),
+                (duration, np.array([0.0, 0.0, joint_curl]))
+            ]
+    return keyframes
+
+
+def default_gesture_specs(first_finger_joint: int = 1) -> Dict[str, Dict]:
+    """
+    Built-in gesture library as keyframe specs (bone -> [(time, euler radians)])
+
+    first_finger_joint is the index of a rig's first finger joint: finger bones
+    are named '<hand>_<finger>_<joint>' with joints numbered from it.
+    """
+    j = first_finger_joint
+    return {
+        'wave': {
+            'duration': 2.0,
+            'keyframes': {
+                'right_upper_arm': [
+                    (0.0, np.array([0, 0, 0])),
+                    (0.5, np.array([0, 0, math.pi/3])),
+                    (1.0, np.array([0, 0, math.pi/6])),
+                    (1.5, np.array([0, 0, math.pi/3])),
+                    (2.0, np.array([0, 0, 0]))
+                ],
+                'right_forearm': [
+                    (0.0, np.array([0, 0, 0])),
+                    (0.25, np.array([0, 0, -math.pi/4])),
+                    (0.75, np.array([0, 0, -math.pi/6])),
+                    (1.25, np.array([0, 0, -math.pi/4])),
+                    (2.0, np.array([0, 0, 0]))
+                ]
+            }
+        },
+        'peace_sign': {
+            'duration': 1.5,
+            'hold': True,
+            'hold_time': DEFAULT_HOLD_TIME,
+            'keyframes': {
+                'right_upper_arm': [(0.0, np.array([0, 0, 0])), (1.5, np.array([0, 0, math.pi/4]))],
+                f'right_index_{j}': [(0.0, np.array([0, 0, 0])), (1.5, np.array([0, 0, -math.pi/8]))],
+                f'right_middle_{j}': [(0.0, np.array([0, 0, 0])), (1.5, np.array([0, 0, -math.pi/8]))],
+                f'right_ring_{j}': [(0.0, np.array([0, 0, 0])), (1.5, np.array([0, 0, math.pi/3]))],
+                f'right_pinky_{j}': [(0.0, np.array([0, 0, 0])), (1.5, np.array([0, 0, math.pi/3]))]
+            }
+        },
+        'thinking': {
+            'duration': 3.0,
+            'hold': True,
+            'hold_time': DEFAULT_HOLD_TIME,
+            'keyframes': {
+                'right_upper_arm': [(0.0, np.array([0, 0, 0])), (3.0, np.array([0, 0, math.pi/6]))],
+                'right_forearm': [(0.0, np.array([0, 0, 0])), (3.0, np.array([0, 0, -math.pi/3]))],
+                'head': [(0.0, np.array([0, 0, 0])), (3.0, np.array([0, math.pi/12, 0]))]
+            }
+        },
+        'thumbs_up': {
+            'duration': 0.4,
+            'hold': True,
+            'hold_time': DEFAULT_HOLD_TIME,
+            'keyframes': finger_curl_keyframes('right', {'thumb': 0.0, 'index': 1.0, 'middle': 1.0,
+                                                         'ring': 1.0, 'pinky': 1.0}, 0.4, j)
+        },
+        'point': {
+            'duration': 0.4,
+            'hold': True,
+            'hold_time': DEFAULT_HOLD_TIME,
+            'keyframes': finger_curl_keyframes('right', {'index': 0.0, 'thumb': 0.5, 'middle': 1.0,
+                                                         'ring': 1.0, 'pinky': 1.0}, 0.4, j)
+        },
+        'rock_on': {
+            'duration': 0.4,
+            'hold': True,
+            'hold_time': DEFAULT_HOLD_TIME,
+            'keyframes': finger_curl_keyframes('right', {'index': 0.0, 'pinky': 0.0, 'middle': 1.0,
+                                                         'ring': 1.0, 'thumb': 0.8}, 0.4, j)
+        }
+    }
+
+
+@dataclass
+class GestureClip:
+    """
+    Compiled gesture: every bone resampled onto one shared time grid
+
+    rotations is (K, B, 3) over times (K,) for bone_names (B). Resampling onto
+    the union of all key times is exact for linear playback, and lets a single
+    binary search and lerp sample every bone at once. A hold clip keeps its
+    final pose for hold_time seconds after its last key (None: until stopped).
+    """
+    name: str
+    duration: float
+    bone_names: Tuple[str, ...]
+    times: np.ndarray
+    rotations: np.ndarray
+    loop: bool = False
+    hold: bool = False
+    hold_time: Optional[float] = None
+
+    @classmethod
+    def from_tracks(cls, name: str, tracks: Mapping[str, Track], duration: Optional[float] = None,
+                    loop: bool = False, hold: bool = False, hold_time: Optional[float] = None) -> 'GestureClip':
+        """Compile per-bone rotation tracks (values (N, 3)) into a clip"""
+        bone_names = tuple(bone for bone, track in tracks.items() if len(track))
+        if bone_names:
+            times = np.unique(np.concatenate([tracks[bone].times for bone in bone_names]))
+        else:
+            times = np.zeros(1)
+
+        rotations = np.zeros((len(times), len(bone_names), 3), dtype=np.float32)
+        for b, bone in enumerate(bone_names):
+            track = tracks[bone]
+            for axis in range(3):
+                rotations[:, b, axis] = np.interp(times, track.times, track.values[:, axis])
+
+        if duration is None:
+            duration = float(times[-1])
+        return cls(name, float(duration), bone_names, times, rotations, loop, hold, hold_time)
+
+    @classmethod
+    def from_keyframes(cls, name: str, spec: Mapping) -> 'GestureClip':
+        """Compile a {'duration', 'keyframes': {bone: [(time, rotation)]}} gesture spec"""
+        tracks = {
+            bone: Track(np.array([t for t, _ in keys], dtype=np.float64),
+                        np.array([np.asarray(rotation, dtype=np.float32) for _, rotation in keys]))
+            for bone, keys in spec['keyframes'].items()
+        }
+        return cls.from_tracks(name, tracks, spec.get('duration'), spec.get('loop', False), spec.get('hold', False),
+                               spec.get('hold_time'))
+
+    @classmethod
+    def from_clip(cls, name: str, clip: AnimationClip, **kwargs) -> 'GestureClip':
+        """Compile a clip loaded from the binary clip format (track names are bone names)"""
+        return cls.from_tracks(name, clip.tracks, clip.duration or None, **kwargs)
+
+    def to_clip(self) -> AnimationClip:
+        """Per-bone tracks in the binary clip layout"""
+        tracks = {bone: Track(self.times, self.rotations[:, b]) for b, bone in enumerate(self.bone_names)}
+        metadata = {'gesture': self.name, 'loop': self.loop, 'hold': self.hold, 'hold_time': self.hold_time}
+        return AnimationClip(tracks=tracks, metadata=metadata, duration=self.duration)
+
+    @property
+    def final_pose(self) -> np.ndarray:
+        """(B, 3) rotations at the last key"""
+        return self.rotations[-1]
+
+    def sample(self, t: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """(B, 3) rotations of every bone at time t (clamped, or wrapped for looping clips)"""
+        if out is None:
+            out = np.empty(self.rotations.shape[1:], dtype=np.float32)
+
+        times = self.times
+        if self.loop and self.duration > 0:
+            t = t % self.duration
+        if len(times) == 1 or t <= times[0]:
+            out[:] = self.rotations[0]
+            return out
+        if t >= times[-1]:
+            out[:] = self.rotations[-1]
+            return out
+
+        i = int(np.searchsorted(times, t, side='right')) - 1
+        s = (t - times[i]) / (times[i + 1] - times[i])
+        np.subtract(self.rotations[i + 1], self.rotations[i], out=out)
+        out *= s
+        out += self.rotations[i]
+        return out
+
+
+def compile_gestures(specs: Mapping[str, Mapping]) -> Dict[str, GestureClip]:
+    """Compile a whole gesture spec library"""
+    return {name: GestureClip.from_keyframes(name, spec) for name, spec in specs.items()}
+
+
+@dataclass
+class ClipLayer:
+    """One clip playing on a player slot"""
+    clip: GestureClip
+    mode: str = 'override'
+    weight: float = 1.0
+    fade_in: float = 0.2
+    fade_out: float = 0.2
+    time: float = 0.0
+    stop_time: Optional[float] = None
+
+    # Rig bone index for each clip bone the rig has, and the matching clip columns
+    rig_indices: np.ndarray = field(default=None, repr=False)
+    clip_columns: np.ndarray = field(default=None, repr=False)
+
+    def envelope(self) -> float:
+        """Current blend weight including fades"""
+        weight = self.weight
+        if self.fade_in > 0:
+            weight *= min(1.0, self.time / self.fade_in)
+
+        clip = self.clip
+        if self.stop_time is not None:
+            weight *= max(0.0, 1.0 - (self.time - self.stop_time) / self.fade_out) if self.fade_out > 0 else 0.0
+        elif not (clip.loop or clip.hold) and self.fade_out > 0:
+            weight *= min(1.0, max(0.0, clip.duration - self.time) / self.fade_out)
+        return weight
+
+    @property
+    def holding(self) -> bool:
+        """Past the end of a hold clip and not yet released"""
+        return self.clip.hold and self.stop_time is None and self.time >= self.clip.duration
+
+    @property
+    def finished(self) -> bool:
+        if self.stop_time is not None:
+            return self.time >= self.stop_time + self.fade_out
+        return not (self.clip.loop or self.clip.hold) and self.time >= self.clip.duration
+
+
+class LayeredClipPlayer:
+    """
+    Plays gesture clips on numbered layers over a base pose
+
+    Layers are applied in slot order. 'override' layers lerp the pose towards
+    the clip by the layer weight; 'additive' layers add the clip's rotations
+    on top. Playing on an occupied slot replaces that layer. Held poses are
+    released (faded out) when their clip's hold_time runs out or when another
+    override clip starts on any slot.
+    """
+
+    def __init__(self, bone_names: Sequence[str]):
+        self.bone_names = tuple(bone_names)
+        self.bone_index = {name: i for i, name in enumerate(self.bone_names)}
+        self.layers: Dict[int, ClipLayer] = {}
+
+        # Keyed by id(clip) while a layer plays it; the clip is kept alongside so its id cannot be reused
+        self._bindings: Dict[int, Tuple[GestureClip, np.ndarray, np.ndarray]] = {}
+        self._samples: Dict[int, np.ndarray] = {}
+
+    @property
+    def active(self) -> bool:
+        return bool(self.layers)
+
+    def _bind(self, clip: GestureClip) -> Tuple[np.ndarray, np.ndarray]:
+        """Map clip bones to rig bones once per clip (bones the rig lacks are skipped)"""
+        binding = self._bindings.get(id(clip))
+        if binding is None:
+            pairs = [(self.bone_index[bone], column) for column, bone in enumerate(clip.bone_names)
+                     if bone in self.bone_index]
+            rig_indices = np.array([p[0] for p in pairs], dtype=np.intp)
+            clip_columns = np.array([p[1] for p in pairs], dtype=np.intp)
+            binding = self._bindings[id(clip)] = (clip, rig_indices, clip_columns)
+            self._samples[id(clip)] = np.empty((len(clip.bone_names), 3), dtype=np.float32)
+        return binding[1:]
+
+    def _release(self, clip: GestureClip):
+        """Drop a clip's binding and sample buffer once no layer plays it"""
+        if all(other.clip is not clip for other in self.layers.values()):
+            self._bindings.pop(id(clip), None)
+            self._samples.pop(id(clip), None)
+
+    def _remove_layer(self, layer: int):
+        self._release(self.layers.pop(layer).clip)
+
+    def play(self, clip: GestureClip, layer: int = 0, mode: str = 'override', weight: float = 1.0,
+             fade_in: float = 0.2, fade_out: float = 0.2) -> ClipLayer:
+        """Start a clip on a layer slot"""
+        if mode not in BLEND_MODES:
+            raise ValueError(f"Unknown blend mode: {mode}")
+
+        rig_indices, clip_columns = self._bind(clip)
+        if mode == 'override':
+            for other, other_layer in self.layers.items():
+                if other != layer and other_layer.holding:
+                    self.stop(other)
+        clip_layer = ClipLayer(clip, mode, weight, fade_in, fade_out,
+                               rig_indices=rig_indices, clip_columns=clip_columns)
+        replaced = self.layers.get(layer)
+        self.layers[layer] = clip_layer
+        if replaced is not None:
+            self._release(replaced.clip)
+        return clip_layer
+
+    def stop(self, layer: int = 0, fade_out: Optional[float] = None):
+        """Fade a layer out (immediately removed if fade_out is 0)"""
+        clip_layer = self.layers.get(layer)
+        if clip_layer is None:
+            return
+        if fade_out is not None:
+            clip_layer.fade_out = fade_out
+        if clip_layer.fade_out <= 0:
+            self._remove_layer(layer)
+        elif clip_layer.stop_time is None:
+            clip_layer.stop_time = clip_layer.time
+
+    def stop_all(self, fade_out: Optional[float] = None):
+        for layer in list(self.layers):
+            self.stop(layer, fade_out)
+
+    def update(self, dt: float):
+        """Advance every layer and drop finished ones"""
+        for layer, clip_layer in list(self.layers.items()):
+            clip_layer.time += dt
+            hold_time = clip_layer.clip.hold_time
+            if clip_layer.holding and hold_time is not None and clip_layer.time >= clip_layer.clip.duration + hold_time:
+                self.stop(layer)
+            if clip_layer.finished:
+                self._remove_layer(layer)
+
+    def evaluate(self, base_pose: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Apply all layers to a (B, 3) base pose in rig bone order"""
+        if out is None:
+            out = base_pose.copy()
+        elif out is not base_pose:
+            out[:] = base_pose
+
+        for slot in sorted(self.layers):
+            clip_layer = self.layers[slot]
+            weight = clip_layer.envelope()
+            if weight <= 0.0 or len(clip_layer.rig_indices) == 0:
+                continue
+
+            sample = clip_layer.clip.sample(clip_layer.time, out=self._samples[id(clip_layer.clip)])
+            values = sample[clip_layer.clip_columns]
+            rows = clip_layer.rig_indices
+            if clip_layer.mode == 'additive':
+                out[rows] += values * weight
+            else:
+                out[rows] += (values - out[rows]) * weight
+
+        return out
+
+    def touched_indices(self) -> np.ndarray:
+        """Rig bone indices affected by any active layer"""
+        if not self.layers:
+            return np.zeros(0, dtype=np.intp)
+        return np.unique(np.concatenate([layer.rig_indices for layer in self.layers.values()]))
+
+    def pose_bones(self, bones: Sequence[Any], get_rotation: Callable[[Any], np.ndarray],
+                   set_rotation: Callable[[Any, np.ndarray], None], update_world: Callable[[], None]):
+        """
+        Run a rig's world transform update with the layers applied
+
+        bones are in rig bone order. The layered rotations are written to the
+        touched bones only for the duration of update_world(), then the base
+        rotations are restored so the rig's own easing keeps working on them.
+        """
+        touched = self.touched_indices()
+        base = np.array([get_rotation(bone) for bone in bones], dtype=np.float32)
+        posed = self.evaluate(base)
+
+        saved = [(bones[i], get_rotation(bones[i])) for i in touched]
+        for i in touched:
+            set_rotation(bones[i], posed[i].astype(np.float64))
+
+        update_world()
+
+        for bone, rotation in saved:
+            set_rotation(bone, rotation)
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Headless offscreen renderer for batch clip export
+Plays a scripted timeline through ProfessionalAnimator at a fixed timestep - no Qt or OpenGL required
+
+Usage:
+    python -m ai.animation.headless_renderer character.png timeline.json -o frames/
+    python -m ai.animation.headless_renderer character.png timeline.json -o clip.mp4 --fps 30
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from .professional_animator import ProfessionalAnimator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TimelineEvent:
+    """Single scripted action on the timeline"""
+    time: float
+    type: str  # pose, emotion, speak, stop_speaking, head, look, gesture
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Timeline:
+    """Scripted sequence of animation events"""
+    duration: float
+    events: List[TimelineEvent] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Timeline':
+        """Build a timeline from parsed JSON"""
+        events = []
+        for raw in data.get('events', []):
+            raw = dict(raw)
+            event_time = float(raw.pop('time', 0.0))
+            event_type = raw.pop('type')
+            events.append(TimelineEvent(event_time, event_type, raw))
+
+        events.sort(key=lambda e: e.time)
+
+        duration = data.get('duration')
+        if duration is None:
+            duration = events[-1].time + 1.0 if events else 1.0
+
+        return cls(duration=float(duration), events=events)
+
+    @classmethod
+    def load(cls, path: str) -> 'Timeline':
+        """Load a timeline from a JSON file"""
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+
+def apply_event(animator: ProfessionalAnimator, event: TimelineEvent):
+    """Dispatch a timeline event to the animator"""
+    p = event.params
+
+    if event.type == 'pose':
+        animator.set_pose(p['name'], p.get('transition_time', 0.5))
+    elif event.type == 'emotion':
+        animator.set_emotion(p['name'], p.get('intensity', 0.5), p.get('transition_time', 0.3))
+    elif event.type == 'speak':
+        animator.speak_text(p['text'])
+    elif event.type == 'stop_speaking':
+        animator.stop_speaking()
+    elif event.type == 'head':
+        animator.set_head_rotation(p.get('pitch', 0.0), p.get('yaw', 0.0), p.get('roll', 0.0))
+    elif event.type == 'look':
+        animator.set_looking_direction(p.get('horizontal', 0.0), p.get('vertical', 0.0))
+    elif event.type == 'gesture':
+        animator.trigger_gesture(p['name'])
+    else:
+        logger.warning(f"Unknown timeline event type: {event.type}")
+
+
+class FrameSink:
+    """Destination for rendered frames"""
+
+    def write(self, frame: np.ndarray, index: int):
+        """Consume one frame (the base sink discards it)"""
+        pass
+
+    def close(self):
+        pass
+
+
+class NullSink(FrameSink):
+    """Discards frames - used for pure render benchmarks"""
+
+
+class ImageSequenceSink(FrameSink):
+    """Writes numbered image files into a directory"""
+
+    def __init__(self, output_dir: str, pattern: str = "frame_{:05d}.png"):
+        self.output_dir = output_dir
+        self.pattern = pattern
+        os.makedirs(output_dir, exist_ok=True)
+
+    def write(self, frame: np.ndarray, index: int):
+        path = os.path.join(self.output_dir, self.pattern.format(index))
+        if not cv2.imwrite(path, frame):
+            raise IOError(f"Failed to write frame: {path}")
+
+
+class PipeSink(FrameSink):
+    """
+    Streams raw frames into an encoder's stdin (ffmpeg by default)
+
+    The encoder is started lazily on the first frame, once the frame size and
+    channel layout are known.
+    """
+
+    PIXEL_FORMATS = {1: 'gray', 3: 'bgr24', 4: 'bgra'}
+
+    def __init__(self, output_path: str, fps: float, encoder: str = "ffmpeg",
+                 encoder_args: Optional[List[str]] = None):
+        self.output_path = output_path
+        self.fps = fps
+        self.encoder = encoder
+        self.encoder_args = encoder_args if encoder_args is not None else ['-pix_fmt', 'yuv420p']
+        self.process: Optional[subprocess.Popen] = None
+
+    def _start(self, frame: np.ndarray):
+        """Launch the encoder for the given frame layout"""
+        height, width = frame.shape[:2]
+        channels = 1 if frame.ndim == 2 else frame.shape[2]
+
+        command = [
+            self.encoder, '-y', '-loglevel', 'error',
+            '-f', 'rawvideo',
+            '-pix_fmt', self.PIXEL_FORMATS[channels],
+            '-s', f'{width}x{height}',
+            '-r', str(self.fps),
+            '-i', '-',
+            *self.encoder_args,
+            self.output_path
+        ]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, frame: np.ndarray, index: int):
+        if self.process is None:
+            self._start(frame)
+        self.process.stdin.write(np.ascontiguousarray(frame).data)
+
+    def close(self):
+        if self.process is None:
+            return
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"Encoder exited with status {self.process.returncode}")
+
+
+def create_sink(output: Optional[str], fps: float) -> FrameSink:
+    """Pick a sink from the output path: none, a video file, or an image directory"""
+    if not output:
+        return NullSink()
+
+    video_extensions = ('.mp4', '.mov', '.mkv', '.webm', '.avi', '.gif')
+    if output.lower().endswith(video_extensions):
+        return PipeSink(output, fps)
+
+    return ImageSequenceSink(output)
+
+
+@dataclass
+class RenderStats:
+    """Summary of a headless render"""
+    frames: int = 0
+    sim_duration: float = 0.0
+    wall_time: float = 0.0
+    render_time: float = 0.0
+    output_time: float = 0.0
+
+    @property
+    def render_fps(self) -> float:
+        """Frames rendered per wall-clock second"""
+        return self.frames / self.wall_time if self.wall_time > 0 else 0.0
+
+    @property
+    def realtime_factor(self) -> float:
+        """How many times faster than real time the clip was produced"""
+        return self.sim_duration / self.wall_time if self.wall_time > 0 else 0.0
+
+
+class HeadlessRenderer:
+    """Drives a ProfessionalAnimator through a timeline as fast as the CPU allows"""
+
+    def __init__(self, animator: ProfessionalAnimator, fps: float = 30.0):
+        self.animator = animator
+        self.fps = fps
+        self.timestep = 1.0 / fps
+
+    def render(self, timeline: Timeline, sink: FrameSink) -> RenderStats:
+        """Render every frame of the timeline into the sink"""
+        stats = RenderStats()
+        frame_count = int(round(timeline.duration * self.fps))
+        events = timeline.events
+        next_event = 0
+
+        start = time.perf_counter()
+        try:
+            for index in range(frame_count):
+                sim_time = index * self.timestep
+
+                # Fire everything scheduled up to this frame
+                while next_event < len(events) and events[next_event].time <= sim_time:
+                    apply_event(self.animator, events[next_event])
+                    next_event += 1
+
+                render_start = time.perf_counter()
+                frame = self.animator.update(self.timestep)
+                output_start = time.perf_counter()
+                sink.write(frame, index)
+                output_end = time.perf_counter()
+
+                stats.render_time += output_start - render_start
+                stats.output_time += output_end - output_start
+                stats.frames += 1
+        finally:
+            sink.close()
+
+        stats.wall_time = time.perf_counter() - start
+        stats.sim_duration = stats.frames * self.timestep
+        return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Render an animation timeline without a GUI")
+    parser.add_argument('character', help="Character image")
+    parser.add_argument('timeline', help="Timeline JSON file")
+    parser.add_argument('-o', '--output', help="Image directory or video file (omit to benchmark only)")
+    parser.add_argument('--fps', type=float, default=30.0, help="Output frame rate / simulation timestep")
+    parser.add_argument('--quality', choices=['low', 'medium', 'high', 'ultra'], help="Animator quality level")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Verbose logging")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    animator = ProfessionalAnimator(target_fps=int(args.fps), enable_physics=True)
+    if args.quality:
+        animator.set_quality_level(args.quality)
+
+    if not animator.load_character(args.character):
+        print(f"Failed to load character: {args.character}", file=sys.stderr)
+        return 1
+
+    timeline = Timeline.load(args.timeline)
+    sink = create_sink(args.output, args.fps)
+
+    stats = HeadlessRenderer(animator, fps=args.fps).render(timeline, sink)
+
+    print(f"Rendered {stats.frames} frames ({stats.sim_duration:.2f}s of animation) "
+          f"in {stats.wall_time:.2f}s")
+    print(f"  {stats.render_fps:.1f} frames/s ({stats.realtime_factor:.2f}x real time)")
+    if stats.frames:
+        print(f"  animate+render {stats.render_time / stats.frames * 1000:.1f} ms/frame, "
+              f"output {stats.output_time / stats.frames * 1000:.1f} ms/frame")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
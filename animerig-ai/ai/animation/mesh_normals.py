@@ -0,0 +1,132 @@
+"""
+Vertex normals for indexed triangle meshes
+Batched face cross products scatter-added onto vertices, with an incremental mode for per-frame deformation
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NORMAL = np.array([0.0, 1.0, 0.0])
+
+
+def as_3d(vertices: np.ndarray) -> np.ndarray:
+    """(V, 3) float64 positions; 2D meshes are lifted onto the z = 0 plane"""
+    vertices = np.asarray(vertices, dtype=np.float64)
+    if vertices.shape[1] == 2:
+        return np.column_stack([vertices, np.zeros(len(vertices))])
+    return vertices
+
+
+def face_normals(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Unit normals of all triangles, (F, 3); degenerate triangles get zero normals"""
+    corners = vertices[faces]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+
+def normalize_vertex_normals(sums: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Normalize accumulated normals; vertices with no usable face point up"""
+    lengths = np.linalg.norm(sums, axis=1, keepdims=True)
+    normals = np.divide(sums, lengths, out=np.zeros_like(sums), where=lengths > 0)
+    normals[lengths[:, 0] == 0] = DEFAULT_NORMAL
+    if out is None:
+        return normals.astype(np.float32)
+    out[...] = normals
+    return out
+
+
+def vertex_normals(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Average of the unit normals of each vertex's faces, (V, 3) float32"""
+    vertices = as_3d(vertices)
+    faces = np.asarray(faces, dtype=np.intp).reshape(-1, 3)
+
+    sums = np.zeros_like(vertices)
+    normals = face_normals(vertices, faces)
+    for corner in range(3):
+        np.add.at(sums, faces[:, corner], normals)
+    return normalize_vertex_normals(sums)
+
+
+class IncrementalNormals:
+    """
+    Vertex normals kept up to date across deformations
+
+    update() finds the vertices that moved since the last call, recomputes
+    only the faces that use them and scatter-adds the change in those face
+    normals into the per-vertex sums. Deformations that touch a small region
+    (blend shapes, a single limb) cost in proportion to that region.
+    """
+
+    def __init__(self, faces: np.ndarray, vertex_count: int):
+        self.faces = np.asarray(faces, dtype=np.intp).reshape(-1, 3)
+        self.vertex_count = vertex_count
+
+        # Vertex -> incident faces in CSR form
+        corners = self.faces.ravel()
+        order = np.argsort(corners, kind='stable')
+        self._incident_faces = order // 3
+        self._incident_start = np.searchsorted(corners[order], np.arange(vertex_count + 1))
+
+        self._vertices: Optional[np.ndarray] = None
+        self._face_normals = np.zeros((len(self.faces), 3))
+        self._sums = np.zeros((vertex_count, 3))
+        self.normals = np.tile(DEFAULT_NORMAL, (vertex_count, 1)).astype(np.float32)
+        self.last_updated_faces = 0
+
+    def faces_touching(self, vertex_indices: np.ndarray) -> np.ndarray:
+        """Unique faces using any of the given vertices"""
+        starts = self._incident_start[vertex_indices]
+        counts = self._incident_start[vertex_indices + 1] - starts
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return np.unique(self._incident_faces[positions])
+
+    def reset(self, vertices: np.ndarray) -> np.ndarray:
+        """Full recomputation"""
+        vertices = as_3d(vertices)
+        self._face_normals = face_normals(vertices, self.faces)
+        self._sums[:] = 0.0
+        for corner in range(3):
+            np.add.at(self._sums, self.faces[:, corner], self._face_normals)
+        normalize_vertex_normals(self._sums, out=self.normals)
+
+        self._vertices = vertices.copy()
+        self.last_updated_faces = len(self.faces)
+        return self.normals
+
+    def update(self, vertices: np.ndarray, moved: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Normals for the deformed vertices
+
+        moved optionally lists the vertex indices the deformation touched;
+        otherwise they are found by comparing with the previous positions.
+        """
+        vertices = as_3d(vertices)
+        if self._vertices is None:
+            return self.reset(vertices)
+
+        if moved is None:
+            moved = np.flatnonzero(np.any(vertices != self._vertices, axis=1))
+        else:
+            moved = np.asarray(moved, dtype=np.intp)
+        if len(moved) == 0:
+            self.last_updated_faces = 0
+            return self.normals
+
+        touched = self.faces_touching(moved)
+        touched_corners = self.faces[touched]
+        new_normals = face_normals(vertices, touched_corners)
+        delta = new_normals - self._face_normals[touched]
+        self._face_normals[touched] = new_normals
+        for corner in range(3):
+            np.add.at(self._sums, touched_corners[:, corner], delta)
+
+        affected = np.unique(touched_corners)
+        self.normals[affected] = normalize_vertex_normals(self._sums[affected])
+        self._vertices[moved] = vertices[moved]
+        self.last_updated_faces = len(touched)
+        return self.normals
@@ -0,0 +1,109 @@
+"""
+Piecewise-affine image warping by a deformed triangle mesh
+Each deformed triangle pulls its pixels from the same triangle at rest, resampled with a single cv2.remap
+"""
+
+import logging
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def triangle_affines(source: np.ndarray, target: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """
+    2x3 affine maps taking each target triangle onto its source triangle, (T, 2, 3)
+
+    Degenerate target triangles get the translation of their first corner.
+    """
+    src = source[triangles].astype(np.float64)
+    dst = target[triangles].astype(np.float64)
+
+    # Columns are the two edge vectors from corner 0
+    dst_edges = np.stack([dst[:, 1] - dst[:, 0], dst[:, 2] - dst[:, 0]], axis=2)
+    src_edges = np.stack([src[:, 1] - src[:, 0], src[:, 2] - src[:, 0]], axis=2)
+    determinant = np.linalg.det(dst_edges)
+    degenerate = np.abs(determinant) < 1e-9
+    dst_edges[degenerate] = np.eye(2)
+
+    linear = src_edges @ np.linalg.inv(dst_edges)
+    linear[degenerate] = np.eye(2)
+    offset = src[:, 0] - np.einsum('tij,tj->ti', linear, dst[:, 0])
+    return np.concatenate([linear, offset[:, :, np.newaxis]], axis=2)
+
+
+def _fill_labels(shape: Tuple[int, int], corners: np.ndarray, origin: np.ndarray) -> np.ndarray:
+    """Index of the triangle covering each pixel of a region (-1 where none does)"""
+    labels = np.full(shape, -1, dtype=np.int32)
+    polygons = np.rint(corners - origin).astype(np.int32)
+    for index, polygon in enumerate(polygons):
+        cv2.fillConvexPoly(labels, polygon, int(index))
+    return labels
+
+
+def warp_image(image: np.ndarray, rest: np.ndarray, deformed: np.ndarray, triangles: np.ndarray,
+               tolerance: float = 0.01) -> np.ndarray:
+    """
+    Warp an image so content under each rest triangle moves with the deformed one
+
+    Only the bounding box of triangles that moved more than tolerance pixels
+    is resampled; the input is returned unchanged when nothing moved. Pixels
+    the mesh uncovered (inside a moved triangle at rest, outside every
+    deformed one) become transparent/black, pixels the mesh never covered
+    are left as they are.
+    """
+    rest = np.asarray(rest, dtype=np.float64)[:, :2]
+    deformed = np.asarray(deformed, dtype=np.float64)[:, :2]
+    triangles = np.asarray(triangles, dtype=np.intp).reshape(-1, 3)
+    if len(triangles) == 0:
+        return image
+
+    moved_vertices = np.any(np.abs(deformed - rest) > tolerance, axis=1)
+    moved = np.any(moved_vertices[triangles], axis=1)
+    if not moved.any():
+        return image
+
+    # Region touched by the moved triangles, at rest and deformed
+    height, width = image.shape[:2]
+    touched = np.concatenate([rest[triangles[moved]].reshape(-1, 2), deformed[triangles[moved]].reshape(-1, 2)])
+    x0, y0 = np.clip(np.floor(touched.min(axis=0)).astype(int) - 1, 0, [width - 1, height - 1])
+    x1, y1 = np.clip(np.ceil(touched.max(axis=0)).astype(int) + 2, 1, [width, height])
+    if x1 <= x0 or y1 <= y0:
+        return image
+    origin = np.array([x0, y0], dtype=np.float64)
+
+    # Triangles overlapping the region (unmoved ones map to themselves)
+    def overlapping(positions: np.ndarray) -> np.ndarray:
+        corners = positions[triangles]
+        low = corners.min(axis=1)
+        high = corners.max(axis=1)
+        return (high[:, 0] >= x0) & (low[:, 0] < x1) & (high[:, 1] >= y0) & (low[:, 1] < y1)
+
+    candidates = np.flatnonzero(overlapping(deformed) | overlapping(rest))
+    region_shape = (y1 - y0, x1 - x0)
+    labels = _fill_labels(region_shape, deformed[triangles[candidates]], origin)
+    rest_cover = _fill_labels(region_shape, rest[triangles[candidates]], origin) >= 0
+
+    affines = triangle_affines(rest, deformed, triangles[candidates])
+    ys, xs = np.mgrid[y0:y1, x0:x1].astype(np.float32)
+    map_x = xs.copy()
+    map_y = ys.copy()
+
+    covered = labels >= 0
+    lab = labels[covered]
+    px = xs[covered]
+    py = ys[covered]
+    map_x[covered] = affines[lab, 0, 0] * px + affines[lab, 0, 1] * py + affines[lab, 0, 2]
+    map_y[covered] = affines[lab, 1, 0] * px + affines[lab, 1, 1] * py + affines[lab, 1, 2]
+
+    # Vacated pixels sample outside the image (the constant border)
+    vacated = rest_cover & ~covered
+    map_x[vacated] = -1.0
+    map_y[vacated] = -1.0
+
+    result = image.copy()
+    result[y0:y1, x0:x1] = cv2.remap(image, map_x, map_y, cv2.INTER_LINEAR,
+                                     borderMode=cv2.BORDER_CONSTANT, borderValue=0)
+    return result
@@ -12,6 +12,8 @@ from enum import Enum
 import math
 import logging
 
+from .mesh_warp import warp_image
+
 logger = logging.getLogger(__name__)
 
 class LayerType(Enum):
@@ -29,6 +31,13 @@ class LayerType(Enum):
     ACCESSORIES = "accessories"
     CLOTHING = "clothing"
 
+# Most essential first; when max_layers caps the composite the tail of this list is skipped
+LAYER_PRIORITY = (
+    LayerType.FACE_BASE, LayerType.EYES_BASE, LayerType.MOUTH, LayerType.FOREGROUND_HAIR,
+    LayerType.BACKGROUND_HAIR, LayerType.CLOTHING, LayerType.EYEBROWS, LayerType.EYES_IRIS, LayerType.NOSE,
+    LayerType.EARS, LayerType.ACCESSORIES, LayerType.EYES_HIGHLIGHT, LayerType.FACE_SHADOW
+)
+
 @dataclass
 class Layer:
     """Represents a renderable layer with depth and parallax"""
@@ -138,6 +147,11 @@ class MultiAngleRenderer:
         self.target_angle_x = 0.0
         self.rotation_speed = 3.0
         
+        # Quality knobs: composite at a fraction of the image size, and/or only the top-priority layers
+        self.composite_scale = 1.0
+        self.max_layers: Optional[int] = None
+        self._scaled_textures: Dict[LayerType, Tuple[np.ndarray, float, np.ndarray]] = {}
+        
         self._extract_layers()
         self._setup_view_angles()
         
@@ -332,13 +346,28 @@ class MultiAngleRenderer:
                     shadow_intensity = abs(self.current_angle_y) / 90.0
                     layer.opacity = shadow_intensity * 0.4
     
-    def render_layer(self, layer: Layer, output_size: Tuple[int, int]) -> np.ndarray:
-        """Render a single layer with transforms"""
+    def _scaled_texture(self, layer: Layer, scale: float) -> np.ndarray:
+        """Layer texture resized for a reduced-resolution composite (cached until the texture or scale changes)"""
+        if scale == 1.0:
+            return layer.texture
+        
+        cached = self._scaled_textures.get(layer.layer_type)
+        if cached is not None and cached[0] is layer.texture and cached[1] == scale:
+            return cached[2]
+        
+        height, width = layer.texture.shape[:2]
+        size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+        scaled = cv2.resize(layer.texture, size, interpolation=cv2.INTER_AREA)
+        self._scaled_textures[layer.layer_type] = (layer.texture, scale, scaled)
+        return scaled
+    
+    def render_layer(self, layer: Layer, output_size: Tuple[int, int], scale: float = 1.0) -> np.ndarray:
+        """Render a single layer with transforms (scale < 1 for a reduced-resolution output)"""
         if layer.texture is None:
             return np.zeros((*output_size, 4), dtype=np.uint8)
         
         height, width = output_size
-        texture = layer.texture
+        texture = self._scaled_texture(layer, scale)
         
         # Apply scaling
         if layer.scale_x != 1.0 or layer.scale_y != 1.0:
@@ -356,8 +385,8 @@ class MultiAngleRenderer:
         result = np.zeros((height, width, 4), dtype=np.uint8)
         
         # Calculate placement position
-        offset_x = int(layer.offset_x + (width - texture.shape[1]) // 2)
-        offset_y = int(layer.offset_y + (height - texture.shape[0]) // 2)
+        offset_x = int(layer.offset_x * scale + (width - texture.shape[1]) // 2)
+        offset_y = int(layer.offset_y * scale + (height - texture.shape[0]) // 2)
         
         # Ensure texture fits in output
         x1 = max(0, offset_x)
@@ -388,19 +417,23 @@ class MultiAngleRenderer:
         
         return result
     
-    def render_composite(self, output_size: Tuple[int, int]) -> np.ndarray:
-        """Render all layers composited together"""
+    def active_layers(self) -> List[Layer]:
+        """Visible layers to composite, capped to the max_layers highest-priority ones"""
+        visible = [layer for layer in self.layers.values() if layer.opacity > 0.01]
+        if self.max_layers is not None and len(visible) > self.max_layers:
+            rank = {layer_type: i for i, layer_type in enumerate(LAYER_PRIORITY)}
+            visible = sorted(visible, key=lambda layer: rank.get(layer.layer_type, len(rank)))[:self.max_layers]
+        return visible
+    
+    def render_composite(self, output_size: Tuple[int, int], scale: float = 1.0) -> np.ndarray:
+        """Render all active layers composited together"""
         height, width = output_size
         result = np.zeros((height, width, 4), dtype=np.uint8)
         
-        # Sort layers by z-order
-        sorted_layers = sorted(self.layers.items(), key=lambda x: x[1].z_order)
-        
-        # Composite layers
-        for layer_type, layer in sorted_layers:
-            if layer.opacity > 0.01:
-                layer_image = self.render_layer(layer, output_size)
-                result = self._blend_layer(result, layer_image)
+        # Composite layers by z-order
+        for layer in sorted(self.active_layers(), key=lambda layer: layer.z_order):
+            layer_image = self.render_layer(layer, output_size, scale)
+            result = self._blend_layer(result, layer_image)
         
         return result
     
@@ -423,6 +456,70 @@ class MultiAngleRenderer:
         
         return (result * 255).astype(np.uint8)
     
+    def auto_detect_layers(self, image: np.ndarray) -> Dict[str, Layer]:
+        """Get the layers extracted from the character image, keyed by layer name"""
+        if image is not self.original_image:
+            self.original_image = image
+            self._extract_layers()
+        return {layer_type.value: layer for layer_type, layer in self.layers.items()}
+    
+    def set_layer_depths(self, layer_depths: Dict[str, float]):
+        """Apply extra depth offsets by layer name"""
+        for layer_type, layer in self.layers.items():
+            if layer_type.value in layer_depths:
+                layer.depth_offset = layer_depths[layer_type.value]
+    
+    def export_layer_data(self) -> Dict[str, object]:
+        """Export view angles and per-layer depth offsets"""
+        return {
+            'angle_y': float(self.target_angle_y),
+            'angle_x': float(self.target_angle_x),
+            'layer_depths': {layer_type.value: float(layer.depth_offset) for layer_type, layer in self.layers.items()}
+        }
+    
+    def import_layer_data(self, layer_data: Dict[str, object]):
+        """Restore state written by export_layer_data"""
+        self.set_layer_depths(layer_data.get('layer_depths', {}))
+        self.set_view_angle(layer_data.get('angle_y', self.target_angle_y),
+                            layer_data.get('angle_x', self.target_angle_x))
+    
+    def set_viewing_angle(self, angle_y: float):
+        """Set target horizontal viewing angle in radians"""
+        self.set_view_angle(math.degrees(angle_y), self.target_angle_x)
+    
+    def render_frame(self, deformed_mesh=None) -> np.ndarray:
+        """
+        Render a BGRA frame at the character image size
+        
+        The layer composite (at composite_scale, then upsampled) is warped
+        piecewise-affinely from the mesh's rest vertices to its deformed ones,
+        which is how pose, expression, lip sync and gaze reach the pixels.
+        The view angle comes from set_viewing_angle()/update().
+        """
+        height, width = self.original_image.shape[:2]
+        scale = min(max(self.composite_scale, 0.05), 1.0)
+        if scale == 1.0:
+            return self._warp_by_mesh(self.render_composite((height, width)), deformed_mesh, 1.0)
+        
+        reduced = (max(1, int(round(height * scale))), max(1, int(round(width * scale))))
+        composite = self._warp_by_mesh(self.render_composite(reduced, scale), deformed_mesh, scale)
+        return cv2.resize(composite, (width, height), interpolation=cv2.INTER_LINEAR)
+    
+    def _warp_by_mesh(self, frame: np.ndarray, deformed_mesh: Optional[Dict], scale: float) -> np.ndarray:
+        """Move the composite's pixels with the deformed animation mesh"""
+        if not deformed_mesh or 'vertices' not in deformed_mesh or 'triangles' not in deformed_mesh:
+            return frame
+        
+        rest = deformed_mesh.get('rest_vertices')
+        if rest is None:
+            if 'uv_coords' not in deformed_mesh:
+                return frame
+            height, width = self.original_image.shape[:2]
+            rest = deformed_mesh['uv_coords'] * np.array([width, height], dtype=np.float32)
+        
+        vertices = np.asarray(deformed_mesh['vertices'])[:, :2]
+        return warp_image(frame, np.asarray(rest)[:, :2] * scale, vertices * scale, deformed_mesh['triangles'])
+    
     def get_current_angle(self) -> Tuple[float, float]:
         """Get current viewing angle"""
         return self.current_angle_y, self.current_angle_x
@@ -10,11 +10,61 @@ import logging
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 import json
+from scipy.spatial.transform import Rotation
 
 # Import our professional animation systems
 from .skeletal_system import SkeletalAnimationSystem
 from .multi_angle_system import MultiAngleRenderer  
 from .facial_animation import AdvancedFacialAnimator
+from .skeletal_animation_engine import PhysicsSystem
+from .adaptive_mesh import build_adaptive_mesh, foreground_mask
+from .mesh_normals import IncrementalNormals
+from .region_blend_shapes import GAZE_SHAPES, region_blend_deltas
+from .skin_binding import bind_skin_weights, rig_to_image_matrix
+from ..optimization.quality_governor import QUALITY_LADDER, QualityGovernor, QualityStep
+from .clip_format import (CLIP_EXTENSION, clip_from_animation_data, clip_to_animation_data,
+                          is_clip_file, json_safe, load_clip, write_clip)
+
+# Per quality level: animation mesh grid density, target fps and physics
+QUALITY_SETTINGS = {
+    'low': {'mesh_density': 25, 'fps': 30, 'physics': True},
+    'medium': {'mesh_density': 35, 'fps': 45, 'physics': True},
+    'high': {'mesh_density': 50, 'fps': 60, 'physics': True},
+    'ultra': {'mesh_density': 75, 'fps': 120, 'physics': True}
+}
+QUALITY_LEVELS = ('low', 'medium', 'high', 'ultra')
+
+
+def _decompose_transforms(matrices: np.ndarray) -> Tuple[Rotation, np.ndarray, np.ndarray]:
+    """Split (N, 4, 4) affine transforms into rotations, per-axis scales and translations"""
+    linear = matrices[:, :3, :3]
+    scale = np.linalg.norm(linear, axis=1)
+    scale = np.where(scale > 1e-9, scale, 1e-9)
+    # A mirrored transform keeps a proper rotation and carries the flip in its x scale
+    scale[:, 0] *= np.where(np.linalg.det(linear) < 0.0, -1.0, 1.0)
+    return Rotation.from_matrix(linear / scale[:, np.newaxis, :]), scale, matrices[:, :3, 3]
+
+
+def _blend_transforms(start: np.ndarray, end: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Interpolate (N, 4, 4) bone transforms pairwise
+    
+    Rotations are slerped, scales and translations lerped, so a blended
+    bone never shears or shrinks the way a component-wise matrix lerp does.
+    """
+    start_rotation, start_scale, start_translation = _decompose_transforms(start)
+    end_rotation, end_scale, end_translation = _decompose_transforms(end)
+    
+    # Per-bone slerp: rotate from start by alpha of the relative rotation
+    relative = (start_rotation.inv() * end_rotation).as_rotvec()
+    rotation = (start_rotation * Rotation.from_rotvec(relative * alpha)).as_matrix()
+    scale = start_scale + (end_scale - start_scale) * alpha
+    
+    blended = np.zeros_like(start)
+    blended[:, :3, :3] = rotation * scale[:, np.newaxis, :]
+    blended[:, :3, 3] = start_translation + (end_translation - start_translation) * alpha
+    blended[:, 3, 3] = 1.0
+    return blended
 
 # Performance monitoring
 @dataclass
@@ -25,8 +75,16 @@ class PerformanceMetrics:
     skeletal_time: float = 0.0
     facial_time: float = 0.0
     render_time: float = 0.0
+    physics_time: float = 0.0
+    physics_share: float = 0.0
+    physics_particles: int = 0
+    sleeping_particle_groups: int = 0
     total_bones: int = 0
     active_blend_shapes: int = 0
+    dropped_frames: int = 0
+    late_frames: int = 0
+    skipped_steps: int = 0
+    frame_jitter_ms: float = 0.0
 
 
 class ProfessionalAnimator:
@@ -39,12 +97,12 @@ class ProfessionalAnimator:
         """Initialize the professional animation system"""
         self.target_fps = target_fps
         self.frame_time_target = 1.0 / target_fps
-        self.enable_physics = enable_physics
         
         # Initialize sub-systems
         self.skeletal_system = SkeletalAnimationSystem()
         self.multi_angle_renderer = None  # Will be initialized when character image is loaded
         self.facial_animator = AdvancedFacialAnimator()
+        self.physics = PhysicsSystem()
         
         # Animation state
         self.current_pose = "idle"
@@ -59,10 +117,29 @@ class ProfessionalAnimator:
         self.frame_times = []
         self.max_frame_history = 60
         
+        # Last two simulated states (bone palette + blend weights) for interpolation
+        self._previous_state = None
+        self._current_state = None
+        
         # Character data
         self.character_image = None
         self.character_mesh = None
         self.character_layers = {}
+        self.character_mask = None
+        # 'adaptive' meshes follow facial regions and the silhouette; 'grid' spreads vertices uniformly
+        self.mesh_layout = 'adaptive'
+        # Skin weights from distance to bone positions ('points') or to parent->bone segments ('segments')
+        self.skin_binding = 'points'
+        self.mesh_normals: Optional[IncrementalNormals] = None
+        
+        # Mesh LOD pyramid: one bound mesh (and normals cache) per quality level, built once per character
+        self.mesh_lods: Dict[str, Dict] = {}
+        self._lod_normals: Dict[str, IncrementalNormals] = {}
+        self.mesh_level = 'high'
+        
+        # Adaptive quality: steps mesh LOD, physics substeps and composite resolution/layers from frame times
+        self.auto_quality = False
+        self.quality_governor: Optional[QualityGovernor] = None
         
         # Real-time state
         self.is_speaking = False
@@ -92,22 +169,13 @@ class ProfessionalAnimator:
     def load_character(self, image_path: str) -> bool:
         """Load character image and set up animation mesh"""
         try:            # Load character image
-            self.character_image = cv2.imread(image_path, cv2.IMREAD_UNCHANGED)
-            if self.character_image is None:
+            image = cv2.imread(image_path, cv2.IMREAD_UNCHANGED)
+            if image is None:
                 logging.error(f"Failed to load character image: {image_path}")
                 return False
             
-            # Initialize multi-angle renderer with the loaded image
-            self.multi_angle_renderer = MultiAngleRenderer(self.character_image)
-            
-            # Process character for animation
-            self._process_character_for_animation()
-            
-            # Set up layer separation
-            self._setup_character_layers()
-            
-            # Initialize facial landmarks
-            self._detect_facial_features()
+            self.set_character_image(image)
+            self.prepare_character()
             
             logging.info(f"Character loaded successfully: {image_path}")
             return True
@@ -116,88 +184,152 @@ class ProfessionalAnimator:
             logging.error(f"Error loading character: {e}")
             return False
     
+    def set_character_image(self, image: np.ndarray):
+        """
+        First loading stage: take the character image and find its facial features
+        
+        Call prepare_character() afterwards; load_character() does both.
+        """
+        self.character_image = image
+        
+        # Initialize multi-angle renderer with the loaded image
+        self.multi_angle_renderer = MultiAngleRenderer(self.character_image)
+        
+        # Initialize facial landmarks (the adaptive mesh is built around them)
+        self._detect_facial_features()
+    
+    def prepare_character(self):
+        """Second loading stage: build and bind the animation meshes and separate the layers"""
+        # Process character for animation
+        self._process_character_for_animation()
+        if self.auto_quality:
+            self._apply_quality_step(self.quality_governor.step)
+        
+        # Set up layer separation
+        self._setup_character_layers()
+    
     def _process_character_for_animation(self):
         """Process character image for professional animation"""
         if self.character_image is None:
             return
         
-        # Auto-detect and create animation mesh
-        self.character_mesh = self._create_animation_mesh()
-        
-        # Set up bone binding
-        self._bind_mesh_to_skeleton()
+        # Build and bind every LOD level up front so quality switches are instant
+        self.character_mask = foreground_mask(self.character_image)
+        self._build_mesh_pyramid()
+        self._select_mesh_level(self.mesh_level)
         
         # Create facial region mapping
         self._map_facial_regions()
     
-    def _create_animation_mesh(self) -> Dict:
-        """Create professional animation mesh from character image"""
+    def _create_animation_mesh(self, mesh_density: int = 50) -> Dict:
+        """Create professional animation mesh from character image at the given grid-equivalent density"""
+        if self.mesh_layout == 'adaptive':
+            mesh = build_adaptive_mesh(self.character_image, self.facial_animator.get_facial_regions(),
+                                       mesh_density, self.character_mask)
+            if mesh is not None:
+                return mesh
+            # Foreground smaller than a grid cell - nothing to triangulate at this level
+            logging.info(f"Adaptive mesh unavailable at density {mesh_density}, using the uniform grid")
+        return self._create_grid_mesh(mesh_density)
+    
+    def _create_grid_mesh(self, mesh_density: int = 50) -> Dict:
+        """Uniform mesh over the whole image (mesh_density x mesh_density quads)"""
         height, width = self.character_image.shape[:2]
         
-        # Generate dense mesh for smooth deformation
-        mesh_density = 50  # Higher density for professional quality
-        vertices = []
-        triangles = []
-        
-        # Create regular grid mesh
-        for y in range(mesh_density + 1):
-            for x in range(mesh_density + 1):
-                u = x / mesh_density
-                v = y / mesh_density
-                vertices.append([u * width, v * height])
-        
-        # Create triangular mesh
-        for y in range(mesh_density):
-            for x in range(mesh_density):
-                # Two triangles per quad
-                i = y * (mesh_density + 1) + x
-                triangles.append([i, i + 1, i + mesh_density + 1])
-                triangles.append([i + 1, i + mesh_density + 2, i + mesh_density + 1])
+        # Regular grid of vertices, row by row
+        u, v = np.meshgrid(np.linspace(0.0, 1.0, mesh_density + 1), np.linspace(0.0, 1.0, mesh_density + 1))
+        uv_coords = np.column_stack([u.ravel(), v.ravel()]).astype(np.float32)
+        vertices = uv_coords * np.array([width, height], dtype=np.float32)
+        
+        # Two triangles per quad
+        row = mesh_density + 1
+        i = (np.arange(mesh_density)[:, np.newaxis] * row + np.arange(mesh_density)).ravel()
+        triangles = np.stack([
+            np.column_stack([i, i + 1, i + row]),
+            np.column_stack([i + 1, i + row + 1, i + row])
+        ], axis=1).reshape(-1, 3).astype(np.int32)
         
         return {
-            'vertices': np.array(vertices, dtype=np.float32),
-            'triangles': np.array(triangles, dtype=np.int32),
-            'uv_coords': np.array(vertices, dtype=np.float32) / [width, height],
+            'vertices': vertices,
+            'triangles': triangles,
+            'uv_coords': uv_coords,
             'bone_weights': np.zeros((len(vertices), 4), dtype=np.float32),
-            'bone_indices': np.zeros((len(vertices), 4), dtype=np.int32)
+            'bone_indices': np.zeros((len(vertices), 4), dtype=np.int32),
+            'mesh_density': mesh_density,
+            'layout': 'grid'
         }
     
-    def _bind_mesh_to_skeleton(self):
-        """Bind mesh vertices to skeleton bones"""
-        if self.character_mesh is None:
+    def _build_mesh_pyramid(self):
+        """Create and skin one animation mesh per quality level"""
+        self.mesh_lods = {}
+        self._lod_normals = {}
+        meshes_by_density = {}
+        for level in QUALITY_LEVELS:
+            density = QUALITY_SETTINGS[level]['mesh_density']
+            if density not in meshes_by_density:
+                mesh = self._create_animation_mesh(density)
+                self._bind_mesh_to_skeleton(mesh)
+                self._build_blend_deltas(mesh)
+                meshes_by_density[density] = (mesh, IncrementalNormals(mesh['triangles'], len(mesh['vertices'])))
+            self.mesh_lods[level], self._lod_normals[level] = meshes_by_density[density]
+        
+        logging.info("Mesh LOD pyramid: " + ", ".join(
+            f"{level}={len(mesh['vertices'])} vertices" for level, mesh in self.mesh_lods.items()))
+    
+    def _build_blend_deltas(self, mesh: Dict):
+        """Procedural per-vertex blend shape offsets from the facial regions"""
+        height, width = self.character_image.shape[:2]
+        names, deltas = region_blend_deltas(mesh['vertices'], self.facial_animator.get_facial_regions(),
+                                            (width, height))
+        mesh['blend_shape_names'] = names
+        mesh['blend_deltas'] = deltas
+    
+    def _select_mesh_level(self, level: str) -> bool:
+        """Swap the active animation mesh to a prebuilt LOD level"""
+        if level not in self.mesh_lods:
+            return False
+        self.mesh_level = level
+        self.character_mesh = self.mesh_lods[level]
+        self.mesh_normals = self._lod_normals[level]
+        return True
+    
+    def _bind_mesh_to_skeleton(self, mesh: Optional[Dict] = None):
+        """Bind mesh vertices to skeleton bones (the active mesh by default)"""
+        mesh = self.character_mesh if mesh is None else mesh
+        if mesh is None:
             return
         
-        vertices = self.character_mesh['vertices']
-        bone_weights = self.character_mesh['bone_weights']
-        bone_indices = self.character_mesh['bone_indices']
+        # Bind pose: the skeleton's current world transforms
+        if self.skeletal_system.root_bone:
+            self.skeletal_system.root_bone.update_world_transform()
+        bind_pose = np.stack(list(self.skeletal_system.get_bone_transforms().values()))
         
-        # Get bone positions from skeletal system
+        # Bone data in palette order (the 'index' the deformer looks transforms up by)
         bones = self.skeletal_system.get_all_bones()
+        ordered = sorted(bones.values(), key=lambda bone_data: bone_data['index'])
+        radii = np.array([bone_data.get('influence_radius', 50.0) for bone_data in ordered])
         
-        # Calculate bone weights for each vertex
-        for i, vertex in enumerate(vertices):
-            weights = []
-            indices = []
-            
-            for bone_name, bone_data in bones.items():
-                bone_pos = bone_data['world_position']
-                distance = np.linalg.norm(vertex - bone_pos[:2])  # 2D distance
-                
-                # Calculate weight based on distance and bone influence radius
-                influence_radius = bone_data.get('influence_radius', 50.0)
-                if distance < influence_radius:
-                    weight = max(0.0, 1.0 - (distance / influence_radius))
-                    weights.append((weight, bone_data['index']))
-            
-            # Sort by weight and take top 4 influences
-            weights.sort(key=lambda x: x[0], reverse=True)
-            weights = weights[:4]
-              # Normalize weights
-            total_weight = sum(w[0] for w in weights)
-            if total_weight > 0:
-                for j, (weight, bone_idx) in enumerate(weights):
-                    bone_weights[i, j] = weight / total_weight
-                    bone_indices[i, j] = bone_idx
+        # Bones live in rig units; bind and deform in the mesh's pixel space
+        if self.character_mask is not None:
+            bounds = cv2.boundingRect(self.character_mask)
+        else:
+            height, width = self.character_image.shape[:2]
+            bounds = (0, 0, width, height)
+        rig_to_image = rig_to_image_matrix(bind_pose[:, :3, 3], bounds)
+        image_pose = rig_to_image @ bind_pose
+        positions = image_pose[:, :2, 3]  # 2D binding
+        
+        starts = None
+        if self.skin_binding == 'segments':
+            parent_index = {bone_data['index']: bones[bone_data['parent']]['index']
+                            for bone_data in ordered if bone_data.get('parent') in bones}
+            starts = np.array([positions[parent_index.get(i, i)] for i in range(len(positions))])
+        
+        weights, indices = bind_skin_weights(mesh['vertices'], positions, radii, starts, nearest_fallback=True)
+        mesh['bone_weights'] = weights
+        mesh['bone_indices'] = indices
+        mesh['rig_to_image'] = rig_to_image
+        mesh['bind_matrices'] = np.linalg.inv(image_pose)
     
     def _setup_character_layers(self):
         """Set up character layers for 2.5D rendering"""
@@ -289,6 +421,16 @@ class ProfessionalAnimator:
         self.performance.facial_time = time.time() - start_time
         return success
     
+    def set_emotion_mix(self, mixture: Dict[str, float], transition_time: float = 0.3):
+        """Blend several emotions at once, e.g. {'happy': 0.6, 'surprised': 0.3}"""
+        start_time = time.time()
+        
+        self.facial_animator.set_emotion_mix(mixture, transition_time)
+        self.current_emotion = self.facial_animator.current_emotion
+        self.emotion_intensity = self.facial_animator.emotion_intensity
+        
+        self.performance.facial_time = time.time() - start_time
+    
     def set_head_rotation(self, pitch: float, yaw: float, roll: float = 0.0):
         """Set head rotation angles (in degrees)"""
         self.head_rotation = [pitch, yaw, roll]
@@ -325,17 +467,20 @@ class ProfessionalAnimator:
         self.current_text = ""
         self.facial_animator.stop_speaking()
     
-    def trigger_gesture(self, gesture_name: str):
-        """Trigger a gesture animation"""
-        self.skeletal_system.trigger_gesture(gesture_name)
+    def trigger_gesture(self, gesture_name: str, layer: int = 0, mode: str = 'override', weight: float = 1.0):
+        """Trigger a gesture animation ('additive' layers stack on top of the current pose)"""
+        self.skeletal_system.trigger_gesture(gesture_name, layer, mode, weight)
     
     def update(self, delta_time: float) -> np.ndarray:
         """
         Main update loop - call this every frame
         Returns the rendered frame
         """
-        frame_start = time.time()
-        
+        self.simulate(delta_time)
+        return self.present(1.0)
+    
+    def simulate(self, delta_time: float):
+        """Advance animation state by one step without rendering"""
         # Update skeletal animation
         skeletal_start = time.time()
         self.skeletal_system.update(delta_time)
@@ -346,22 +491,91 @@ class ProfessionalAnimator:
         self.facial_animator.update(delta_time)
         self.performance.facial_time = time.time() - facial_start
         
+        # Secondary motion (hair/cloth) driven by the skeleton
+        physics_start = time.time()
+        if self.physics_enabled:
+            self._simulate_physics(delta_time)
+        self.performance.physics_time = time.time() - physics_start
+        
+        # Ease the 2.5D view towards the target angle
+        if self.multi_angle_renderer:
+            self.multi_angle_renderer.update(delta_time)
+        
+        # Keep the last two states for interpolated presentation
+        self._previous_state = self._current_state
+        self._current_state = self._capture_state()
+    
+    def _simulate_physics(self, delta_time: float):
+        """Step hair and cloth particles against the current skeleton pose"""
+        bones = self.skeletal_system.bones
+        if 'head' not in bones:
+            return
+        
+        self.physics.simulate_hair(bones['head'], delta_time, bones)
+        body_bones = [bones[name] for name in ('chest', 'spine', 'neck', 'left_shoulder', 'right_shoulder',
+                                               'left_upper_arm', 'right_upper_arm') if name in bones]
+        self.physics.simulate_clothing(body_bones, delta_time)
+    
+    def present(self, alpha: float = 1.0) -> np.ndarray:
+        """
+        Render the state interpolated between the last two simulation steps
+        alpha = 0 is the previous step, alpha = 1 the latest one
+        """
+        present_start = time.time()
+        
+        bone_transforms, blend_weights = self._interpolate_state(alpha)
+        
         # Render frame
-        render_start = time.time()
-        rendered_frame = self._render_frame()
-        self.performance.render_time = time.time() - render_start
-          # Update performance metrics
-        self.performance.frame_time = time.time() - frame_start
+        rendered_frame = self._render_frame(bone_transforms, blend_weights)
+        
+        # Update performance metrics
+        self.performance.frame_time = (time.time() - present_start
+                                       + self.performance.skeletal_time
+                                       + self.performance.facial_time
+                                       + self.performance.physics_time)
         self.performance.fps = 1.0 / self.performance.frame_time if self.performance.frame_time > 0 else 0
+        self.performance.physics_share = (self.performance.physics_time / self.performance.frame_time
+                                          if self.performance.frame_time > 0 else 0.0)
+        self.performance.physics_particles = self.physics.particle_count if self.physics_enabled else 0
+        self.performance.sleeping_particle_groups = self.physics.sleeping_groups if self.physics_enabled else 0
         self.performance.total_bones = len(self.skeletal_system.bones)
         self.performance.active_blend_shapes = len([bs for bs in self.facial_animator.blend_shapes.values() if bs.weight > 0.01])
         
         # Track frame times
         self._update_frame_time_history()
+        if self.auto_quality:
+            self.quality_governor.record(self.performance.frame_time)
         
         return rendered_frame
     
-    def _render_frame(self) -> np.ndarray:
+    def _capture_state(self) -> Tuple[List[str], np.ndarray, List[str], np.ndarray]:
+        """Snapshot the bone palette and blend shape weights as arrays"""
+        matrices = self.skeletal_system.get_bone_transforms()
+        weights = self.facial_animator.get_blend_shape_weights()
+        
+        return (list(matrices.keys()),
+                np.stack(list(matrices.values())) if matrices else np.zeros((0, 4, 4)),
+                list(weights.keys()),
+                np.fromiter(weights.values(), dtype=np.float64, count=len(weights)))
+    
+    def _interpolate_state(self, alpha: float) -> Tuple[Dict, Dict]:
+        """Blend the previous and current snapshots into render inputs"""
+        if self._current_state is None:
+            self._current_state = self._capture_state()
+        
+        bone_names, palette, weight_names, weights = self._current_state
+        previous = self._previous_state
+        
+        # Only blend when both snapshots describe the same rig
+        if previous is not None and alpha < 1.0 and previous[0] == bone_names and previous[2] == weight_names:
+            alpha = max(0.0, alpha)
+            palette = _blend_transforms(previous[1], palette, alpha)
+            weights = previous[3] + (weights - previous[3]) * alpha
+        
+        return dict(zip(bone_names, palette)), dict(zip(weight_names, weights.tolist()))
+    
+    def _render_frame(self, bone_transforms: Optional[Dict] = None,
+                      blend_weights: Optional[Dict] = None) -> np.ndarray:
         """Render the current animation frame"""
         if self.character_image is None:
             # Return black frame if no character loaded
@@ -370,21 +584,19 @@ class ProfessionalAnimator:
         render_start = time.time()
         
         # Get current bone transforms
-        bone_transforms = self.skeletal_system.get_bone_transforms()
+        if bone_transforms is None:
+            bone_transforms = self.skeletal_system.get_bone_transforms()
         
         # Get current blend shape weights
-        blend_weights = self.facial_animator.get_blend_shape_weights()
-          # Apply deformations to character mesh
+        if blend_weights is None:
+            blend_weights = self.facial_animator.get_blend_shape_weights()
+        
+        # Apply deformations to character mesh
         deformed_mesh = self._apply_deformations(bone_transforms, blend_weights)
         
         # Render with multi-angle system (if available)
         if self.multi_angle_renderer:
-            rendered_frame = self.multi_angle_renderer.render_frame(
-                self.character_layers,
-                deformed_mesh,
-                self.viewing_angle,
-                self.looking_direction
-            )
+            rendered_frame = self.multi_angle_renderer.render_frame(deformed_mesh)
         else:
             # Fallback to original image if multi-angle renderer not available
             rendered_frame = self.character_image if self.character_image is not None else np.zeros((512, 512, 3), dtype=np.uint8)
@@ -406,46 +618,57 @@ class ProfessionalAnimator:
         # Apply facial deformation (blend shapes)
         vertices = self._apply_facial_deformation(vertices, blend_weights)
         
-        # Return deformed mesh
+        # Return deformed mesh; normals are only recomputed around vertices that moved since last frame
         deformed_mesh = self.character_mesh.copy()
+        deformed_mesh['rest_vertices'] = self.character_mesh['vertices']
         deformed_mesh['vertices'] = vertices
+        if self.mesh_normals is not None:
+            deformed_mesh['normals'] = self.mesh_normals.update(vertices)
         
         return deformed_mesh
     
     def _apply_skeletal_deformation(self, vertices: np.ndarray, bone_transforms: Dict) -> np.ndarray:
-        """Apply skeletal bone transformations to vertices"""
+        """Linear blend skinning by the bone palette; weight a vertex's bones don't claim keeps it at rest"""
         bone_weights = self.character_mesh['bone_weights']
         bone_indices = self.character_mesh['bone_indices']
+        if not bone_transforms:
+            return vertices
         
-        deformed_vertices = vertices.copy()
+        # Palette relative to the bind pose, in the mesh's pixel space
+        palette = np.stack(list(bone_transforms.values()))
+        bind_matrices = self.character_mesh.get('bind_matrices')
+        if bind_matrices is not None and len(bind_matrices) == len(palette):
+            palette = self.character_mesh['rig_to_image'] @ palette @ bind_matrices
         
-        # Apply weighted bone transformations
-        for i, vertex in enumerate(vertices):
-            transformed_vertex = np.zeros(3)  # x, y, z
-            
-            for j in range(4):  # Up to 4 bone influences per vertex
-                weight = bone_weights[i, j]
-                if weight > 0.001:  # Skip negligible weights
-                    bone_idx = bone_indices[i, j]
-                    
-                    # Get bone transform matrix
-                    if bone_idx < len(bone_transforms):
-                        transform = list(bone_transforms.values())[bone_idx]
-                        
-                        # Apply transformation (simplified 2D transform)
-                        vertex_3d = np.array([vertex[0], vertex[1], 0.0, 1.0])
-                        transformed = transform @ vertex_3d
-                        transformed_vertex += weight * transformed[:3]
-            
-            deformed_vertices[i] = transformed_vertex[:2]  # Keep only x, y
+        # Up to 4 bone influences per vertex; indices outside the palette contribute nothing
+        valid = bone_indices < len(palette)
+        weights = np.where(valid, bone_weights, 0.0)
+        skin = np.einsum('vj,vjab->vab', weights, palette[np.where(valid, bone_indices, 0)])
+        
+        # Apply transformation (2D vertices on the z = 0 plane)
+        points = np.column_stack([vertices[:, :2], np.zeros(len(vertices)), np.ones(len(vertices))])
+        transformed = np.einsum('vab,vb->va', skin, points)[:, :2]
+        rest_weight = 1.0 - weights.sum(axis=1, keepdims=True)
         
+        deformed_vertices = vertices.copy()
+        deformed_vertices[:, :2] = transformed + rest_weight * vertices[:, :2]
         return deformed_vertices
     
     def _apply_facial_deformation(self, vertices: np.ndarray, blend_weights: Dict) -> np.ndarray:
         """Apply facial blend shape deformations"""
         deformed_vertices = vertices.copy()
         
-        # Apply each active blend shape
+        # Procedural region shapes (and gaze) as one weighted sum over the mesh's delta stack
+        names = self.character_mesh.get('blend_shape_names')
+        if names:
+            gaze = dict(zip(GAZE_SHAPES, self.facial_animator.eye_direction))
+            weights = np.array([gaze[name] if name in gaze else blend_weights.get(name, 0.0) for name in names])
+            active = np.flatnonzero(np.abs(weights) > 0.001)
+            if len(active):
+                deformed_vertices[:, :2] += np.tensordot(weights[active], self.character_mesh['blend_deltas'][active],
+                                                         axes=1)
+        
+        # Apply each active authored blend shape
         for blend_name, weight in blend_weights.items():
             if weight > 0.001:  # Skip negligible weights
                 # Get blend shape deltas
@@ -552,26 +775,55 @@ class ProfessionalAnimator:
     
     def enable_physics(self, enabled: bool = True):
         """Enable/disable physics simulation"""
+        # Resuming after a pause must not turn the skipped motion into velocity
+        if enabled and not self.physics_enabled:
+            self.physics.teleport()
         self.physics_enabled = enabled
-        # Physics would affect hair, clothing, etc.
     
     def set_quality_level(self, level: str):
-        """Set rendering quality level"""
-        quality_settings = {
-            'low': {'mesh_density': 25, 'fps': 30, 'physics': False},
-            'medium': {'mesh_density': 35, 'fps': 45, 'physics': True},
-            'high': {'mesh_density': 50, 'fps': 60, 'physics': True},
-            'ultra': {'mesh_density': 75, 'fps': 120, 'physics': True}
-        }
+        """
+        Set rendering quality level
         
-        if level in quality_settings:
-            settings = quality_settings[level]
+        'auto' keeps the current frame time target and hands mesh LOD, physics
+        substeps and composite resolution/layer count to the quality governor.
+        """
+        if level == 'auto':
+            self.auto_quality = True
+            self.quality_governor = QualityGovernor(self.frame_time_target, self._apply_quality_step,
+                                                    start_index=self._current_quality_step())
+            self._apply_quality_step(self.quality_governor.step)
+            logging.info(f"Adaptive quality enabled (target {self.frame_time_target * 1000:.1f}ms, "
+                         f"step {self.quality_governor.index}/{len(QUALITY_LADDER) - 1})")
+            return
+        
+        if level in QUALITY_SETTINGS:
+            settings = QUALITY_SETTINGS[level]
+            self.auto_quality = False
             self.target_fps = settings['fps']
             self.frame_time_target = 1.0 / self.target_fps
             self.enable_physics(settings['physics'])
+            self.physics.set_quality_level(level)
+            self._select_mesh_level(level)
+            if self.multi_angle_renderer:
+                self.multi_angle_renderer.composite_scale = 1.0
+                self.multi_angle_renderer.max_layers = None
             
             logging.info(f"Quality set to {level}: {settings}")
     
+    def _current_quality_step(self) -> int:
+        """Highest ladder step matching the current mesh level and physics substeps"""
+        matches = [i for i, step in enumerate(QUALITY_LADDER)
+                   if step.mesh_level == self.mesh_level and step.physics_substeps <= self.physics.substeps]
+        return matches[-1] if matches else len(QUALITY_LADDER) - 1
+    
+    def _apply_quality_step(self, step: QualityStep):
+        """Push one governor step into the mesh, physics and renderer"""
+        self._select_mesh_level(step.mesh_level)
+        self.physics.set_substeps(step.physics_substeps)
+        if self.multi_angle_renderer:
+            self.multi_angle_renderer.composite_scale = step.composite_scale
+            self.multi_angle_renderer.max_layers = step.max_layers
+    
     # Performance and debugging
     def get_performance_metrics(self) -> PerformanceMetrics:
         """Get current performance metrics"""
@@ -599,7 +851,7 @@ class ProfessionalAnimator:
         }
     
     def export_animation_data(self, filepath: str):
-        """Export current animation state to file"""
+        """Export current animation state to file (binary clip for .aclip paths, JSON otherwise)"""
         animation_data = {
             'skeletal_data': self.skeletal_system.export_skeleton_data(),
             'facial_data': self.facial_animator.export_blend_shapes(),
@@ -607,17 +859,24 @@ class ProfessionalAnimator:
             'animation_state': self.get_animation_state()
         }
         
-        with open(filepath, 'w') as f:
-            json.dump(animation_data, f, indent=2)
+        if filepath.lower().endswith(CLIP_EXTENSION):
+            write_clip(filepath, clip_from_animation_data(animation_data))
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(json_safe(animation_data), f, indent=2)
         
         logging.info(f"Animation data exported to: {filepath}")
     
     def import_animation_data(self, filepath: str):
-        """Import animation state from file"""
+        """Import animation state from a JSON export or a binary clip"""
         try:
-            with open(filepath, 'r') as f:
-                animation_data = json.load(f)
-              # Restore systems
+            if is_clip_file(filepath):
+                animation_data = clip_to_animation_data(load_clip(filepath))
+            else:
+                with open(filepath, 'r') as f:
+                    animation_data = json.load(f)
+            
+            # Restore systems
             if 'skeletal_data' in animation_data:
                 self.skeletal_system.import_skeleton_data(animation_data['skeletal_data'])
             
@@ -0,0 +1,126 @@
+"""
+Procedural 2D blend shapes
+Per-vertex mesh offsets for every facial blend shape, derived from the eye and mouth region boxes
+"""
+
+import logging
+from typing import Dict, List, Mapping, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Mouth shapes: (opening, widening), both in half-heights/half-widths of the mouth box
+MOUTH_SHAPES = {
+    'mouth_open': (0.8, 0.0),
+    'jaw_open': (1.0, 0.0),
+    'mouth_pucker': (0.0, -0.35),
+    'viseme_a': (0.9, 0.0),
+    'viseme_e': (0.4, 0.2),
+    'viseme_i': (0.25, 0.3),
+    'viseme_o': (0.6, -0.3),
+    'viseme_u': (0.3, -0.45),
+    'viseme_m': (-0.1, 0.0),
+    'viseme_f': (0.15, 0.05),
+    'viseme_th': (0.2, 0.05),
+    'viseme_s': (0.15, 0.2),
+    'viseme_t': (0.25, 0.1),
+    'viseme_r': (0.3, -0.2)
+}
+
+# Gaze pseudo-shapes, driven by the eye direction instead of a blend shape weight
+GAZE_SHAPES = ('gaze_x', 'gaze_y')
+
+
+def _box(regions: Mapping[str, Tuple[float, float, float, float]], name: str,
+         size: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Center and half-extent of a normalized region box, in pixels"""
+    x1, y1, x2, y2 = regions[name]
+    low = np.array([x1, y1]) * size
+    high = np.array([x2, y2]) * size
+    return (low + high) / 2.0, np.maximum((high - low) / 2.0, 1e-6)
+
+
+def _falloff(local: np.ndarray, reach: float = 1.5) -> np.ndarray:
+    """Smooth weight from 1 at the box center to 0 at reach half-extents"""
+    return np.clip(1.0 - np.einsum('vi,vi->v', local, local) / (reach * reach), 0.0, 1.0) ** 2
+
+
+def region_blend_deltas(vertices: np.ndarray, regions: Mapping[str, Tuple[float, float, float, float]],
+                        image_size: Tuple[int, int]) -> Tuple[List[str], np.ndarray]:
+    """
+    Blend shape offsets for a 2D mesh
+
+    Eye shapes close/open the lids around each eye box's center line, brow
+    shapes move a band above each eye, mouth shapes and visemes open the
+    lower lip and widen or narrow the corners, and cheek shapes push
+    outwards between eye and mouth. Sides follow the image: '_L' shapes act
+    on the 'left_eye' box (smaller x). Returns the shape names and a
+    (shapes, V, 2) float32 array of pixel offsets at weight 1.
+    """
+    width, height = image_size
+    size = np.array([width, height], dtype=np.float64)
+    points = np.asarray(vertices, dtype=np.float64)[:, :2]
+    deltas: Dict[str, np.ndarray] = {}
+
+    def add(name: str, delta: np.ndarray):
+        deltas[name] = deltas.get(name, 0.0) + delta
+
+    for eye, suffix, side in (('left_eye', 'L', -1.0), ('right_eye', 'R', 1.0)):
+        if eye not in regions:
+            continue
+        center, half = _box(regions, eye, size)
+        local = (points - center) / half
+        u, v = local[:, 0], local[:, 1]
+        weight = _falloff(local)
+
+        # Upper lid travels further than the lower one
+        lid = np.where(v < 0.0, 1.0, 0.4)
+        add(f'eye_blink_{suffix}', np.column_stack([np.zeros_like(v), -v * half[1] * lid * weight]))
+        add(f'eye_wide_{suffix}', np.column_stack([np.zeros_like(v), 0.3 * v * half[1] * weight]))
+        add(f'eye_squint_{suffix}', np.column_stack([np.zeros_like(v), -0.4 * v * half[1] * weight]))
+        add(f'eye_happy_{suffix}',
+            np.column_stack([np.zeros_like(v), -0.5 * half[1] * np.clip(v + 0.5, 0.0, 1.0) * weight]))
+
+        # Brows: a band one box height above the eye; the inner end (towards the nose) leads when angry
+        brow_local = local + np.array([0.0, 2.4])
+        brow_weight = _falloff(brow_local * np.array([1.0, 1.5]))
+        inner = np.clip(0.5 - 0.5 * side * u, 0.0, 1.0)
+        zero = np.zeros_like(u)
+        add(f'brow_up_{suffix}', np.column_stack([zero, -0.6 * half[1] * brow_weight]))
+        add(f'brow_down_{suffix}', np.column_stack([zero, 0.4 * half[1] * brow_weight]))
+        add(f'brow_angry_{suffix}', np.column_stack([zero, 0.7 * half[1] * inner * brow_weight]))
+
+        # Iris/eye contents follow the gaze
+        tight = _falloff(local, reach=1.0)
+        add('gaze_x', np.column_stack([0.3 * half[0] * tight, zero]))
+        add('gaze_y', np.column_stack([zero, -0.25 * half[1] * tight]))
+
+    if 'mouth' in regions:
+        center, half = _box(regions, 'mouth', size)
+        local = (points - center) / half
+        u, v = local[:, 0], local[:, 1]
+        weight = _falloff(local)
+        zero = np.zeros_like(u)
+
+        lower = np.clip(v + 1.0, 0.0, 2.0) / 2.0
+        for name, (opening, widening) in MOUTH_SHAPES.items():
+            reach_weight = _falloff(local, reach=2.0) if name == 'jaw_open' else weight
+            add(name, np.column_stack([widening * u * half[0] * weight, opening * half[1] * lower * reach_weight]))
+
+        for suffix, side in (('L', -1.0), ('R', 1.0)):
+            corner = np.clip(side * u, 0.0, 1.0) * weight
+            add(f'mouth_smile_{suffix}', np.column_stack([0.15 * side * half[0] * corner, -0.5 * half[1] * corner]))
+            add(f'mouth_frown_{suffix}', np.column_stack([zero, 0.4 * half[1] * corner]))
+
+        # Cheeks sit beside the mouth, under the eyes
+        for suffix, side in (('L', -1.0), ('R', 1.0)):
+            cheek = _falloff((local - np.array([side * 1.8, -1.2])) / 1.2)
+            add(f'cheek_puff_{suffix}', np.column_stack([0.3 * side * half[0] * cheek, zero]))
+            add('cheek_suck', np.column_stack([-0.2 * side * half[0] * cheek, zero]))
+
+    names = list(deltas)
+    stacked = np.stack([deltas[name] for name in names]).astype(np.float32) if names \
+        else np.zeros((0, len(points), 2), dtype=np.float32)
+    logger.debug(f"Region blend shapes: {len(names)} shapes over {len(points)} vertices")
+    return names, stacked
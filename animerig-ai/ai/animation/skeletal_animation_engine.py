@@ -21,6 +21,11 @@ import logging
 import math
 from scipy.spatial.transform import Rotation as R
 
+from .emotion_matrix import EmotionBlendMatrix
+from .gesture_clips import GestureClip, LayeredClipPlayer, compile_gestures, default_gesture_specs
+from .spatial_hash import SegmentSpatialHash
+from .verlet_solver import VerletSolver
+
 logger = logging.getLogger(__name__)
 
 class BoneType(Enum):
@@ -181,49 +186,18 @@ class FacialBlendShapes:
             'cheek_suck': BlendShape('cheek_suck'),
         }
         
-        # Emotion presets
-        self.emotion_presets = {
-            'happy': {
-                'eye_happy_L': 0.7, 'eye_happy_R': 0.7,
-                'mouth_smile_L': 0.8, 'mouth_smile_R': 0.8,
-                'cheek_puff_L': 0.3, 'cheek_puff_R': 0.3,
-                'brow_up_L': 0.2, 'brow_up_R': 0.2
-            },
-            'excited': {
-                'eye_wide_L': 0.8, 'eye_wide_R': 0.8,
-                'brow_up_L': 0.6, 'brow_up_R': 0.6,
-                'mouth_open': 0.5, 'mouth_smile_L': 0.7, 'mouth_smile_R': 0.7
-            },
-            'sad': {
-                'brow_down_L': 0.4, 'brow_down_R': 0.4,
-                'eye_squint_L': 0.3, 'eye_squint_R': 0.3,
-                'mouth_frown_L': 0.6, 'mouth_frown_R': 0.6
-            },
-            'surprised': {
-                'eye_wide_L': 0.9, 'eye_wide_R': 0.9,
-                'brow_up_L': 0.8, 'brow_up_R': 0.8,
-                'mouth_open': 0.7, 'jaw_open': 0.4
-            },
-            'angry': {
-                'brow_angry_L': 0.7, 'brow_angry_R': 0.7,
-                'brow_down_L': 0.5, 'brow_down_R': 0.5,
-                'eye_squint_L': 0.6, 'eye_squint_R': 0.6,
-                'mouth_frown_L': 0.8, 'mouth_frown_R': 0.8
-            }
-        }
+        # Emotion presets come from the shared table, resolved through one blend matrix
+        self.emotion_matrix = EmotionBlendMatrix(list(self.shapes))
+        self.emotion_presets = {emotion: self.emotion_matrix.preset(emotion) for emotion in self.emotion_matrix.emotions}
     
     def set_emotion(self, emotion: str, intensity: float = 1.0):
         """감정 설정"""
-        # Reset all shapes
-        for shape in self.shapes.values():
-            shape.weight = 0.0
-        
-        # Apply emotion preset
-        if emotion in self.emotion_presets:
-            preset = self.emotion_presets[emotion]
-            for shape_name, weight in preset.items():
-                if shape_name in self.shapes:
-                    self.shapes[shape_name].weight = weight * intensity
+        self.set_emotion_mix({emotion: intensity})
+    
+    def set_emotion_mix(self, mixture: Dict[str, float]):
+        """여러 감정 혼합 (예: {'happy': 0.6, 'surprised': 0.3})"""
+        for shape, weight in zip(self.shapes.values(), self.emotion_matrix.blend(mixture).tolist()):
+            shape.weight = weight
     
     def get_blended_vertices(self, base_vertices: np.ndarray) -> np.ndarray:
         """블렌드 쉐이프 적용된 정점 반환"""
@@ -370,60 +344,204 @@ class IKSolver:
         
         return np.array([pitch, yaw, 0])
 
+# Secondary-motion level of detail per quality level; one fixed step at ultra stays well under its 8.3ms frame
+PHYSICS_QUALITY = {
+    'low': {'hair_strands': 32, 'hair_segments': 5, 'cloth': (5, 8), 'substeps': 1, 'iterations': 2},
+    'medium': {'hair_strands': 64, 'hair_segments': 6, 'cloth': (6, 10), 'substeps': 1, 'iterations': 3},
+    'high': {'hair_strands': 128, 'hair_segments': 8, 'cloth': (8, 12), 'substeps': 2, 'iterations': 4},
+    'ultra': {'hair_strands': 160, 'hair_segments': 8, 'cloth': (8, 14), 'substeps': 2, 'iterations': 4}
+}
+
 class PhysicsSystem:
-    """물리 시뮬레이션 시스템"""
+    """물리 시뮬레이션 시스템 (Verlet 파티클 기반 머리카락/의상)"""
     
-    def __init__(self):
-        self.hair_strands = []
-        self.clothing_points = []
+    def __init__(self, hair_strand_count: int = 128, hair_segments: int = 8,
+                 cloth_rows: int = 8, cloth_cols: int = 12, substeps: int = 1,
+                 sleep_threshold: float = 1e-5):
         self.gravity = np.array([0, -9.81, 0])
         self.wind = np.array([0, 0, 0])
         
-    def simulate_hair(self, head_bone: Bone, dt: float):
-        """머리카락 물리 시뮬레이션"""
-        head_velocity = self._calculate_bone_velocity(head_bone)
+        # Particle solvers; strands/panels are created lazily once bone transforms exist
+        self.substeps = substeps
+        self.sleep_threshold = sleep_threshold
+        self.hair_iterations = 4
+        self.cloth_iterations = 3
+        self.hair_strand_count = hair_strand_count
+        self.hair_segments = hair_segments
+        self.hair_length = 0.24
+        self.cloth_shape = (cloth_rows, cloth_cols)
+        self.hair = self._create_hair_solver()
+        self.cloth = self._create_cloth_solver()
+        self.influence_radius = 0.25
+        
+        # Bone segments (parent -> bone) hashed on a grid, so particles only test nearby bones
+        self.body_hash = SegmentSpatialHash(cell_size=self.influence_radius)
+        self.collider_hash = SegmentSpatialHash(cell_size=0.15)
+        self.hair_radius = 0.005
+        # Hair collision capsules: (start bone, end bone, radius); start == end makes a sphere
+        self.hair_colliders: List[Tuple[str, str, float]] = [
+            ('head', 'head', 0.1),
+            ('neck', 'left_shoulder', 0.06),
+            ('neck', 'right_shoulder', 0.06),
+            ('left_shoulder', 'left_upper_arm', 0.05),
+            ('right_shoulder', 'right_upper_arm', 0.05)
+        ]
+        
+        # Previous world positions per bone, for finite-difference velocities
+        self._bone_positions: Dict[str, np.ndarray] = {}
+        self._bone_velocities: Dict[str, np.ndarray] = {}
+    
+    def _create_hair_solver(self) -> VerletSolver:
+        self.hair_strands = []
+        return VerletSolver(damping=0.98, iterations=self.hair_iterations, substeps=self.substeps,
+                            sleep_threshold=self.sleep_threshold)
+    
+    def _create_cloth_solver(self) -> VerletSolver:
+        self.clothing_points = []
+        return VerletSolver(damping=0.95, iterations=self.cloth_iterations, substeps=self.substeps,
+                            sleep_threshold=self.sleep_threshold)
+    
+    @property
+    def hair_segment_length(self) -> float:
+        return self.hair_length / self.hair_segments
+    
+    @property
+    def particle_count(self) -> int:
+        return self.hair.particle_count + self.cloth.particle_count
+    
+    @property
+    def sleeping_groups(self) -> int:
+        return self.hair.sleeping_groups + self.cloth.sleeping_groups
+    
+    def set_quality_level(self, level: str) -> bool:
+        """품질 단계에 맞춰 파티클 LOD/서브스텝 조정 (가닥/패널은 다음 프레임에 재생성)"""
+        settings = PHYSICS_QUALITY.get(level)
+        if settings is None:
+            return False
         
-        for strand in self.hair_strands:
-            # Apply inertia based on head movement
-            strand['velocity'] += -head_velocity * 0.3
-            
-            # Apply gravity
-            strand['velocity'] += self.gravity * dt * 0.1
-            
-            # Apply wind
-            strand['velocity'] += self.wind * dt
-            
-            # Apply damping
-            strand['velocity'] *= 0.95
-            
-            # Update position
-            strand['position'] += strand['velocity'] * dt
+        self.substeps = settings['substeps']
+        self.hair_iterations = settings['iterations']
+        self.cloth_iterations = max(1, settings['iterations'] - 1)
+        
+        if (settings['hair_strands'], settings['hair_segments']) != (self.hair_strand_count, self.hair_segments):
+            self.hair_strand_count = settings['hair_strands']
+            self.hair_segments = settings['hair_segments']
+            self.hair = self._create_hair_solver()
+        if tuple(settings['cloth']) != self.cloth_shape:
+            self.cloth_shape = tuple(settings['cloth'])
+            self.cloth = self._create_cloth_solver()
+        
+        for solver, iterations in ((self.hair, self.hair_iterations), (self.cloth, self.cloth_iterations)):
+            solver.substeps = self.substeps
+            solver.iterations = iterations
+        
+        logger.info(f"Physics quality {level}: {self.hair_strand_count} strands x {self.hair_segments}, "
+                    f"cloth {self.cloth_shape}, {self.substeps} substeps")
+        return True
+    
+    def set_substeps(self, substeps: int):
+        """파티클 LOD는 유지하고 서브스텝 수만 변경"""
+        self.substeps = max(1, int(substeps))
+        self.hair.substeps = self.substeps
+        self.cloth.substeps = self.substeps
+    
+    def teleport(self):
+        """속도 초기화 (물리 재활성화나 캐릭터 교체 후)"""
+        self.hair.teleport()
+        self.cloth.teleport()
+        self._bone_positions.clear()
+        self._bone_velocities.clear()
+    
+    def add_hair_strands(self, head_bone: Bone, count: int, segments: int, segment_length: float,
+                         head_radius: float = 0.12):
+        """머리 위 반구에 머리카락 가닥 추가"""
+        # Roots spread over the upper hemisphere of the head (golden-angle spiral)
+        i = np.arange(count) + 0.5
+        polar = np.arccos(1.0 - i / count)
+        azimuth = np.pi * (3.0 - np.sqrt(5.0)) * i
+        roots = head_radius * np.column_stack([np.sin(polar) * np.cos(azimuth), np.cos(polar),
+                                               np.sin(polar) * np.sin(azimuth)])
+        
+        matrix = head_bone.world_matrix
+        drop = np.array([0.0, -segment_length, 0.0]) * np.arange(segments)[:, np.newaxis]
+        for root in roots:
+            world_root = matrix[:3, :3] @ root + matrix[:3, 3]
+            self.hair_strands.append(self.hair.add_chain(world_root + drop, head_bone.name, root))
+    
+    def add_cloth_panel(self, bone: Bone, rows: int, cols: int, width: float = 0.4,
+                        height: float = 0.5, offset: Optional[np.ndarray] = None):
+        """본에 상단이 고정된 의상 패널 추가"""
+        offset = np.array([0.0, 0.0, 0.1]) if offset is None else offset
+        u, v = np.meshgrid(np.linspace(-width / 2, width / 2, cols), np.linspace(0.0, -height, rows))
+        local = np.column_stack([u.ravel(), v.ravel(), np.zeros(u.size)]) + offset
+        
+        matrix = bone.world_matrix
+        span = self.cloth.add_grid(local @ matrix[:3, :3].T + matrix[:3, 3], rows, cols)
+        self.cloth.pin(np.arange(span.start, span.start + cols), bone.name, local[:cols])
+        self.clothing_points.append(span)
+    
+    def simulate_hair(self, head_bone: Bone, dt: float, bones: Optional[Dict[str, Bone]] = None):
+        """머리카락 물리 시뮬레이션 (bones가 주어지면 머리/어깨 캡슐과 충돌)"""
+        if dt <= 0:
+            return
+        if not self.hair_strands and self.hair_strand_count > 0:
+            self.add_hair_strands(head_bone, self.hair_strand_count, self.hair_segments, self.hair_segment_length)
+        
+        self._update_bone_velocity(head_bone, dt)
+        
+        # Roots ride the head; inertia comes from the Verlet history of the free particles
+        self.hair.update_anchors({head_bone.name: head_bone.world_matrix})
+        self.hair.step(dt, self.gravity + self.wind)
+        
+        if bones is not None and self.hair.particle_count:
+            self._collide_hair(bones)
+    
+    def _collide_hair(self, bones: Dict[str, Bone]):
+        """머리카락 파티클을 머리/어깨 캡슐 밖으로 밀어냄"""
+        colliders = [(bones[start], bones[end], radius) for start, end, radius in self.hair_colliders
+                     if start in bones and end in bones]
+        if not colliders:
+            return
+        
+        self.collider_hash.update([start.world_position for start, _, _ in colliders],
+                                  [end.world_position for _, end, _ in colliders],
+                                  [radius for _, _, radius in colliders])
+        self.collider_hash.collide(self.hair.positions, self.hair_radius, movable=self.hair.movable)
     
     def simulate_clothing(self, body_bones: List[Bone], dt: float):
         """의상 물리 시뮬레이션"""
-        for point in self.clothing_points:
-            # Calculate forces from nearby bones
-            total_force = np.zeros(3)
-            
-            for bone in body_bones:
-                distance = np.linalg.norm(point['position'] - bone.world_position)
-                if distance < point['influence_radius']:
-                    bone_velocity = self._calculate_bone_velocity(bone)
-                    force = bone_velocity * (1.0 - distance / point['influence_radius'])
-                    total_force += force
-            
-            # Apply forces
-            point['velocity'] += total_force * dt
-            point['velocity'] += self.gravity * dt * 0.05  # Light gravity for clothing
-            point['velocity'] *= 0.9  # Damping
-            
-            # Update position
-            point['position'] += point['velocity'] * dt
+        if dt <= 0 or not body_bones:
+            return
+        if not self.clothing_points and all(self.cloth_shape):
+            self.add_cloth_panel(body_bones[0], *self.cloth_shape)
+        
+        for bone in body_bones:
+            self._update_bone_velocity(bone, dt)
+        
+        # Bones drag nearby cloth along, falling off linearly with distance to the bone segment
+        starts = np.array([(bone.parent or bone).world_position for bone in body_bones])
+        ends = np.array([bone.world_position for bone in body_bones])
+        bone_velocities = np.array([self._calculate_bone_velocity(bone) for bone in body_bones])
+        self.body_hash.update(starts, ends, self.influence_radius)
+        
+        point_index, bone_index, distances, _ = self.body_hash.query(self.cloth.positions)
+        falloff = (1.0 - distances / self.influence_radius) / dt
+        drag = np.zeros_like(self.cloth.positions)
+        np.add.at(drag, point_index, bone_velocities[bone_index] * falloff[:, np.newaxis])
+        
+        self.cloth.update_anchors({bone.name: bone.world_matrix for bone in body_bones})
+        self.cloth.step(dt, self.gravity * 0.05 + self.wind, drag)
+    
+    def _update_bone_velocity(self, bone: Bone, dt: float):
+        """캐시된 이전 월드 위치로 본 속도 갱신"""
+        position = bone.world_position.copy()
+        previous = self._bone_positions.get(bone.name)
+        self._bone_velocities[bone.name] = np.zeros(3) if previous is None else (position - previous) / dt
+        self._bone_positions[bone.name] = position
     
     def _calculate_bone_velocity(self, bone: Bone) -> np.ndarray:
         """본의 속도 계산 (이전 프레임과의 차이)"""
-        # 실제로는 이전 프레임 위치 저장 필요
-        return np.zeros(3)  # Placeholder
+        return self._bone_velocities.get(bone.name, np.zeros(3))
 
 class SkeletalAnimationEngine:
     """메인 골격 애니메이션 엔진"""
@@ -440,8 +558,11 @@ class SkeletalAnimationEngine:
         self.target_pose = {}
         self.pose_transition_speed = 5.0
         
-        # Gesture library
+        # Gesture library, compiled once into clips and played through a layered player
         self.gestures = self._initialize_gestures()
+        self.gesture_clips: Dict[str, GestureClip] = compile_gestures(self.gestures)
+        self._bone_list = list(self.skeleton.values())
+        self.gesture_player = LayeredClipPlayer(list(self.skeleton))
         
         logger.info("Professional Skeletal Animation Engine initialized")
     
@@ -521,45 +642,7 @@ class SkeletalAnimationEngine:
     
     def _initialize_gestures(self) -> Dict[str, Dict]:
         """제스처 라이브러리 초기화"""
-        return {
-            'wave': {
-                'duration': 2.0,
-                'keyframes': {
-                    'right_upper_arm': [
-                        (0.0, np.array([0, 0, 0])),
-                        (0.5, np.array([0, 0, math.pi/3])),
-                        (1.0, np.array([0, 0, math.pi/6])),
-                        (1.5, np.array([0, 0, math.pi/3])),
-                        (2.0, np.array([0, 0, 0]))
-                    ],
-                    'right_forearm': [
-                        (0.0, np.array([0, 0, 0])),
-                        (0.25, np.array([0, 0, -math.pi/4])),
-                        (0.75, np.array([0, 0, -math.pi/6])),
-                        (1.25, np.array([0, 0, -math.pi/4])),
-                        (2.0, np.array([0, 0, 0]))
-                    ]
-                }
-            },
-            'peace_sign': {
-                'duration': 1.5,
-                'keyframes': {
-                    'right_upper_arm': [(0.0, np.array([0, 0, 0])), (1.5, np.array([0, 0, math.pi/4]))],
-                    'right_index_1': [(0.0, np.array([0, 0, 0])), (1.5, np.array([0, 0, -math.pi/8]))],
-                    'right_middle_1': [(0.0, np.array([0, 0, 0])), (1.5, np.array([0, 0, -math.pi/8]))],
-                    'right_ring_1': [(0.0, np.array([0, 0, 0])), (1.5, np.array([0, 0, math.pi/3]))],
-                    'right_pinky_1': [(0.0, np.array([0, 0, 0])), (1.5, np.array([0, 0, math.pi/3]))]
-                }
-            },
-            'thinking': {
-                'duration': 3.0,
-                'keyframes': {
-                    'right_upper_arm': [(0.0, np.array([0, 0, 0])), (3.0, np.array([0, 0, math.pi/6]))],
-                    'right_forearm': [(0.0, np.array([0, 0, 0])), (3.0, np.array([0, 0, -math.pi/3]))],
-                    'head': [(0.0, np.array([0, 0, 0])), (3.0, np.array([0, math.pi/12, 0]))]
-                }
-            }
-        }
+        return default_gesture_specs()
     
     def load_character(self, image_path: str):
         """캐릭터 이미지 로드 및 초기화"""
@@ -572,15 +655,26 @@ class SkeletalAnimationEngine:
     
     def set_pose(self, pose_name: str):
         """미리 정의된 포즈 설정"""
-        if pose_name in self.gestures:
-            gesture = self.gestures[pose_name]
-            self.target_pose = {}
-            
-            for bone_name, keyframes in gesture['keyframes'].items():
-                if bone_name in self.skeleton:
-                    # Use the final keyframe as target
-                    final_rotation = keyframes[-1][1]
-                    self.target_pose[bone_name] = final_rotation
+        clip = self.gesture_clips.get(pose_name)
+        if clip is not None:
+            # Use the final keyframe as target
+            self.target_pose = {bone_name: rotation for bone_name, rotation in zip(clip.bone_names, clip.final_pose)
+                                if bone_name in self.skeleton}
+    
+    def play_gesture(self, gesture_name: str, layer: int = 0, mode: str = 'override',
+                     weight: float = 1.0, fade_in: float = 0.2, fade_out: float = 0.2) -> bool:
+        """제스처 클립 재생 (레이어 블렌딩)"""
+        clip = self.gesture_clips.get(gesture_name)
+        if clip is None:
+            logger.warning(f"Unknown gesture: {gesture_name}")
+            return False
+        
+        self.gesture_player.play(clip, layer, mode, weight, fade_in, fade_out)
+        return True
+    
+    def stop_gesture(self, layer: int = 0, fade_out: Optional[float] = None):
+        """제스처 레이어 정지"""
+        self.gesture_player.stop(layer, fade_out)
     
     def set_finger_pose(self, hand: str, finger: str, curl_amount: float):
         """개별 손가락 포즈 설정 (0.0 = 펼침, 1.0 = 완전히 구부림)"""
@@ -595,6 +689,14 @@ class SkeletalAnimationEngine:
         """표정 설정"""
         self.blend_shapes.set_emotion(emotion, intensity)
     
+    def set_emotion_mix(self, mixture: Dict[str, float]):
+        """감정 혼합 설정"""
+        self.blend_shapes.set_emotion_mix(mixture)
+    
+    def set_quality_level(self, level: str) -> bool:
+        """품질 단계 설정 (물리 LOD)"""
+        return self.physics.set_quality_level(level)
+    
     def look_at(self, target_position: np.ndarray):
         """지정된 위치를 바라보기 (IK 사용)"""
         head_bone = self.skeleton['head']
@@ -624,23 +726,37 @@ class SkeletalAnimationEngine:
                 diff = target_rot - current_rot
                 bone.local_rotation += diff * self.pose_transition_speed * dt
         
-        # Update world transforms
-        self._update_world_transforms()
+        # Update world transforms (with gesture layers on top of the base pose)
+        self.gesture_player.update(dt)
+        if self.gesture_player.active:
+            self._update_world_transforms_with_gestures()
+        else:
+            self._update_world_transforms()
         
         # Update physics
-        self.physics.simulate_hair(self.skeleton['head'], dt)
-        body_bones = [self.skeleton['spine'], self.skeleton['neck']]
+        self.physics.simulate_hair(self.skeleton['head'], dt, self.skeleton)
+        body_bones = [self.skeleton[name] for name in ('spine', 'neck', 'left_shoulder', 'right_shoulder',
+                                                       'left_upper_arm', 'right_upper_arm')]
         self.physics.simulate_clothing(body_bones, dt)
     
     def _update_world_transforms(self):
         """모든 본의 월드 변환 업데이트"""
         def update_bone_recursive(bone: Bone):
-            bone.get_world_matrix()
+            bone.world_position = bone.get_world_matrix()[:3, 3].copy()
             for child in bone.children:
                 update_bone_recursive(child)
         
         update_bone_recursive(self.skeleton['root'])
     
+    def _update_world_transforms_with_gestures(self):
+        """Pose the gesture bones for this frame's world transforms, then restore the base pose"""
+        self.gesture_player.pose_bones(
+            self._bone_list,
+            lambda bone: bone.local_rotation,
+            lambda bone, rotation: setattr(bone, 'local_rotation', rotation),
+            self._update_world_transforms
+        )
+    
     def render_wireframe(self, image: np.ndarray) -> np.ndarray:
         """골격 와이어프레임 렌더링 (디버그용)"""
         result = image.copy()
@@ -680,35 +796,23 @@ class GestureLibrary:
     
     @staticmethod
     def wave(engine: SkeletalAnimationEngine):
-        engine.set_pose('wave')
+        engine.play_gesture('wave')
     
     @staticmethod
     def peace_sign(engine: SkeletalAnimationEngine):
-        engine.set_pose('peace_sign')
+        engine.play_gesture('peace_sign')
     
     @staticmethod
     def thumbs_up(engine: SkeletalAnimationEngine):
-        engine.set_finger_pose('right', 'thumb', 0.0)  # Thumb up
-        engine.set_finger_pose('right', 'index', 1.0)  # Other fingers down
-        engine.set_finger_pose('right', 'middle', 1.0)
-        engine.set_finger_pose('right', 'ring', 1.0)
-        engine.set_finger_pose('right', 'pinky', 1.0)
+        engine.play_gesture('thumbs_up')
     
     @staticmethod
     def point(engine: SkeletalAnimationEngine):
-        engine.set_finger_pose('right', 'index', 0.0)  # Index extended
-        engine.set_finger_pose('right', 'thumb', 0.5)  # Thumb partially closed
-        engine.set_finger_pose('right', 'middle', 1.0) # Others closed
-        engine.set_finger_pose('right', 'ring', 1.0)
-        engine.set_finger_pose('right', 'pinky', 1.0)
+        engine.play_gesture('point')
     
     @staticmethod
     def rock_on(engine: SkeletalAnimationEngine):
-        engine.set_finger_pose('right', 'index', 0.0)  # Index and pinky up
-        engine.set_finger_pose('right', 'pinky', 0.0)
-        engine.set_finger_pose('right', 'middle', 1.0) # Others down
-        engine.set_finger_pose('right', 'ring', 1.0)
-        engine.set_finger_pose('right', 'thumb', 0.8)
+        engine.play_gesture('rock_on')
 
 if __name__ == "__main__":
     # Test the skeletal animation engine
@@ -17,8 +17,27 @@ from dataclasses import dataclass
 from enum import Enum
 import logging
 
+from .emotion_matrix import EmotionBlendMatrix
+from .gesture_clips import GestureClip, LayeredClipPlayer, compile_gestures, default_gesture_specs
+
 logger = logging.getLogger(__name__)
 
+# Rig blend shape -> canonical facial shapes it averages in the shared emotion presets
+BLEND_SHAPE_ALIASES = {
+    'blink_left': ('eye_blink_L',),
+    'blink_right': ('eye_blink_R',),
+    'eye_wide_left': ('eye_wide_L',),
+    'eye_wide_right': ('eye_wide_R',),
+    'eyebrow_up_left': ('brow_up_L',),
+    'eyebrow_up_right': ('brow_up_R',),
+    'eyebrow_down_left': ('brow_down_L', 'brow_angry_L'),
+    'eyebrow_down_right': ('brow_down_R', 'brow_angry_R'),
+    'smile': ('mouth_smile_L', 'mouth_smile_R'),
+    'frown': ('mouth_frown_L', 'mouth_frown_R'),
+    'cheek_puff_left': ('cheek_puff_L',),
+    'cheek_puff_right': ('cheek_puff_R',)
+}
+
 class BoneType(Enum):
     ROOT = "root"
     SPINE = "spine"
@@ -100,6 +119,19 @@ class Bone:
         parent_rotation = self.parent.get_world_rotation()
         return parent_rotation + self.local_transform.rotation
     
+    @property
+    def world_position(self) -> np.ndarray:
+        """World position from the last update_world_transform()"""
+        return self.world_transform.position
+    
+    @property
+    def world_matrix(self) -> np.ndarray:
+        """World transform from the last update_world_transform() as a 4x4 matrix"""
+        matrix = np.eye(4)
+        matrix[:3, :3] = self._euler_to_matrix(self.world_transform.rotation) * self.world_transform.scale
+        matrix[:3, 3] = self.world_transform.position
+        return matrix
+    
     def update_world_transform(self):
         """Update world transform and propagate to children"""
         self.world_transform.position = self.get_world_position()
@@ -158,6 +190,11 @@ class SkeletalAnimationSystem:
         self._create_humanoid_skeleton()
         self._setup_ik_chains()
         self._init_blend_shapes()
+        
+        # Keyframed gestures, compiled once and layered over the pose each update
+        self.gesture_clips: Dict[str, GestureClip] = compile_gestures(default_gesture_specs(first_finger_joint=0))
+        self._bone_list = list(self.bones.values())
+        self.gesture_player = LayeredClipPlayer(list(self.bones))
     
     def _create_humanoid_skeleton(self):
         """Create complete humanoid skeleton with proper bone lengths"""
@@ -276,6 +313,8 @@ class SkeletalAnimationSystem:
         
         for shape_name in blend_shape_names:
             self.blend_shapes[shape_name] = 0.0
+        
+        self.emotion_matrix = EmotionBlendMatrix(blend_shape_names, aliases=BLEND_SHAPE_ALIASES)
     
     def solve_ik_fabrik(self, chain_name: str, target_position: np.ndarray, iterations: int = 10):
         """Solve IK using FABRIK algorithm - FIXED (no more division by zero)"""
@@ -439,22 +478,12 @@ class SkeletalAnimationSystem:
     
     def set_emotion(self, emotion: str, intensity: float = 1.0):
         """Set facial expression using blend shapes"""
-        emotion_presets = {
-            'happy': {'smile': 0.8, 'eyebrow_up_left': 0.3, 'eyebrow_up_right': 0.3},
-            'sad': {'frown': 0.6, 'eyebrow_down_left': 0.4, 'eyebrow_down_right': 0.4},
-            'surprised': {'eye_wide_left': 0.9, 'eye_wide_right': 0.9, 'mouth_open': 0.7},
-            'angry': {'eyebrow_down_left': 0.8, 'eyebrow_down_right': 0.8, 'frown': 0.5}
-        }
-        
-        # Reset all blend shapes
-        for shape in self.blend_shapes:
-            self.blend_shapes[shape] = 0.0
-        
-        # Apply emotion preset
-        if emotion in emotion_presets:
-            for shape, weight in emotion_presets[emotion].items():
-                if shape in self.blend_shapes:
-                    self.blend_shapes[shape] = weight * intensity
+        self.set_emotion_mix({emotion: intensity})
+    
+    def set_emotion_mix(self, mixture: Dict[str, float]):
+        """Set blend shapes from a weighted mix of emotions"""
+        weights = self.emotion_matrix.blend(mixture)
+        self.blend_shapes.update(zip(self.emotion_matrix.shape_names, weights.tolist()))
     
     def update(self, delta_time: float):
         """Update animation system"""
@@ -464,9 +493,13 @@ class SkeletalAnimationSystem:
         for bone in self.bones.values():
             bone.rotate_to(bone.target_rotation, delta_time)
         
-        # Update world transforms
+        # Update world transforms (with gesture layers on top of the base pose)
+        self.gesture_player.update(delta_time)
         if self.root_bone:
-            self.root_bone.update_world_transform()
+            if self.gesture_player.active:
+                self._update_world_transforms_with_gestures()
+            else:
+                self.root_bone.update_world_transform()
         
         # Apply breathing animation
         if self.breathing_enabled:
@@ -483,24 +516,40 @@ class SkeletalAnimationSystem:
             head_sway = 0.01 * math.sin(self.animation_time * 1.5)
             self.bones['head'].local_transform.rotation[2] = head_sway
     
+    def _update_world_transforms_with_gestures(self):
+        """Pose the gesture bones for this update's world transforms, then restore the base pose"""
+        self.gesture_player.pose_bones(
+            self._bone_list,
+            lambda bone: bone.local_transform.rotation,
+            lambda bone, rotation: setattr(bone.local_transform, 'rotation', rotation),
+            self.root_bone.update_world_transform
+        )
+    
     def get_bone_matrices(self) -> Dict[str, np.ndarray]:
         """Get transformation matrices for all bones - FIXED"""
-        matrices = {}
-        
-        for name, bone in self.bones.items():
-            # Create transformation matrix
-            translation_matrix = np.eye(4)
-            translation_matrix[:3, 3] = bone.world_transform.position
-            
-            rotation_matrix = np.eye(4)
-            rotation_matrix[:3, :3] = bone._euler_to_matrix(bone.world_transform.rotation)
-            
-            scale_matrix = np.eye(4)
-            np.fill_diagonal(scale_matrix[:3, :3], bone.world_transform.scale)
-            
-            matrices[name] = translation_matrix @ rotation_matrix @ scale_matrix
-        
-        return matrices
+        return {name: bone.world_matrix for name, bone in self.bones.items()}
+    
+    def get_bone_transforms(self) -> Dict[str, np.ndarray]:
+        """Get bone transformation matrices (ordered like get_all_bones)"""
+        return self.get_bone_matrices()
+    
+    def set_bone_rotation(self, bone_name: str, x: float, y: float, z: float):
+        """Set target rotation (radians) for a single bone"""
+        if bone_name in self.bones:
+            self.bones[bone_name].target_rotation = np.array([x, y, z])
+    
+    def trigger_gesture(self, gesture_name: str, layer: int = 0, mode: str = 'override', weight: float = 1.0):
+        """Play a compiled gesture clip; names without a clip fall back to the static pose library"""
+        clip = self.gesture_clips.get(gesture_name)
+        if clip is None:
+            self.apply_pose(gesture_name)
+            return
+        
+        self.gesture_player.play(clip, layer, mode, weight)
+    
+    def stop_gesture(self, layer: int = 0, fade_out: Optional[float] = None):
+        """Fade out a gesture layer"""
+        self.gesture_player.stop(layer, fade_out)
     
     def enable_breathing_animation(self):
         """Enable breathing animation"""
@@ -512,12 +561,39 @@ class SkeletalAnimationSystem:
         self.breathing_enabled = False
         logger.info("Breathing animation disabled")
     
+    def export_skeleton_data(self) -> Dict[str, Dict[str, List[float]]]:
+        """Export local bone transforms as plain lists"""
+        return {
+            name: {
+                'position': bone.local_transform.position.tolist(),
+                'rotation': bone.local_transform.rotation.tolist(),
+                'scale': bone.local_transform.scale.tolist()
+            }
+            for name, bone in self.bones.items()
+        }
+    
+    def import_skeleton_data(self, skeleton_data: Dict[str, Dict[str, List[float]]]):
+        """Restore local bone transforms written by export_skeleton_data"""
+        for name, transform in skeleton_data.items():
+            bone = self.bones.get(name)
+            if bone is None:
+                continue
+            for field_name in ('position', 'rotation', 'scale'):
+                if field_name in transform:
+                    setattr(bone.local_transform, field_name, np.array(transform[field_name], dtype=float))
+            bone.target_rotation = bone.local_transform.rotation.copy()
+        
+        if self.root_bone:
+            self.root_bone.update_world_transform()
+    
     def get_all_bones(self) -> Dict[str, Dict]:
         """Get all bone data for external systems"""
         bone_data = {}
         
-        for name, bone in self.bones.items():
+        for index, (name, bone) in enumerate(self.bones.items()):
             bone_data[name] = {
+                'index': index,
+                'parent': bone.parent.name if bone.parent else None,
                 'world_position': bone.get_world_position(),
                 'world_rotation': bone.get_world_rotation(),
                 'local_position': bone.local_transform.position,
@@ -0,0 +1,133 @@
+"""
+Vectorized skin weight binding
+Assigns each mesh vertex its strongest bone influences in one pass instead of per-vertex loops
+"""
+
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"SciPy not available, skin binding falls back to dense distances: {e}")
+    cKDTree = None
+    SCIPY_AVAILABLE = False
+
+MAX_INFLUENCES = 4
+
+
+def point_distances(vertices: np.ndarray, bone_positions: np.ndarray,
+                    candidates: int = 16) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Distances from every vertex to its nearest bone positions
+
+    Returns (V, K) distances and bone indices. Uses a KD-tree over the bones
+    when SciPy is available (K = min(candidates, bones)), otherwise the full
+    dense (V, bones) distance matrix.
+    """
+    bone_count = len(bone_positions)
+    if SCIPY_AVAILABLE and bone_count > candidates:
+        distances, indices = cKDTree(bone_positions).query(vertices, k=candidates)
+        return distances, indices.astype(np.intp)
+
+    offsets = vertices[:, np.newaxis, :] - bone_positions[np.newaxis, :, :]
+    distances = np.sqrt(np.einsum('vbi,vbi->vb', offsets, offsets))
+    return distances, np.broadcast_to(np.arange(bone_count), distances.shape)
+
+
+def segment_distances(vertices: np.ndarray, segment_starts: np.ndarray,
+                      segment_ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Distances from every vertex to every bone segment (projected and clamped), (V, bones)"""
+    axis = segment_ends - segment_starts
+    length_sq = np.maximum(np.einsum('bi,bi->b', axis, axis), 1e-12)
+
+    relative = vertices[:, np.newaxis, :] - segment_starts[np.newaxis, :, :]
+    t = np.clip(np.einsum('vbi,bi->vb', relative, axis) / length_sq, 0.0, 1.0)
+    offsets = relative - t[:, :, np.newaxis] * axis[np.newaxis, :, :]
+    distances = np.sqrt(np.einsum('vbi,vbi->vb', offsets, offsets))
+    return distances, np.broadcast_to(np.arange(len(segment_starts)), distances.shape)
+
+
+def rig_to_image_matrix(bone_positions: np.ndarray, bounds: Tuple[int, int, int, int]) -> np.ndarray:
+    """
+    4x4 map from rig space (y up) onto an image-space box (x, y, width, height; y down)
+
+    The rig's vertical extent is scaled to the box height and its horizontal
+    center put on the box center, so bones land on the character they drive.
+    """
+    x, y, width, height = bounds
+    low = bone_positions.min(axis=0)
+    high = bone_positions.max(axis=0)
+    scale = height / max(high[1] - low[1], 1e-6)
+
+    matrix = np.diag([scale, -scale, scale, 1.0])
+    matrix[0, 3] = x + width / 2.0 - scale * (low[0] + high[0]) / 2.0
+    matrix[1, 3] = y + height + scale * low[1]
+    return matrix
+
+
+def bind_skin_weights(vertices: np.ndarray, bone_positions: np.ndarray, influence_radii: np.ndarray,
+                      segment_starts: Optional[np.ndarray] = None, max_influences: int = MAX_INFLUENCES,
+                      nearest_fallback: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Linear-falloff skin weights for all vertices at once
+
+    A bone influences a vertex with weight 1 - distance / radius inside its
+    influence radius. Distances are to the bone positions, or to the segments
+    segment_starts -> bone_positions when starts (usually the parents'
+    positions) are given. The strongest max_influences weights per vertex are
+    picked with argpartition and normalized to sum to 1. Vertices no bone
+    reaches keep all-zero weights, or with nearest_fallback follow their
+    closest bone rigidly.
+
+    Returns (V, max_influences) float32 weights and int32 bone indices.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    bone_positions = np.asarray(bone_positions, dtype=np.float64)
+    radii = np.broadcast_to(np.asarray(influence_radii, dtype=np.float64), (len(bone_positions),))
+
+    vertex_count = len(vertices)
+    weights = np.zeros((vertex_count, max_influences), dtype=np.float32)
+    indices = np.zeros((vertex_count, max_influences), dtype=np.int32)
+    if vertex_count == 0 or len(bone_positions) == 0:
+        return weights, indices
+
+    if segment_starts is None:
+        distances, candidates = point_distances(vertices, bone_positions)
+    else:
+        distances, candidates = segment_distances(vertices, np.asarray(segment_starts, dtype=np.float64),
+                                                  bone_positions)
+
+    candidate_weights = np.clip(1.0 - distances / radii[candidates], 0.0, None)
+
+    # Top influences per vertex (unordered), then sorted strongest first
+    count = min(max_influences, candidate_weights.shape[1])
+    if candidate_weights.shape[1] > count:
+        top = np.argpartition(-candidate_weights, count - 1, axis=1)[:, :count]
+    else:
+        top = np.broadcast_to(np.arange(count), (vertex_count, count))
+    top_weights = np.take_along_axis(candidate_weights, top, axis=1)
+    order = np.argsort(-top_weights, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    top_weights = np.take_along_axis(top_weights, order, axis=1)
+
+    totals = top_weights.sum(axis=1, keepdims=True)
+    bound = totals[:, 0] > 0.0
+    weights[bound, :count] = top_weights[bound] / totals[bound]
+    # Unused slots keep index 0 with weight 0, like unbound vertices
+    indices[:, :count] = np.where(top_weights > 0.0, np.take_along_axis(candidates, top, axis=1), 0)
+
+    if nearest_fallback and not bound.all():
+        unbound = np.flatnonzero(~bound)
+        nearest = np.argmin(distances[unbound], axis=1)
+        weights[unbound, 0] = 1.0
+        indices[unbound, 0] = np.asarray(candidates)[unbound, nearest]
+        bound[unbound] = True
+
+    logger.debug(f"Bound {int(bound.sum())}/{vertex_count} vertices to {len(bone_positions)} bones")
+    return weights, indices
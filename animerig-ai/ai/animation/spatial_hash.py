@@ -0,0 +1,156 @@
+"""
+Uniform-grid spatial hash over bone segments
+Answers "which bone segments are near these particles" without testing every particle against every bone
+"""
+
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Large primes for hashing integer cell coordinates into one int64 key
+_HASH_PRIMES = np.array([73856093, 19349663, 83492791], dtype=np.int64)
+
+
+def cell_keys(cells: np.ndarray) -> np.ndarray:
+    """Hash (..., 3) integer cell coordinates into int64 keys"""
+    return np.bitwise_xor.reduce(cells.astype(np.int64) * _HASH_PRIMES, axis=-1)
+
+
+def closest_points_on_segments(points: np.ndarray, starts: np.ndarray,
+                               ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Closest points on segments (row-wise) and their distances to points"""
+    axis = ends - starts
+    length_sq = np.einsum('ij,ij->i', axis, axis)
+    t = np.einsum('ij,ij->i', points - starts, axis) / np.maximum(length_sq, 1e-12)
+    np.clip(t, 0.0, 1.0, out=t)
+    closest = starts + axis * t[:, np.newaxis]
+    offset = points - closest
+    return closest, np.sqrt(np.einsum('ij,ij->i', offset, offset))
+
+
+class SegmentSpatialHash:
+    """
+    Spatial hash of capsule-shaped segments (start, end, radius)
+
+    Each segment is registered in every grid cell its radius-expanded bounding
+    box overlaps, so a point only has to look in its own cell. update() only
+    re-registers segments whose cell range changed since the last call; the
+    sorted (key, segment) table is rebuilt only when something moved cells.
+    """
+
+    def __init__(self, cell_size: float = 0.25):
+        self.cell_size = cell_size
+        self.starts = np.zeros((0, 3))
+        self.ends = np.zeros((0, 3))
+        self.radii = np.zeros(0)
+
+        self._cell_ranges = np.zeros((0, 2, 3), dtype=np.int64)
+        self._segment_keys = []
+        self._keys = np.zeros(0, dtype=np.int64)
+        self._segments = np.zeros(0, dtype=np.intp)
+        self.rebuilds = 0
+
+    @property
+    def segment_count(self) -> int:
+        return len(self.radii)
+
+    def update(self, starts: np.ndarray, ends: np.ndarray, radii: np.ndarray):
+        """Move the segments; only those crossing into different cells are re-hashed"""
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=np.float64).reshape(-1, 3)
+        radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), (len(starts),))
+
+        low = np.floor((np.minimum(starts, ends) - radii[:, np.newaxis]) / self.cell_size).astype(np.int64)
+        high = np.floor((np.maximum(starts, ends) + radii[:, np.newaxis]) / self.cell_size).astype(np.int64)
+        ranges = np.stack([low, high], axis=1)
+
+        if len(ranges) != len(self._cell_ranges):
+            self._cell_ranges = np.full_like(ranges, np.iinfo(np.int64).min)
+            self._segment_keys = [None] * len(ranges)
+
+        changed = np.flatnonzero(np.any(ranges != self._cell_ranges, axis=(1, 2)))
+        for i in changed:
+            (x0, y0, z0), (x1, y1, z1) = ranges[i]
+            cells = np.stack(np.meshgrid(np.arange(x0, x1 + 1), np.arange(y0, y1 + 1), np.arange(z0, z1 + 1),
+                                         indexing='ij'), axis=-1).reshape(-1, 3)
+            self._segment_keys[i] = cell_keys(cells)
+        self._cell_ranges = ranges
+
+        self.starts = starts
+        self.ends = ends
+        self.radii = np.array(radii)
+
+        if len(changed):
+            self._rebuild_table()
+
+    def _rebuild_table(self):
+        """Sorted key -> segment table used by queries"""
+        counts = [len(keys) for keys in self._segment_keys]
+        keys = np.concatenate(self._segment_keys) if counts else np.zeros(0, dtype=np.int64)
+        segments = np.repeat(np.arange(len(counts)), counts)
+        order = np.argsort(keys, kind='stable')
+        self._keys = keys[order]
+        self._segments = segments[order]
+        self.rebuilds += 1
+
+    def candidates(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (point index, segment index) pairs for segments registered in each point's cell
+
+        Pairs may include segments that are farther than their radius (hash
+        collisions, box corners); callers filter by exact distance.
+        """
+        if len(self._keys) == 0 or len(points) == 0:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+        keys = cell_keys(np.floor(points / self.cell_size).astype(np.int64))
+        first = np.searchsorted(self._keys, keys, side='left')
+        last = np.searchsorted(self._keys, keys, side='right')
+        counts = last - first
+
+        point_index = np.repeat(np.arange(len(points)), counts)
+        # Position of each pair within its point's run of matches
+        run_offsets = np.arange(len(point_index)) - np.repeat(np.cumsum(counts) - counts, counts)
+        segment_index = self._segments[np.repeat(first, counts) + run_offsets]
+        return point_index, segment_index
+
+    def query(self, points: np.ndarray, radius_scale: float = 1.0
+              ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Point/segment pairs within each segment's radius
+
+        Returns point indices, segment indices, distances and closest points on the segments.
+        """
+        point_index, segment_index = self.candidates(points)
+        closest, distance = closest_points_on_segments(points[point_index], self.starts[segment_index],
+                                                       self.ends[segment_index])
+        inside = distance < self.radii[segment_index] * radius_scale
+        return point_index[inside], segment_index[inside], distance[inside], closest[inside]
+
+    def collide(self, positions: np.ndarray, particle_radius: float = 0.0,
+                movable: Optional[np.ndarray] = None) -> int:
+        """
+        Push particles out of the segment capsules (in place)
+
+        movable optionally masks which particles may be moved (e.g. not pinned
+        ones). Returns the number of contacts resolved.
+        """
+        point_index, segment_index = self.candidates(positions)
+        if movable is not None:
+            keep = movable[point_index]
+            point_index, segment_index = point_index[keep], segment_index[keep]
+
+        closest, distance = closest_points_on_segments(positions[point_index], self.starts[segment_index],
+                                                       self.ends[segment_index])
+        depth = self.radii[segment_index] + particle_radius - distance
+        contact = depth > 0.0
+        if not np.any(contact):
+            return 0
+
+        point_index = point_index[contact]
+        normal = (positions[point_index] - closest[contact]) / np.maximum(distance[contact], 1e-9)[:, np.newaxis]
+        np.add.at(positions, point_index, normal * depth[contact][:, np.newaxis])
+        return int(contact.sum())
@@ -0,0 +1,346 @@
+"""
+Array-based Verlet particle solver for hair and cloth
+Positions, previous positions and inverse masses live in (N, 3) / (N,) arrays; constraints relax in vectorized batches
+"""
+
+import logging
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def color_constraints(pairs: np.ndarray, particle_count: int) -> List[np.ndarray]:
+    """
+    Split constraints into batches that share no particle
+
+    Within a batch every particle is touched at most once, so a whole batch can
+    be projected with plain fancy-indexed updates and still behave like a
+    sequential (Gauss-Seidel) pass.
+    """
+    colors = np.empty(len(pairs), dtype=np.intp)
+    used: List[set] = [set() for _ in range(particle_count)]
+
+    for i, (a, b) in enumerate(pairs):
+        color = 0
+        while color in used[a] or color in used[b]:
+            color += 1
+        colors[i] = color
+        used[a].add(color)
+        used[b].add(color)
+
+    return [np.flatnonzero(colors == color) for color in range(colors.max() + 1)] if len(pairs) else []
+
+
+class VerletSolver:
+    """
+    Position-based Verlet integrator with distance constraints
+
+    Particles with inverse mass 0 are pinned; pinned particles can follow a
+    bone through a local-space offset and are moved by update_anchors().
+
+    Every add_particles() call (one hair strand, one cloth panel) forms a
+    group. With sleep_threshold > 0 a group whose kinetic energy stays below
+    it for sleep_steps steps goes to sleep and costs nothing until its anchors
+    move, the global acceleration changes or a per-particle force touches it.
+    """
+
+    def __init__(self, damping: float = 0.98, iterations: int = 4, stiffness: float = 1.0,
+                 substeps: int = 1, sleep_threshold: float = 0.0, sleep_steps: int = 30):
+        self.damping = damping
+        self.iterations = iterations
+        self.stiffness = stiffness
+        self.substeps = substeps
+        self.sleep_threshold = sleep_threshold
+        self.sleep_steps = sleep_steps
+        self.wake_distance = 1e-4
+
+        self.positions = np.zeros((0, 3), dtype=np.float64)
+        self.previous = np.zeros((0, 3), dtype=np.float64)
+        self.inv_mass = np.zeros(0, dtype=np.float64)
+
+        self.constraints = np.zeros((0, 2), dtype=np.intp)
+        self.rest_lengths = np.zeros(0, dtype=np.float64)
+        self._compiled: List[tuple] = []
+        self._batches: List[tuple] = []
+        self._dirty = False
+
+        # Particle groups and their sleep state
+        self.groups: List[slice] = []
+        self.group_of = np.zeros(0, dtype=np.intp)
+        self.awake = np.zeros(0, dtype=bool)
+        self._quiet_steps = np.zeros(0, dtype=np.intp)
+        self._awake_dirty = False
+        self._last_acceleration: Optional[np.ndarray] = None
+
+        # bone name -> (particle indices, (P, 3) offsets in bone space)
+        self.anchors: Dict[str, tuple] = {}
+        # Pinned particle moves requested by update_anchors(), spread over the substeps of step()
+        self._anchor_indices = np.zeros(0, dtype=np.intp)
+        self._anchor_from = np.zeros((0, 3))
+        self._anchor_to = np.zeros((0, 3))
+
+    @property
+    def particle_count(self) -> int:
+        return len(self.positions)
+
+    @property
+    def sleeping_groups(self) -> int:
+        return int(np.count_nonzero(~self.awake))
+
+    @property
+    def movable(self) -> np.ndarray:
+        """Mask of particles the solver currently moves (free and awake)"""
+        return (self.inv_mass > 0.0) & self.awake[self.group_of]
+
+    def add_particles(self, positions: np.ndarray, inv_mass: Optional[np.ndarray] = None) -> slice:
+        """Append particles (at rest) as a new group and return their index range"""
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        if inv_mass is None:
+            inv_mass = np.ones(len(positions))
+
+        start = len(self.positions)
+        self.positions = np.vstack([self.positions, positions])
+        self.previous = np.vstack([self.previous, positions])
+        self.inv_mass = np.concatenate([self.inv_mass, np.asarray(inv_mass, dtype=np.float64)])
+
+        span = slice(start, len(self.positions))
+        self.group_of = np.concatenate([self.group_of, np.full(len(positions), len(self.groups), dtype=np.intp)])
+        self.groups.append(span)
+        self.awake = np.append(self.awake, True)
+        self._quiet_steps = np.append(self._quiet_steps, 0)
+        self._awake_dirty = True
+        return span
+
+    def add_constraints(self, pairs: np.ndarray, rest_lengths: Optional[np.ndarray] = None):
+        """Add distance constraints between particle pairs (rest length defaults to the current distance)"""
+        pairs = np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+        if rest_lengths is None:
+            rest_lengths = np.linalg.norm(self.positions[pairs[:, 1]] - self.positions[pairs[:, 0]], axis=1)
+
+        self.constraints = np.vstack([self.constraints, pairs])
+        self.rest_lengths = np.concatenate([self.rest_lengths, rest_lengths])
+        self._dirty = True
+
+    def pin(self, indices: np.ndarray, bone_name: str, local_offsets: np.ndarray):
+        """Pin particles to a bone; they follow it through update_anchors()"""
+        indices = np.asarray(indices, dtype=np.intp)
+        self.inv_mass[indices] = 0.0
+        self._dirty = True
+
+        offsets = np.asarray(local_offsets, dtype=np.float64).reshape(-1, 3)
+        if bone_name in self.anchors:
+            old_indices, old_offsets = self.anchors[bone_name]
+            indices = np.concatenate([old_indices, indices])
+            offsets = np.vstack([old_offsets, offsets])
+        self.anchors[bone_name] = (indices, offsets)
+
+    def add_chain(self, points: np.ndarray, bone_name: Optional[str] = None,
+                  root_offset: Optional[np.ndarray] = None) -> slice:
+        """
+        Add a particle chain (one hair strand) along the given world points
+
+        If bone_name is given the first particle is pinned to that bone at
+        root_offset (bone space).
+        """
+        span = self.add_particles(points)
+        indices = np.arange(span.start, span.stop)
+        self.add_constraints(np.column_stack([indices[:-1], indices[1:]]))
+        if bone_name is not None:
+            self.pin(indices[:1], bone_name, root_offset if root_offset is not None else np.zeros(3))
+        return span
+
+    def add_grid(self, points: np.ndarray, rows: int, cols: int, shear: bool = True) -> slice:
+        """Add a rows x cols cloth grid (points in row-major order) with structural and shear constraints"""
+        span = self.add_particles(points)
+        grid = np.arange(span.start, span.stop).reshape(rows, cols)
+
+        pairs = [np.column_stack([grid[:, :-1].ravel(), grid[:, 1:].ravel()]),
+                 np.column_stack([grid[:-1, :].ravel(), grid[1:, :].ravel()])]
+        if shear:
+            pairs.append(np.column_stack([grid[:-1, :-1].ravel(), grid[1:, 1:].ravel()]))
+            pairs.append(np.column_stack([grid[:-1, 1:].ravel(), grid[1:, :-1].ravel()]))
+        self.add_constraints(np.vstack(pairs))
+        return span
+
+    def update_anchors(self, bone_matrices: Mapping[str, np.ndarray]):
+        """
+        Move pinned particles to their bones' current world transforms
+
+        The move is spread over the substeps of the next step(); groups whose
+        anchors moved are woken up.
+        """
+        indices = []
+        targets = []
+        for bone_name, (bone_indices, offsets) in self.anchors.items():
+            matrix = bone_matrices.get(bone_name)
+            if matrix is None:
+                continue
+            indices.append(bone_indices)
+            targets.append(offsets @ matrix[:3, :3].T + matrix[:3, 3])
+        if not indices:
+            return
+
+        self._anchor_indices = np.concatenate(indices)
+        self._anchor_from = self.positions[self._anchor_indices]
+        self._anchor_to = np.vstack(targets)
+
+        moved = np.abs(self._anchor_to - self._anchor_from).max(axis=1) > self.wake_distance
+        if np.any(moved):
+            self.wake(self.group_of[self._anchor_indices[moved]])
+
+    def _apply_anchors(self, fraction: float):
+        """Place pinned particles part of the way along their pending move"""
+        if len(self._anchor_indices):
+            self.positions[self._anchor_indices] = (self._anchor_from
+                                                    + (self._anchor_to - self._anchor_from) * fraction)
+
+    def wake(self, groups: Optional[np.ndarray] = None):
+        """Wake the given groups (all groups by default)"""
+        groups = slice(None) if groups is None else np.asarray(groups, dtype=np.intp)
+        if not np.all(self.awake[groups]):
+            self.awake[groups] = True
+            self._awake_dirty = True
+        self._quiet_steps[groups] = 0
+
+    def teleport(self):
+        """Zero all velocities (after a character swap or a large discontinuity)"""
+        self._apply_anchors(1.0)
+        self._anchor_indices = np.zeros(0, dtype=np.intp)
+        self.previous[:] = self.positions
+
+    def _compile(self):
+        """Rebuild the constraint batches after topology or pinning changes"""
+        self._compiled = []
+        for batch in color_constraints(self.constraints, self.particle_count):
+            a = self.constraints[batch, 0]
+            b = self.constraints[batch, 1]
+            wa = self.inv_mass[a]
+            wb = self.inv_mass[b]
+            w = wa + wb
+            # Constraints between two pinned particles can't move anything
+            movable = w > 0.0
+            a, b, wa, wb, w = a[movable], b[movable], wa[movable], wb[movable], w[movable]
+            self._compiled.append((a, b, self.rest_lengths[batch][movable],
+                                   (wa / w)[:, np.newaxis], (wb / w)[:, np.newaxis], self.group_of[a]))
+        self._dirty = False
+        self._awake_dirty = True
+        logger.debug(f"Compiled {len(self.constraints)} constraints into {len(self._compiled)} batches")
+
+    def _select_awake(self):
+        """Drop constraints of sleeping groups from the batches relax() iterates"""
+        if np.all(self.awake):
+            self._batches = [batch[:5] for batch in self._compiled]
+        else:
+            self._batches = []
+            for a, b, rest, share_a, share_b, group in self._compiled:
+                keep = self.awake[group]
+                if np.any(keep):
+                    self._batches.append((a[keep], b[keep], rest[keep], share_a[keep], share_b[keep]))
+        self._awake_dirty = False
+
+    def step(self, dt: float, acceleration: np.ndarray, particle_acceleration: Optional[np.ndarray] = None):
+        """
+        Advance one timestep, split into self.substeps integration/relaxation passes
+
+        acceleration applies to every free particle (gravity, wind);
+        particle_acceleration is an optional (N, 3) per-particle term.
+        """
+        if self.particle_count == 0:
+            return
+        if self._dirty:
+            self._compile()
+
+        # A change of the global forces wakes everything; per-particle forces wake their groups
+        acceleration = np.asarray(acceleration, dtype=np.float64)
+        if self._last_acceleration is None or not np.allclose(acceleration, self._last_acceleration):
+            self.wake()
+            self._last_acceleration = acceleration.copy()
+        if particle_acceleration is not None:
+            pushed = np.abs(particle_acceleration).max(axis=1) > 1e-6
+            if np.any(pushed):
+                self.wake(np.unique(self.group_of[pushed]))
+
+        if not np.any(self.awake):
+            self._apply_anchors(1.0)
+            self._anchor_indices = np.zeros(0, dtype=np.intp)
+            return
+
+        positions = self.positions
+        free = self.movable[:, np.newaxis]
+        substeps = max(1, int(self.substeps))
+        h = dt / substeps
+        # Keep the per-step damping independent of the substep count
+        damping = self.damping ** (1.0 / substeps)
+
+        step_acceleration = acceleration if particle_acceleration is None else particle_acceleration + acceleration
+        for substep in range(substeps):
+            self._apply_anchors((substep + 1) / substeps)
+
+            velocity = (positions - self.previous) * damping
+            self.previous[:] = positions
+            positions += (velocity + step_acceleration * (h * h)) * free
+
+            self.relax()
+        self._anchor_indices = np.zeros(0, dtype=np.intp)
+
+        if self.sleep_threshold > 0.0:
+            self._update_sleep(h)
+
+    def _update_sleep(self, h: float):
+        """Put groups to sleep once their kinetic energy has stayed below the threshold long enough"""
+        velocity = (self.positions - self.previous) / h
+        free = self.inv_mass > 0.0
+        mass = np.divide(1.0, self.inv_mass, out=np.zeros_like(self.inv_mass), where=free)
+        energy = np.bincount(self.group_of, weights=0.5 * mass * np.einsum('ij,ij->i', velocity, velocity),
+                             minlength=len(self.groups))
+
+        quiet = self.awake & (energy < self.sleep_threshold)
+        self._quiet_steps = np.where(quiet, self._quiet_steps + 1, 0)
+        falling_asleep = quiet & (self._quiet_steps >= self.sleep_steps)
+        if np.any(falling_asleep):
+            self.awake[falling_asleep] = False
+            self._awake_dirty = True
+            settled = falling_asleep[self.group_of]
+            self.previous[settled] = self.positions[settled]
+            logger.debug(f"{int(falling_asleep.sum())} particle groups went to sleep")
+
+    def relax(self, iterations: Optional[int] = None):
+        """Project distance constraints, batch by batch"""
+        if self._dirty:
+            self._compile()
+        if self._awake_dirty:
+            self._select_awake()
+
+        positions = self.positions
+        stiffness = self.stiffness
+
+        for _ in range(self.iterations if iterations is None else iterations):
+            for a, b, rest, share_a, share_b in self._batches:
+                # Particles are unique within a batch, so gather once and write back directly
+                pa = positions.take(a, axis=0)
+                pb = positions.take(b, axis=0)
+                delta = pb - pa
+                length = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+                np.maximum(length, 1e-9, out=length)
+
+                # Fraction of the stretch to remove, applied along delta
+                scale = (length - rest) / length
+                if stiffness != 1.0:
+                    scale *= stiffness
+                delta *= scale[:, np.newaxis]
+
+                positions[a] = pa + delta * share_a
+                positions[b] = pb - delta * share_b
+
+    def kinetic_energy(self, indices: Optional[Sequence[int]] = None, dt: float = 1.0) -> float:
+        """Sum of 0.5 * m * v^2 for free particles (optionally a subset)"""
+        velocity = (self.positions - self.previous) / dt
+        free = self.inv_mass > 0.0
+        if indices is not None:
+            selected = np.zeros_like(free)
+            selected[indices] = True
+            free &= selected
+        mass = 1.0 / self.inv_mass[free]
+        return float(0.5 * np.sum(mass * np.einsum('ij,ij->i', velocity[free], velocity[free])))
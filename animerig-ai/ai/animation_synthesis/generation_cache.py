@@ -0,0 +1,196 @@
+"""
+Bounded LRU cache for generated animation data
+Keyed by normalized request parameters, limited by size in bytes, optionally persisted to disk
+"""
+
+import copy
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+
+
+@dataclass
+class CacheStats:
+    """Cache effectiveness counters"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def normalize_text(text: str) -> str:
+    """Case- and whitespace-insensitive form of a text prompt"""
+    return " ".join(text.lower().split())
+
+
+def make_key(kind: str, text: Union[str, Tuple[str, ...]] = "", emotion: Optional[str] = None,
+             intensity: Optional[float] = None, duration: Optional[float] = None,
+             seed: Optional[int] = None, exact_text: bool = False) -> Tuple:
+    """
+    Build a cache key; floats are rounded so near-identical requests share an entry
+
+    Text is normalized with normalize_text unless exact_text is set (for
+    results that embed the text itself).
+    """
+    normalize = (lambda t: t) if exact_text else normalize_text
+    return (
+        kind,
+        normalize(text) if isinstance(text, str) else tuple(normalize(t) for t in text),
+        emotion.lower() if isinstance(emotion, str) else emotion,
+        None if intensity is None else round(float(intensity), 3),
+        None if duration is None else round(float(duration), 3),
+        seed
+    )
+
+
+def freeze(value: Any) -> Any:
+    """Mark every numpy array reachable from value read-only (in place) and return value"""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, dict):
+        for item in value.values():
+            freeze(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            freeze(item)
+    elif hasattr(value, '__dict__'):
+        for item in vars(value).values():
+            freeze(item)
+    return value
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory held by a cached value in bytes"""
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 1024
+
+
+class GenerationCache:
+    """
+    Thread-safe LRU cache of generated animation results
+
+    Track bundles (objects exposing nbytes) are stored frozen and returned
+    shared. Plain dict payloads are returned as deep copies so callers can't
+    corrupt the cached entry.
+
+    persist_path is read with pickle, which can run arbitrary code: only point
+    it at a file this application wrote, never at a downloaded or shared one.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, persist_path: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.persist_path = persist_path
+
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+        if persist_path and os.path.exists(persist_path):
+            self.load(persist_path)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Look up an entry, marking it most recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            value = entry[0]
+
+        return value if hasattr(value, 'nbytes') else copy.deepcopy(value)
+
+    def put(self, key: Hashable, value: Any) -> Any:
+        """Store a value, evicting least recently used entries beyond the byte budget"""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return value
+
+        stored = freeze(value) if hasattr(value, 'nbytes') else copy.deepcopy(value)
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.stats.bytes -= previous[1]
+
+            self._entries[key] = (stored, size)
+            self.stats.bytes += size
+
+            while self.stats.bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.stats.bytes -= evicted_size
+                self.stats.evictions += 1
+
+            self.stats.entries = len(self._entries)
+
+        return stored
+
+    def clear(self):
+        """Drop every entry (statistics are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.stats.bytes = 0
+            self.stats.entries = 0
+
+    def save(self, path: Optional[str] = None):
+        """Persist all entries to disk"""
+        path = path or self.persist_path
+        if not path:
+            return
+
+        with self._lock:
+            payload = {'version': CACHE_FORMAT_VERSION, 'entries': list(self._entries.items())}
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+        logger.info(f"Saved {len(payload['entries'])} cached animations to {path}")
+
+    def load(self, path: Optional[str] = None) -> bool:
+        """
+        Load entries persisted by save(); incompatible or corrupt files are ignored
+
+        The file is unpickled, so it must come from a trusted location (see the class notes).
+        """
+        path = path or self.persist_path
+        try:
+            with open(path, 'rb') as f:
+                payload = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load animation cache {path}: {e}")
+            return False
+
+        if payload.get('version') != CACHE_FORMAT_VERSION:
+            logger.warning(f"Ignoring animation cache {path}: format version {payload.get('version')}")
+            return False
+
+        for key, (value, _) in payload['entries']:
+            self.put(key, value)
+
+        logger.info(f"Loaded {len(payload['entries'])} cached animations from {path}")
+        return True
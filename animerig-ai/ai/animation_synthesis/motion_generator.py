@@ -1,10 +1,19 @@
 import torch
 import numpy as np
-from typing import Dict, List, Tuple, Optional, Union
-from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Tuple, Optional, Union
+from dataclasses import dataclass, replace
 from enum import Enum
 import asyncio
 import logging
+import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .generation_cache import GenerationCache, make_key
+from .secondary_baker import SecondaryMotionBaker
+from .track_compression import compress_sequence
+from .tracks import Track
 
 logger = logging.getLogger(__name__)
 
@@ -30,43 +39,36 @@ class GestureType(Enum):
     CLAP = "clap"
     THINKING_POSE = "thinking_pose"
 
-@dataclass
-class AnimationKeyframe:
-    time: float
-    position: np.ndarray
-    rotation: np.ndarray
-    scale: np.ndarray = None
-    
 @dataclass
 class BodyMotion:
-    head: List[AnimationKeyframe]
-    neck: List[AnimationKeyframe]
-    spine: List[AnimationKeyframe]
-    left_arm: List[AnimationKeyframe]
-    right_arm: List[AnimationKeyframe]
-    left_hand: List[AnimationKeyframe]
-    right_hand: List[AnimationKeyframe]
+    head: Track
+    neck: Track
+    spine: Track
+    left_arm: Track
+    right_arm: Track
+    left_hand: Track
+    right_hand: Track
 
 @dataclass
 class FacialAnimation:
-    eye_blink: List[AnimationKeyframe]
-    eye_movement: List[AnimationKeyframe]
-    mouth_shape: List[AnimationKeyframe]
-    eyebrow_movement: List[AnimationKeyframe]
-    emotion_blend: List[AnimationKeyframe]
+    eye_blink: Track
+    eye_movement: Track
+    mouth_shape: Track
+    eyebrow_movement: Track
+    emotion_blend: Track
 
 @dataclass
 class MicroMovements:
-    breathing: List[AnimationKeyframe]
-    idle_sway: List[AnimationKeyframe]
-    weight_shift: List[AnimationKeyframe]
-    random_blinks: List[float]  # Timing for random blinks
+    breathing: Track
+    idle_sway: Track
+    weight_shift: Track
+    random_blinks: np.ndarray  # Timing for random blinks
 
 @dataclass
 class SecondaryMotion:
-    hair_physics: Dict[str, List[AnimationKeyframe]]
-    clothing_physics: Dict[str, List[AnimationKeyframe]]
-    accessories: Dict[str, List[AnimationKeyframe]]
+    hair_physics: Dict[str, Track]
+    clothing_physics: Dict[str, Track]
+    accessories: Dict[str, Track]
 
 @dataclass
 class AnimationSequence:
@@ -79,6 +81,53 @@ class AnimationSequence:
     
     def get_total_frames(self) -> int:
         return int(self.duration * self.fps)
+    
+    def iter_tracks(self):
+        """Yield (name, track) for every channel in the sequence"""
+        for group_name, group in (('body', self.body), ('face', self.face), ('micro', self.micro)):
+            for field_name, value in vars(group).items():
+                if isinstance(value, Track):
+                    yield f"{group_name}.{field_name}", value
+        for group_name, channels in vars(self.secondary).items():
+            for channel_name, track in channels.items():
+                yield f"secondary.{group_name}.{channel_name}", track
+    
+    def map_tracks(self, fn) -> 'AnimationSequence':
+        """New sequence with fn(name, track) applied to every track"""
+        def mapped(group_name, group):
+            return replace(group, **{
+                field_name: fn(f"{group_name}.{field_name}", value)
+                for field_name, value in vars(group).items() if isinstance(value, Track)
+            })
+        
+        secondary = replace(self.secondary, **{
+            group_name: {name: fn(f"secondary.{group_name}.{name}", track) for name, track in channels.items()}
+            for group_name, channels in vars(self.secondary).items()
+        })
+        return replace(self, body=mapped('body', self.body), face=mapped('face', self.face),
+                       micro=mapped('micro', self.micro), secondary=secondary)
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by all track arrays"""
+        return sum(track.nbytes for _, track in self.iter_tracks()) + self.micro.random_blinks.nbytes
+
+@dataclass
+class ContinuityState:
+    """Where a streamed chunk left off, so the next one can join it seamlessly"""
+    end_time: float = 0.0
+    end_values: Dict[str, np.ndarray] = None
+    emotion: Optional['EmotionType'] = None
+
+@dataclass
+class AnimationChunk:
+    """A ready-to-play slice of a streamed animation (one sentence)"""
+    index: int
+    text: str
+    start_time: float  # Offset of this chunk within the whole response
+    sequence: AnimationSequence
+    continuity: ContinuityState  # State at the end of this chunk
+    is_last: bool = False
 
 @dataclass
 class AnimationLoop:
@@ -86,13 +135,37 @@ class AnimationLoop:
     loop_duration: float
     seamless: bool = True
 
+def blink_curve(time_points: np.ndarray, blink_times: np.ndarray, blink_duration: float = 0.15) -> np.ndarray:
+    """
+    Eye openness (1 = open) at each time point for blinks centred on blink_times
+    Each point is only compared with its nearest blink centres (sorted search), so cost is O(T log B)
+    """
+    openness = np.ones(len(time_points))
+    if len(blink_times) == 0:
+        return openness
+    
+    blink_times = np.sort(blink_times)
+    right = np.searchsorted(blink_times, time_points)
+    left = np.maximum(right - 1, 0)
+    right = np.minimum(right, len(blink_times) - 1)
+    
+    offset = np.minimum(np.abs(time_points - blink_times[left]), np.abs(blink_times[right] - time_points))
+    
+    # Smooth blink curve: closed at the centre, reopening quadratically
+    half_duration = blink_duration / 2
+    during_blink = offset < half_duration
+    openness[during_blink] = (offset[during_blink] / half_duration) ** 2
+    return openness
+
 class MotionGenerator:
     """
     Advanced AI-powered motion generation system
     Generates natural character animations based on text, emotion, and context
     """
     
-    def __init__(self, device: str = "auto"):
+    def __init__(self, device: str = "auto", seed: Optional[int] = None,
+                 cache_max_bytes: int = 64 * 1024 * 1024, cache_path: Optional[str] = None,
+                 cache_tolerance: Optional[float] = 1e-4):
         self.device = self._select_device(device)
         logger.info(f"Initializing MotionGenerator on device: {self.device}")
         
@@ -108,6 +181,27 @@ class MotionGenerator:
         self.breathing_rate = 12  # breaths per minute
         self.blink_frequency = 15  # blinks per minute
         
+        # Hair/cloth follow-through, baked offline so playback only samples tracks
+        self.secondary_baker = SecondaryMotionBaker()
+        
+        # Randomness for unseeded generation calls
+        self.rng = np.random.default_rng(seed)
+        
+        # Background generation: worker threads plus a pool of ready-made idle loops
+        self.executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1),
+                                           thread_name_prefix="MotionGenerator")
+        self.idle_pool_size = 3
+        self.idle_crossfade_time = 0.5
+        self._idle_pool = deque()
+        self._last_idle_loop: Optional[AnimationLoop] = None
+        self._idle_refill_task: Optional[asyncio.Task] = None
+        
+        # Memoized results for repeated requests (greetings, acknowledgements, emotion switches);
+        # cache_path is unpickled on startup, so it must be a trusted, app-written file
+        self.cache = GenerationCache(max_bytes=cache_max_bytes, persist_path=cache_path)
+        # Cached sequences drop keys that linear playback reproduces within this error (None keeps all)
+        self.cache_tolerance = cache_tolerance
+        
         self._load_models()
         self._initialize_emotion_mappings()
     
@@ -210,7 +304,8 @@ class MotionGenerator:
         text: str, 
         emotion: Union[str, EmotionType],
         character_state: Dict,
-        duration: Optional[float] = None
+        duration: Optional[float] = None,
+        seed: Optional[int] = None
     ) -> AnimationSequence:
         """
         Generate natural animations based on text input and emotional context
@@ -220,6 +315,8 @@ class MotionGenerator:
             emotion: Target emotion for the animation
             character_state: Current state of the character
             duration: Override animation duration
+            seed: Seed for reproducible output (uses the generator's own RNG if None).
+                  Seeded requests are cached; unseeded ones are always freshly generated.
             
         Returns:
             Complete animation sequence
@@ -235,31 +332,23 @@ class MotionGenerator:
             if duration is None:
                 duration = self._calculate_duration(text)
             
-            # 1. Analyze text for gesture cues
-            gesture_cues = self._analyze_gesture_context(text)
-            
-            # 2. Generate base body motion
-            body_motion = await self._generate_body_motion(text, emotion, gesture_cues, duration)
-            
-            # 3. Generate facial animation
-            facial_animation = await self._generate_facial_animation(text, emotion, duration)
-            
-            # 4. Add micro-movements and breathing
-            micro_movements = self._generate_micro_movements(character_state, duration)
+            cache_key = None
+            if seed is not None:
+                cache_key = make_key('sequence', text, emotion.value, None, duration, seed)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return cached
             
-            # 5. Physics-based secondary motion
-            secondary_motion = await self._generate_secondary_motion(body_motion, character_state)
-            
-            sequence = AnimationSequence(
-                body=body_motion,
-                face=facial_animation,
-                micro=micro_movements,
-                secondary=secondary_motion,
-                duration=duration,
-                fps=self.fps
-            )
+            rng = self.rng if seed is None else np.random.default_rng(seed)
+            sequence = self._build_animation_sequence(text, emotion, character_state, duration, rng)
             
             logger.info(f"Generated animation sequence: {duration:.2f}s, {sequence.get_total_frames()} frames")
+            
+            if cache_key is not None:
+                if self.cache_tolerance is not None:
+                    sequence = compress_sequence(sequence, self.cache_tolerance)
+                # Cached bundles are frozen and shared between callers
+                sequence = self.cache.put(cache_key, sequence)
             return sequence
             
         except Exception as e:
@@ -267,6 +356,136 @@ class MotionGenerator:
             # Return safe fallback animation
             return self._create_fallback_animation(duration or 2.0)
     
+    async def stream_animation_sequence(
+        self,
+        text: str,
+        emotion: Optional[Union[str, EmotionType]],
+        character_state: Dict,
+        seed: Optional[int] = None,
+        continuity: Optional[ContinuityState] = None,
+        blend_time: float = 0.3
+    ) -> AsyncIterator[AnimationChunk]:
+        """
+        Generate animation for long text sentence by sentence
+        
+        Yields one AnimationChunk per sentence as soon as it is ready, so playback can
+        start after the first sentence while the rest is still being generated. Each
+        chunk is blended from the previous chunk's final pose over blend_time, so curves
+        join without jumps. Pass the last chunk's continuity to carry on from a
+        previous response.
+        
+        Args:
+            emotion: Emotion for every sentence, or None to infer it per sentence
+        """
+        sentences = self._split_sentences(text)
+        if not sentences:
+            return
+        
+        if isinstance(emotion, str):
+            emotion = EmotionType(emotion.lower())
+        
+        seeds = np.random.SeedSequence(seed).spawn(len(sentences)) if seed is not None else \
+            self.rng.integers(0, 2**32, len(sentences))
+        state = continuity or ContinuityState()
+        start_time = 0.0
+        
+        loop = asyncio.get_running_loop()
+        
+        def submit(index):
+            sentence = sentences[index]
+            sentence_emotion = emotion or self._analyze_conversation_emotion("", sentence)
+            return sentence_emotion, loop.run_in_executor(
+                self.executor,
+                self._build_animation_sequence,
+                sentence, sentence_emotion, character_state,
+                self._calculate_duration(sentence), np.random.default_rng(seeds[index])
+            )
+        
+        # Keep one sentence of look-ahead generating while the current chunk plays
+        pending = submit(0)
+        for index, sentence in enumerate(sentences):
+            sentence_emotion, future = pending
+            sequence = await future
+            if index + 1 < len(sentences):
+                pending = submit(index + 1)
+            
+            if state.end_values:
+                sequence = self._blend_from_state(sequence, state, blend_time)
+            
+            state = ContinuityState(
+                end_time=start_time + sequence.duration,
+                end_values={name: track.values[-1].copy() for name, track in sequence.iter_tracks() if len(track)},
+                emotion=sentence_emotion
+            )
+            
+            yield AnimationChunk(
+                index=index,
+                text=sentence,
+                start_time=start_time,
+                sequence=sequence,
+                continuity=state,
+                is_last=index == len(sentences) - 1
+            )
+            start_time += sequence.duration
+    
+    def _split_sentences(self, text: str) -> List[str]:
+        """Split text at sentence boundaries (and paragraph breaks)"""
+        parts = re.split(r'(?<=[.!?\u3002\uff01\uff1f])\s+|\n\s*\n', text.strip())
+        return [part.strip() for part in parts if part and part.strip()]
+    
+    def _blend_from_state(self, sequence: AnimationSequence, state: ContinuityState,
+                          blend_time: float) -> AnimationSequence:
+        """Offset the start of every track so it begins exactly at the previous chunk's end pose"""
+        blend_time = min(blend_time, sequence.duration * 0.5)
+        
+        def blend(name, track):
+            previous = state.end_values.get(name)
+            if previous is None or len(track) == 0 or blend_time <= 0:
+                return track
+            
+            # Correction decays from the full gap at t=0 to nothing at blend_time
+            phase = np.clip(track.times / blend_time, 0.0, 1.0)
+            falloff = (1.0 - phase * phase * (3.0 - 2.0 * phase))[:, np.newaxis]
+            return Track(track.times, track.values + (previous - track.values[0]) * falloff)
+        
+        return sequence.map_tracks(blend)
+    
+    def _build_animation_sequence(
+        self,
+        text: str,
+        emotion: EmotionType,
+        character_state: Dict,
+        duration: float,
+        rng: np.random.Generator
+    ) -> AnimationSequence:
+        """Generate every channel of a sequence (synchronous, safe to run on a worker thread)"""
+        # 1. Analyze text for gesture cues
+        gesture_cues = self._analyze_gesture_context(text)
+        
+        # One blink schedule drives both the eye track and the micro-movement timings
+        blink_times = self._schedule_blinks(duration, rng)
+        
+        # 2. Generate base body motion
+        body_motion = self._generate_body_motion(text, emotion, gesture_cues, duration, rng)
+        
+        # 3. Generate facial animation
+        facial_animation = self._generate_facial_animation(text, emotion, duration, blink_times, rng)
+        
+        # 4. Add micro-movements and breathing
+        micro_movements = self._generate_micro_movements(character_state, duration, blink_times, rng)
+        
+        # 5. Physics-based secondary motion
+        secondary_motion = self._generate_secondary_motion(body_motion, character_state)
+        
+        return AnimationSequence(
+            body=body_motion,
+            face=facial_animation,
+            micro=micro_movements,
+            secondary=secondary_motion,
+            duration=duration,
+            fps=self.fps
+        )
+    
     def _analyze_gesture_context(self, text: str) -> List[GestureType]:
         """Analyze text for natural gesture cues"""
         gestures = []
@@ -292,267 +511,197 @@ class MotionGenerator:
         
         return gestures
     
-    async def _generate_body_motion(
+    def _generate_body_motion(
         self, 
         text: str, 
         emotion: EmotionType, 
         gestures: List[GestureType],
-        duration: float
+        duration: float,
+        rng: Optional[np.random.Generator] = None
     ) -> BodyMotion:
         """Generate body motion based on input parameters"""
         
         # Get emotion-specific parameters
         emotion_params = self.emotion_mappings.get(emotion, {})
         
-        # Generate keyframes for each body part
+        # Generate a track for each body part
         time_points = np.linspace(0, duration, max(2, int(duration * 4)))  # 4 keyframes per second
         
         # Head motion
-        head_keyframes = self._generate_head_motion(time_points, emotion_params, gestures)
+        head_track = self._generate_head_motion(time_points, emotion_params, gestures, rng)
         
         # Neck motion (follows head with slight delay)
-        neck_keyframes = self._generate_neck_motion(head_keyframes, time_points)
+        neck_track = self._generate_neck_motion(head_track, time_points)
         
         # Spine motion (breathing and posture)
-        spine_keyframes = self._generate_spine_motion(time_points, emotion_params)
+        spine_track = self._generate_spine_motion(time_points, emotion_params)
         
         # Arm motions (based on gestures)
-        left_arm_keyframes = self._generate_arm_motion(time_points, gestures, 'left')
-        right_arm_keyframes = self._generate_arm_motion(time_points, gestures, 'right')
+        left_arm_track = self._generate_arm_motion(time_points, gestures, 'left')
+        right_arm_track = self._generate_arm_motion(time_points, gestures, 'right')
         
         # Hand motions (detailed finger control)
-        left_hand_keyframes = self._generate_hand_motion(time_points, gestures, 'left')
-        right_hand_keyframes = self._generate_hand_motion(time_points, gestures, 'right')
+        left_hand_track = self._generate_hand_motion(time_points, gestures, 'left')
+        right_hand_track = self._generate_hand_motion(time_points, gestures, 'right')
         
         return BodyMotion(
-            head=head_keyframes,
-            neck=neck_keyframes,
-            spine=spine_keyframes,
-            left_arm=left_arm_keyframes,
-            right_arm=right_arm_keyframes,
-            left_hand=left_hand_keyframes,
-            right_hand=right_hand_keyframes
+            head=head_track,
+            neck=neck_track,
+            spine=spine_track,
+            left_arm=left_arm_track,
+            right_arm=right_arm_track,
+            left_hand=left_hand_track,
+            right_hand=right_hand_track
         )
     
     def _generate_head_motion(
         self, 
         time_points: np.ndarray, 
         emotion_params: Dict, 
-        gestures: List[GestureType]
-    ) -> List[AnimationKeyframe]:
+        gestures: List[GestureType],
+        rng: Optional[np.random.Generator] = None
+    ) -> Track:
         """Generate natural head motion"""
-        keyframes = []
+        rng = rng or self.rng
+        rotation = np.zeros((len(time_points), 3))
         
-        for i, t in enumerate(time_points):
-            # Base position
-            position = np.array([0.0, 0.0, 0.0])
-            
-            # Base rotation (neutral)
-            rotation = np.array([0.0, 0.0, 0.0])
-            
-            # Apply emotion-based modifications
-            if 'head_tilt' in emotion_params:
-                rotation[2] = np.radians(emotion_params['head_tilt'])
-            
-            if 'head_back' in emotion_params:
-                rotation[0] = np.radians(emotion_params['head_back'])
-            
-            # Apply gesture-based modifications
-            for gesture in gestures:
-                if gesture == GestureType.NOD:
-                    # Add nodding motion
-                    nod_phase = (t * 4) % (2 * np.pi)  # 2 nods per second
-                    rotation[0] += np.sin(nod_phase) * 0.2
-                
-                elif gesture == GestureType.SHAKE_HEAD:
-                    # Add head shaking motion
-                    shake_phase = (t * 6) % (2 * np.pi)  # 3 shakes per second
-                    rotation[1] += np.sin(shake_phase) * 0.3
-            
-            # Add subtle random variation for life-like movement
-            if i > 0:
-                variation = np.random.normal(0, 0.02, 3)
-                rotation += variation
+        # Apply emotion-based modifications
+        if 'head_tilt' in emotion_params:
+            rotation[:, 2] = np.radians(emotion_params['head_tilt'])
+        
+        if 'head_back' in emotion_params:
+            rotation[:, 0] = np.radians(emotion_params['head_back'])
+        
+        # Apply gesture-based modifications
+        for gesture in gestures:
+            if gesture == GestureType.NOD:
+                # Add nodding motion
+                nod_phase = (time_points * 4) % (2 * np.pi)  # 2 nods per second
+                rotation[:, 0] += np.sin(nod_phase) * 0.2
             
-            keyframes.append(AnimationKeyframe(
-                time=t,
-                position=position,
-                rotation=rotation
-            ))
+            elif gesture == GestureType.SHAKE_HEAD:
+                # Add head shaking motion
+                shake_phase = (time_points * 6) % (2 * np.pi)  # 3 shakes per second
+                rotation[:, 1] += np.sin(shake_phase) * 0.3
         
-        return keyframes
+        # Add subtle random variation for life-like movement (first key stays clean)
+        rotation[1:] += rng.normal(0, 0.02, (len(time_points) - 1, 3))
+        
+        return Track.transform(time_points, rotation=rotation)
     
     def _generate_neck_motion(
         self, 
-        head_keyframes: List[AnimationKeyframe], 
+        head_track: Track, 
         time_points: np.ndarray
-    ) -> List[AnimationKeyframe]:
+    ) -> Track:
         """Generate neck motion that follows head with slight delay and damping"""
-        keyframes = []
+        rotation = np.zeros((len(time_points), 3))
         
-        for i, t in enumerate(time_points):
-            position = np.array([0.0, 0.0, 0.0])
-            
-            # Neck follows head rotation with damping
-            if i < len(head_keyframes):
-                head_rotation = head_keyframes[i].rotation
-                # Neck rotates about 60% of head rotation
-                rotation = head_rotation * 0.6
-            else:
-                rotation = np.array([0.0, 0.0, 0.0])
-            
-            keyframes.append(AnimationKeyframe(
-                time=t,
-                position=position,
-                rotation=rotation
-            ))
+        # Neck rotates about 60% of head rotation
+        count = min(len(time_points), len(head_track))
+        rotation[:count] = head_track.rotations[:count] * 0.6
         
-        return keyframes
+        return Track.transform(time_points, rotation=rotation)
     
     def _generate_spine_motion(
         self, 
         time_points: np.ndarray, 
         emotion_params: Dict
-    ) -> List[AnimationKeyframe]:
+    ) -> Track:
         """Generate spine motion for posture and breathing"""
-        keyframes = []
-        
-        for t in time_points:
-            position = np.array([0.0, 0.0, 0.0])
-            rotation = np.array([0.0, 0.0, 0.0])
-            
-            # Breathing motion
-            breathing_phase = t * (self.breathing_rate / 60) * 2 * np.pi
-            breathing_amplitude = 0.005  # Subtle breathing movement
-            position[2] = np.sin(breathing_phase) * breathing_amplitude
-            
-            # Posture based on emotion
-            posture = emotion_params.get('body_posture', 'neutral')
-            if posture == 'slouched':
-                rotation[0] = np.radians(5)  # Slight forward lean
-            elif posture == 'upright':
-                rotation[0] = np.radians(-2)  # Slight backward lean
-            elif posture == 'alert':
-                position[1] += 0.01  # Lift chest slightly
-            
-            keyframes.append(AnimationKeyframe(
-                time=t,
-                position=position,
-                rotation=rotation
-            ))
-        
-        return keyframes
+        position = np.zeros((len(time_points), 3))
+        rotation = np.zeros((len(time_points), 3))
+        
+        # Breathing motion
+        breathing_phase = time_points * (self.breathing_rate / 60) * 2 * np.pi
+        breathing_amplitude = 0.005  # Subtle breathing movement
+        position[:, 2] = np.sin(breathing_phase) * breathing_amplitude
+        
+        # Posture based on emotion
+        posture = emotion_params.get('body_posture', 'neutral')
+        if posture == 'slouched':
+            rotation[:, 0] = np.radians(5)  # Slight forward lean
+        elif posture == 'upright':
+            rotation[:, 0] = np.radians(-2)  # Slight backward lean
+        elif posture == 'alert':
+            position[:, 1] += 0.01  # Lift chest slightly
+        
+        return Track.transform(time_points, position=position, rotation=rotation)
     
     def _generate_arm_motion(
         self, 
         time_points: np.ndarray, 
         gestures: List[GestureType], 
         side: str
-    ) -> List[AnimationKeyframe]:
+    ) -> Track:
         """Generate arm motion based on gestures"""
-        keyframes = []
+        # Default arm position (relaxed)
+        if side == 'left':
+            rotation = np.tile([0.1, 0.0, -0.1], (len(time_points), 1))  # Slightly outward
+        else:
+            rotation = np.tile([0.1, 0.0, 0.1], (len(time_points), 1))
         
-        for t in time_points:
-            position = np.array([0.0, 0.0, 0.0])
-            rotation = np.array([0.0, 0.0, 0.0])
-            
-            # Default arm position (relaxed)
-            if side == 'left':
-                rotation = np.array([0.1, 0.0, -0.1])  # Slightly outward
-            else:
-                rotation = np.array([0.1, 0.0, 0.1])
-            
-            # Apply gesture-specific motions
+        # Apply gesture-specific motions (all of them drive the right arm)
+        if side == 'right':
             for gesture in gestures:
                 if gesture == GestureType.WAVE:
-                    # Waving motion (typically right hand)
-                    if side == 'right':
-                        wave_phase = (t * 8) % (2 * np.pi)  # 4 waves per second
-                        rotation[2] = np.radians(45) + np.sin(wave_phase) * 0.5
-                        rotation[0] = np.radians(-30)
+                    # Waving motion
+                    wave_phase = (time_points * 8) % (2 * np.pi)  # 4 waves per second
+                    rotation[:, 2] = np.radians(45) + np.sin(wave_phase) * 0.5
+                    rotation[:, 0] = np.radians(-30)
                 
                 elif gesture == GestureType.POINT:
                     # Pointing gesture
-                    if side == 'right':
-                        rotation[0] = np.radians(-15)
-                        rotation[1] = np.radians(30)
+                    rotation[:, 0] = np.radians(-15)
+                    rotation[:, 1] = np.radians(30)
                 
                 elif gesture == GestureType.THUMBS_UP:
                     # Thumbs up gesture
-                    if side == 'right':
-                        rotation[0] = np.radians(-45)
-                        rotation[2] = np.radians(30)
+                    rotation[:, 0] = np.radians(-45)
+                    rotation[:, 2] = np.radians(30)
                 
                 elif gesture == GestureType.THINKING_POSE:
                     # Hand to chin thinking pose
-                    if side == 'right':
-                        rotation[0] = np.radians(-90)
-                        rotation[1] = np.radians(45)
-            
-            keyframes.append(AnimationKeyframe(
-                time=t,
-                position=position,
-                rotation=rotation
-            ))
+                    rotation[:, 0] = np.radians(-90)
+                    rotation[:, 1] = np.radians(45)
         
-        return keyframes
+        return Track.transform(time_points, rotation=rotation)
     
     def _generate_hand_motion(
         self, 
         time_points: np.ndarray, 
         gestures: List[GestureType], 
         side: str
-    ) -> List[AnimationKeyframe]:
+    ) -> Track:
         """Generate detailed hand and finger motion"""
-        keyframes = []
-        
-        for t in time_points:
-            position = np.array([0.0, 0.0, 0.0])
-            rotation = np.array([0.0, 0.0, 0.0])
-            
-            # Default hand pose (slightly curved, natural)
-            # This would include individual finger positions in production
-            
-            # Apply gesture-specific hand poses
-            for gesture in gestures:
-                if gesture == GestureType.WAVE:
-                    # Open hand for waving
-                    pass  # Fingers extended
-                
-                elif gesture == GestureType.POINT:
-                    # Index finger extended, others curled
-                    pass
-                
-                elif gesture == GestureType.THUMBS_UP:
-                    # Thumb up, fingers curled
-                    pass
-            
-            keyframes.append(AnimationKeyframe(
-                time=t,
-                position=position,
-                rotation=rotation
-            ))
-        
-        return keyframes
+        # Default hand pose (slightly curved, natural)
+        # Gesture-specific finger poses (open hand for wave, index extended for
+        # point, thumb up) would be added here once the rig has finger bones
+        return Track.transform(time_points)
     
-    async def _generate_facial_animation(
+    def _generate_facial_animation(
         self, 
         text: str, 
         emotion: EmotionType, 
-        duration: float
+        duration: float,
+        blink_times: Optional[np.ndarray] = None,
+        rng: Optional[np.random.Generator] = None
     ) -> FacialAnimation:
         """Generate facial animation including lip sync and expressions"""
+        rng = rng or self.rng
         
         time_points = np.linspace(0, duration, max(2, int(duration * 10)))  # 10 keyframes per second
         
         # Eye blinking
-        eye_blink = self._generate_eye_blinks(time_points)
+        if blink_times is None:
+            blink_times = self._schedule_blinks(duration, rng)
+        eye_blink = self._generate_eye_blinks(time_points, blink_times)
         
         # Eye movement (following conversation)
-        eye_movement = self._generate_eye_movement(time_points, emotion)
+        eye_movement = self._generate_eye_movement(time_points, emotion, rng)
         
         # Mouth shapes for lip sync
-        mouth_shape = await self._generate_lip_sync(text, time_points)
+        mouth_shape = self._generate_lip_sync(text, time_points)
         
         # Eyebrow movement
         eyebrow_movement = self._generate_eyebrow_motion(time_points, emotion)
@@ -568,107 +717,65 @@ class MotionGenerator:
             emotion_blend=emotion_blend
         )
     
-    def _generate_eye_blinks(self, time_points: np.ndarray) -> List[AnimationKeyframe]:
-        """Generate natural eye blinking pattern"""
-        keyframes = []
-        
-        # Generate random blink times
+    def _schedule_blinks(self, duration: float, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Draw natural, slightly irregular blink times within [0, duration)"""
+        rng = rng or self.rng
         blink_interval = 60.0 / self.blink_frequency  # Average time between blinks
-        blink_times = []
-        
-        current_time = 0
-        while current_time < time_points[-1]:
-            # Add some randomness to blink timing
-            next_blink = current_time + blink_interval + np.random.normal(0, blink_interval * 0.3)
-            if next_blink < time_points[-1]:
-                blink_times.append(next_blink)
-            current_time = next_blink
-        
-        for t in time_points:
-            # Default eyes open
-            eye_openness = 1.0
-            
-            # Check if this is during a blink
-            for blink_time in blink_times:
-                blink_duration = 0.15  # Blink lasts 150ms
-                if abs(t - blink_time) < blink_duration / 2:
-                    # Calculate blink curve
-                    blink_phase = abs(t - blink_time) / (blink_duration / 2)
-                    eye_openness = 1.0 - (1.0 - blink_phase**2)  # Smooth blink curve
-            
-            keyframes.append(AnimationKeyframe(
-                time=t,
-                position=np.array([eye_openness]),
-                rotation=np.array([0.0, 0.0, 0.0])
-            ))
         
-        return keyframes
+        # Draw enough jittered intervals up front, topping up in the rare case they fall short
+        expected = int(duration / blink_interval) + 4
+        blink_times = np.cumsum(blink_interval + rng.normal(0, blink_interval * 0.3, expected))
+        while blink_times[-1] < duration:
+            extra = blink_interval + rng.normal(0, blink_interval * 0.3, expected)
+            blink_times = np.concatenate([blink_times, blink_times[-1] + np.cumsum(extra)])
+        
+        # Keep the blinks before the schedule first reaches the end of the clip
+        end = int(np.argmax(blink_times >= duration))
+        return np.sort(blink_times[:end])
+    
+    def _generate_eye_blinks(self, time_points: np.ndarray, blink_times: np.ndarray) -> Track:
+        """Generate natural eye blinking pattern"""
+        return Track(time_points, blink_curve(time_points, blink_times))
     
     def _generate_eye_movement(
         self, 
         time_points: np.ndarray, 
-        emotion: EmotionType
-    ) -> List[AnimationKeyframe]:
+        emotion: EmotionType,
+        rng: Optional[np.random.Generator] = None
+    ) -> Track:
         """Generate natural eye movement patterns"""
-        keyframes = []
+        rng = rng or self.rng
+        # Base eye position (looking forward): horizontal, vertical
+        look_direction = np.zeros(2)
         
-        for t in time_points:
-            # Base eye position (looking forward)
-            look_direction = np.array([0.0, 0.0])  # horizontal, vertical
-            
-            # Add emotion-based eye behavior
-            if emotion == EmotionType.THINKING:
-                # Look up and to the side when thinking
-                look_direction[0] = 0.3  # Look right
-                look_direction[1] = 0.2  # Look up slightly
-            
-            elif emotion == EmotionType.SAD:
-                # Look down when sad
-                look_direction[1] = -0.3
-            
-            elif emotion == EmotionType.SURPRISED:
-                # Wide eyes, looking forward
-                pass  # Keep default
-            
-            # Add subtle random eye movements for realism
-            random_movement = np.random.normal(0, 0.05, 2)
-            look_direction += random_movement
-            
-            keyframes.append(AnimationKeyframe(
-                time=t,
-                position=look_direction,
-                rotation=np.array([0.0, 0.0, 0.0])
-            ))
+        # Add emotion-based eye behavior
+        if emotion == EmotionType.THINKING:
+            # Look up and to the side when thinking
+            look_direction[:] = [0.3, 0.2]
         
-        return keyframes
+        elif emotion == EmotionType.SAD:
+            # Look down when sad
+            look_direction[1] = -0.3
+        
+        # Add subtle random eye movements for realism
+        random_movement = rng.normal(0, 0.05, (len(time_points), 2))
+        
+        return Track(time_points, look_direction + random_movement)
     
-    async def _generate_lip_sync(self, text: str, time_points: np.ndarray) -> List[AnimationKeyframe]:
+    def _generate_lip_sync(self, text: str, time_points: np.ndarray) -> Track:
         """Generate lip synchronization for speech"""
-        keyframes = []
-        
         # Simple phoneme-based lip sync (placeholder)
         # In production, would use proper TTS and phoneme analysis
         
         words = text.split()
         word_duration = len(time_points) / max(1, len(words))
         
-        for i, t in enumerate(time_points):
-            # Determine which word we're in
-            word_index = int(i / word_duration)
-            if word_index < len(words):
-                word = words[word_index].lower()
-                # Simple mouth shape based on word characteristics
-                mouth_shape = self._get_mouth_shape_for_word(word)
-            else:
-                mouth_shape = np.array([0.0])  # Mouth closed
-            
-            keyframes.append(AnimationKeyframe(
-                time=t,
-                position=mouth_shape,
-                rotation=np.array([0.0, 0.0, 0.0])
-            ))
+        # One mouth shape per word, then spread across the keys that word covers
+        word_shapes = np.array([self._get_mouth_shape_for_word(word.lower())[0] for word in words] + [0.0])
+        word_index = (np.arange(len(time_points)) / word_duration).astype(np.int64)
+        word_index = np.minimum(word_index, len(words))  # Past the last word: mouth closed
         
-        return keyframes
+        return Track(time_points, word_shapes[word_index])
     
     def _get_mouth_shape_for_word(self, word: str) -> np.ndarray:
         """Get approximate mouth shape for a word (simplified)"""
@@ -684,184 +791,94 @@ class MotionGenerator:
         self, 
         time_points: np.ndarray, 
         emotion: EmotionType
-    ) -> List[AnimationKeyframe]:
+    ) -> Track:
         """Generate eyebrow movement based on emotion"""
-        keyframes = []
-        
         emotion_params = self.emotion_mappings.get(emotion, {})
         
-        for t in time_points:
-            position = np.array([0.0])  # Neutral position
-            
-            # Apply emotion-based eyebrow position
-            if 'eyebrow_raise' in emotion_params:
-                position[0] = emotion_params['eyebrow_raise']
-            elif 'eyebrow_lower' in emotion_params:
-                position[0] = emotion_params['eyebrow_lower']
-            elif 'eyebrow_furrow' in emotion_params:
-                position[0] = emotion_params['eyebrow_furrow']
-            
-            keyframes.append(AnimationKeyframe(
-                time=t,
-                position=position,
-                rotation=np.array([0.0, 0.0, 0.0])
-            ))
+        position = 0.0  # Neutral position
         
-        return keyframes
+        # Apply emotion-based eyebrow position
+        if 'eyebrow_raise' in emotion_params:
+            position = emotion_params['eyebrow_raise']
+        elif 'eyebrow_lower' in emotion_params:
+            position = emotion_params['eyebrow_lower']
+        elif 'eyebrow_furrow' in emotion_params:
+            position = emotion_params['eyebrow_furrow']
+        
+        return Track(time_points, np.full(len(time_points), position))
     
     def _generate_emotion_blend(
         self, 
         time_points: np.ndarray, 
         emotion: EmotionType
-    ) -> List[AnimationKeyframe]:
+    ) -> Track:
         """Generate overall emotion intensity over time"""
-        keyframes = []
-        
-        for t in time_points:
-            # Emotion intensity could vary over time
-            intensity = 1.0  # Full emotion intensity
-            
-            # Could add emotion transitions here
-            
-            keyframes.append(AnimationKeyframe(
-                time=t,
-                position=np.array([intensity]),
-                rotation=np.array([0.0, 0.0, 0.0])
-            ))
-        
-        return keyframes
+        # Full emotion intensity - transitions could be shaped here
+        return Track(time_points, np.ones(len(time_points)))
     
     def _generate_micro_movements(
         self, 
         character_state: Dict, 
-        duration: float
+        duration: float,
+        blink_times: Optional[np.ndarray] = None,
+        rng: Optional[np.random.Generator] = None
     ) -> MicroMovements:
         """Generate subtle life-like micro movements"""
         
         time_points = np.linspace(0, duration, max(2, int(duration * 60)))  # 60 samples per second
+        zeros = np.zeros(len(time_points))
         
         # Breathing animation
-        breathing = []
-        for t in time_points:
-            breathing_phase = t * (self.breathing_rate / 60) * 2 * np.pi
-            amplitude = np.array([0.0, np.sin(breathing_phase) * 0.005, 0.0])
-            
-            breathing.append(AnimationKeyframe(
-                time=t,
-                position=amplitude,
-                rotation=np.array([0.0, 0.0, 0.0])
-            ))
+        breathing_phase = time_points * (self.breathing_rate / 60) * 2 * np.pi
+        breathing = Track.transform(
+            time_points,
+            position=np.column_stack([zeros, np.sin(breathing_phase) * 0.005, zeros])
+        )
         
         # Idle sway (very subtle body movement)
-        idle_sway = []
-        for t in time_points:
-            sway_phase = t * 0.1 * 2 * np.pi  # Very slow sway
-            sway_amount = np.array([np.sin(sway_phase) * 0.002, 0.0, 0.0])
-            
-            idle_sway.append(AnimationKeyframe(
-                time=t,
-                position=sway_amount,
-                rotation=np.array([0.0, 0.0, np.sin(sway_phase * 0.5) * 0.01])
-            ))
+        sway_phase = time_points * 0.1 * 2 * np.pi  # Very slow sway
+        idle_sway = Track.transform(
+            time_points,
+            position=np.column_stack([np.sin(sway_phase) * 0.002, zeros, zeros]),
+            rotation=np.column_stack([zeros, zeros, np.sin(sway_phase * 0.5) * 0.01])
+        )
         
         # Weight shifting
-        weight_shift = []
         shift_interval = 8.0  # Shift weight every 8 seconds
-        for t in time_points:
-            shift_phase = (t / shift_interval) % 1.0
-            if shift_phase < 0.1:  # Quick shift
-                shift_amount = np.array([0.0, 0.0, np.sin(shift_phase * 10 * np.pi) * 0.01])
-            else:
-                shift_amount = np.array([0.0, 0.0, 0.0])
-            
-            weight_shift.append(AnimationKeyframe(
-                time=t,
-                position=shift_amount,
-                rotation=np.array([0.0, 0.0, 0.0])
-            ))
-        
-        # Random blink times
-        random_blinks = []
-        blink_interval = 60.0 / self.blink_frequency
-        current_time = 0
-        while current_time < duration:
-            current_time += blink_interval + np.random.normal(0, blink_interval * 0.3)
-            if current_time < duration:
-                random_blinks.append(current_time)
+        shift_phase = (time_points / shift_interval) % 1.0
+        shift_amount = np.where(shift_phase < 0.1, np.sin(shift_phase * 10 * np.pi) * 0.01, 0.0)  # Quick shift
+        weight_shift = Track.transform(
+            time_points,
+            position=np.column_stack([zeros, zeros, shift_amount])
+        )
+        
+        # Blink timings (shared with the facial eye track when generated together)
+        if blink_times is None:
+            blink_times = self._schedule_blinks(duration, rng)
         
         return MicroMovements(
             breathing=breathing,
             idle_sway=idle_sway,
             weight_shift=weight_shift,
-            random_blinks=random_blinks
+            random_blinks=blink_times
         )
     
-    async def _generate_secondary_motion(
+    def _generate_secondary_motion(
         self, 
         body_motion: BodyMotion, 
         character_state: Dict
     ) -> SecondaryMotion:
-        """Generate physics-based secondary motion for hair and clothing"""
-        
-        # Hair physics simulation
-        hair_physics = await self._simulate_hair_motion(body_motion, character_state)
-        
-        # Clothing physics simulation  
-        clothing_physics = await self._simulate_clothing_motion(body_motion, character_state)
-        
-        # Accessories motion
-        accessories = {}  # Placeholder for accessories
+        """Bake spring-chain secondary motion for hair and clothing from the body tracks"""
+        drivers = {name: track for name, track in vars(body_motion).items() if isinstance(track, Track)}
+        duration = max((float(track.times[-1]) for track in drivers.values() if len(track)), default=0.0)
+        baked = self.secondary_baker.bake(drivers, duration)
         
         return SecondaryMotion(
-            hair_physics=hair_physics,
-            clothing_physics=clothing_physics,
-            accessories=accessories
+            hair_physics=baked.get('hair_physics', {}),
+            clothing_physics=baked.get('clothing_physics', {}),
+            accessories=baked.get('accessories', {})
         )
     
-    async def _simulate_hair_motion(
-        self, 
-        body_motion: BodyMotion, 
-        character_state: Dict
-    ) -> Dict[str, List[AnimationKeyframe]]:
-        """Simulate hair motion based on head movement"""
-        
-        hair_motion = {'hair_main': []}
-        
-        # Simple hair physics based on head motion
-        for head_keyframe in body_motion.head:
-            # Hair follows head movement with delay and damping
-            hair_offset = head_keyframe.rotation * 0.3  # Hair moves 30% of head rotation
-            
-            hair_motion['hair_main'].append(AnimationKeyframe(
-                time=head_keyframe.time,
-                position=np.array([0.0, 0.0, 0.0]),
-                rotation=hair_offset
-            ))
-        
-        return hair_motion
-    
-    async def _simulate_clothing_motion(
-        self, 
-        body_motion: BodyMotion, 
-        character_state: Dict
-    ) -> Dict[str, List[AnimationKeyframe]]:
-        """Simulate clothing motion based on body movement"""
-        
-        clothing_motion = {'skirt': [], 'sleeves': []}
-        
-        # Simple clothing physics
-        for spine_keyframe in body_motion.spine:
-            # Clothing follows body movement
-            clothing_offset = spine_keyframe.position * 0.5
-            
-            clothing_motion['skirt'].append(AnimationKeyframe(
-                time=spine_keyframe.time,
-                position=clothing_offset,
-                rotation=np.array([0.0, 0.0, 0.0])
-            ))
-        
-        return clothing_motion
-    
     def _calculate_duration(self, text: str) -> float:
         """Calculate appropriate animation duration for text"""
         # Simple duration calculation based on text length
@@ -885,41 +902,35 @@ class MotionGenerator:
         time_points = np.linspace(0, duration, max(2, int(duration * 4)))
         
         # Simple breathing motion
-        simple_keyframes = []
-        for t in time_points:
-            breathing_phase = t * (self.breathing_rate / 60) * 2 * np.pi
-            position = np.array([0.0, np.sin(breathing_phase) * 0.005, 0.0])
-            
-            simple_keyframes.append(AnimationKeyframe(
-                time=t,
-                position=position,
-                rotation=np.array([0.0, 0.0, 0.0])
-            ))
+        breathing_phase = time_points * (self.breathing_rate / 60) * 2 * np.pi
+        position = np.zeros((len(time_points), 3))
+        position[:, 1] = np.sin(breathing_phase) * 0.005
+        simple_track = Track.transform(time_points, position=position)
         
-        # Create minimal animation sequence
+        # Create minimal animation sequence (tracks are shared, never mutated)
         body_motion = BodyMotion(
-            head=simple_keyframes.copy(),
-            neck=simple_keyframes.copy(),
-            spine=simple_keyframes.copy(),
-            left_arm=simple_keyframes.copy(),
-            right_arm=simple_keyframes.copy(),
-            left_hand=simple_keyframes.copy(),
-            right_hand=simple_keyframes.copy()
+            head=simple_track,
+            neck=simple_track,
+            spine=simple_track,
+            left_arm=simple_track,
+            right_arm=simple_track,
+            left_hand=simple_track,
+            right_hand=simple_track
         )
         
         facial_animation = FacialAnimation(
-            eye_blink=[],
-            eye_movement=[],
-            mouth_shape=[],
-            eyebrow_movement=[],
-            emotion_blend=[]
+            eye_blink=Track.empty(1),
+            eye_movement=Track.empty(2),
+            mouth_shape=Track.empty(1),
+            eyebrow_movement=Track.empty(1),
+            emotion_blend=Track.empty(1)
         )
         
         micro_movements = MicroMovements(
-            breathing=simple_keyframes.copy(),
-            idle_sway=[],
-            weight_shift=[],
-            random_blinks=[]
+            breathing=simple_track,
+            idle_sway=Track.empty(),
+            weight_shift=Track.empty(),
+            random_blinks=np.zeros(0)
         )
         
         secondary_motion = SecondaryMotion(
@@ -936,47 +947,97 @@ class MotionGenerator:
             duration=duration
         )
     
-    async def generate_idle_animation(self, character_state: Dict, loop_duration: float = 10.0) -> AnimationLoop:
+    async def generate_idle_animation(
+        self,
+        character_state: Dict,
+        loop_duration: float = 10.0,
+        seed: Optional[int] = None
+    ) -> AnimationLoop:
         """Generate natural idle movements for when character is not actively speaking"""
         
         logger.info(f"Generating idle animation loop: {loop_duration}s")
         
-        # Create multiple idle sequences for variety
-        sequences = []
-        
-        # Basic breathing and micro-movements
-        basic_sequence = await self.generate_animation_sequence(
-            text="",
-            emotion=EmotionType.NEUTRAL,
-            character_state=character_state,
-            duration=loop_duration / 3
-        )
-        sequences.append(basic_sequence)
-        
-        # Subtle look around
-        look_sequence = await self.generate_animation_sequence(
-            text="",
-            emotion=EmotionType.THINKING,
-            character_state=character_state,
-            duration=loop_duration / 3
-        )
-        sequences.append(look_sequence)
-        
-        # Return to neutral
-        neutral_sequence = await self.generate_animation_sequence(
-            text="",
-            emotion=EmotionType.NEUTRAL,
-            character_state=character_state,
-            duration=loop_duration / 3
-        )
-        sequences.append(neutral_sequence)
+        # Basic breathing and micro-movements, a subtle look around, then back to neutral
+        variants = [EmotionType.NEUTRAL, EmotionType.THINKING, EmotionType.NEUTRAL]
+        segment_duration = loop_duration / len(variants)
+        
+        # Each variant gets its own generator - the shared one is not thread-safe
+        seeds = np.random.SeedSequence(seed).spawn(len(variants)) if seed is not None else \
+            self.rng.integers(0, 2**32, len(variants))
+        
+        # Generate the variants in parallel off the event loop
+        loop = asyncio.get_running_loop()
+        sequences = await asyncio.gather(*[
+            loop.run_in_executor(
+                self.executor,
+                self._build_animation_sequence,
+                "", emotion, character_state, segment_duration, np.random.default_rng(variant_seed)
+            )
+            for emotion, variant_seed in zip(variants, seeds)
+        ])
         
         return AnimationLoop(
-            sequences=sequences,
+            sequences=self._stitch_loop(list(sequences), self.idle_crossfade_time),
             loop_duration=loop_duration,
             seamless=True
         )
     
+    def _stitch_loop(self, sequences: List[AnimationSequence], crossfade_time: float) -> List[AnimationSequence]:
+        """Crossfade the end of every sequence into the start of the next, wrapping last -> first"""
+        stitched = []
+        
+        for index, sequence in enumerate(sequences):
+            following = dict(sequences[(index + 1) % len(sequences)].iter_tracks())
+            fade = min(crossfade_time, sequence.duration * 0.5)
+            
+            def crossfade(name, track, following=following, fade=fade, duration=sequence.duration):
+                target = following.get(name)
+                if target is None or len(track) == 0 or len(target) == 0 or fade <= 0:
+                    return track
+                
+                # Smoothstep from this track's own values to the next sequence's first pose
+                phase = np.clip((track.times - (duration - fade)) / fade, 0.0, 1.0)
+                weight = (phase * phase * (3.0 - 2.0 * phase))[:, np.newaxis]
+                values = track.values * (1.0 - weight) + target.values[0] * weight
+                return Track(track.times, values)
+            
+            stitched.append(sequence.map_tracks(crossfade))
+        
+        return stitched
+    
+    async def prime_idle_pool(self, character_state: Dict, loop_duration: float = 10.0):
+        """Fill the idle pool so later switches to idle never wait on generation"""
+        while len(self._idle_pool) < self.idle_pool_size:
+            idle_loop = await self.generate_idle_animation(character_state, loop_duration)
+            self._idle_pool.append(idle_loop)
+            self._last_idle_loop = idle_loop
+    
+    def get_idle_animation(self, character_state: Dict, loop_duration: float = 10.0) -> Optional[AnimationLoop]:
+        """
+        Take a pre-generated idle loop without waiting
+        
+        Consumed variants are replaced in the background (when called from a running
+        event loop). Returns the most recent loop again if the pool is momentarily
+        empty, or None if it was never primed.
+        """
+        idle_loop = self._idle_pool.popleft() if self._idle_pool else self._last_idle_loop
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        if loop is not None and (self._idle_refill_task is None or self._idle_refill_task.done()):
+            self._idle_refill_task = loop.create_task(self.prime_idle_pool(character_state, loop_duration))
+        
+        return idle_loop
+    
+    def shutdown(self):
+        """Stop background generation workers"""
+        if self._idle_refill_task is not None:
+            self._idle_refill_task.cancel()
+        self.executor.shutdown(wait=False)
+    
     def generate_emotion_animation(self, emotion: str, intensity: float = 1.0) -> Dict:
         """
         Generate emotion-based animation data
@@ -991,6 +1052,11 @@ class MotionGenerator:
         try:
             logger.info(f"Generating emotion animation: {emotion} (intensity: {intensity})")
             
+            cache_key = make_key('emotion', emotion=emotion, intensity=intensity)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
             # Convert string to EmotionType
             emotion_type = EmotionType.NEUTRAL
             try:
@@ -1024,6 +1090,7 @@ class MotionGenerator:
             }
             
             logger.info(f"Generated emotion animation data for {emotion}")
+            self.cache.put(cache_key, animation_data)
             return animation_data
             
         except Exception as e:
@@ -1044,6 +1111,11 @@ class MotionGenerator:
         try:
             logger.info(f"Generating gesture animation: {gesture} (duration: {duration}s)")
             
+            cache_key = make_key('gesture', text=gesture, duration=duration)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
             # Convert string to GestureType
             gesture_type = GestureType.NONE
             try:
@@ -1065,6 +1137,7 @@ class MotionGenerator:
             }
             
             logger.info(f"Generated gesture animation data for {gesture}")
+            self.cache.put(cache_key, animation_data)
             return animation_data
             
         except Exception as e:
@@ -1085,6 +1158,12 @@ class MotionGenerator:
         try:
             logger.info(f"Generating conversation animation for message: '{message[:50]}...'")
             
+            # The result embeds the text (message, response, lip sync), so only identical text may share it
+            cache_key = make_key('conversation', text=(message, response), exact_text=True)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
             # Analyze conversation context
             emotion = self._analyze_conversation_emotion(message, response)
             gestures = self._analyze_gesture_context(response)
@@ -1109,12 +1188,29 @@ class MotionGenerator:
             }
             
             logger.info(f"Generated conversation animation for {len(response.split())} words")
+            self.cache.put(cache_key, animation_data)
             return animation_data
             
         except Exception as e:
             logger.error(f"Error generating conversation animation: {e}")
             return self._get_fallback_conversation_data(message, response)
     
+    def get_cache_stats(self) -> Dict[str, float]:
+        """Get generation cache effectiveness"""
+        stats = self.cache.stats
+        return {
+            'hits': stats.hits,
+            'misses': stats.misses,
+            'hit_rate': stats.hit_rate,
+            'evictions': stats.evictions,
+            'entries': stats.entries,
+            'bytes': stats.bytes
+        }
+    
+    def save_cache(self, path: Optional[str] = None):
+        """Persist cached generations so the next run starts warm"""
+        self.cache.save(path)
+    
     def _generate_emotion_keyframes(self, emotion_type: EmotionType, intensity: float) -> List[Dict]:
         """Generate keyframes for emotion transitions"""
         keyframes = []
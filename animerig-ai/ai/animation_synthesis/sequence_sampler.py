@@ -0,0 +1,231 @@
+"""
+Random-access sampling of generated animation tracks
+Evaluates every channel of an AnimationSequence at arbitrary times into a flat pose buffer
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INTERPOLATION_MODES = ('linear', 'cubic', 'step')
+
+# Floor for key spacing so repeated key times cannot divide by zero
+_MIN_KEY_SPAN = 1e-9
+
+
+@dataclass
+class _TrackGroup:
+    """Tracks sharing one time array, stacked into a single (N, D) block"""
+    times: np.ndarray
+    values: np.ndarray
+    tangents: Optional[np.ndarray]
+    mode: str
+    pose_slice: slice
+
+
+class SequenceSampler:
+    """
+    Evaluates animation tracks at arbitrary times
+
+    Tracks that share a time array are stacked column-wise, so one binary search
+    and one vectorized interpolation cover all of their channels. Results are
+    written into a preallocated flat pose buffer; layout maps each track name to
+    its slice of that buffer.
+
+    Modes: 'linear', 'cubic' (Catmull-Rom style Hermite) and 'step'.
+    """
+
+    def __init__(self, tracks, mode: str = 'linear', track_modes: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            tracks: AnimationSequence (anything with iter_tracks()) or a mapping of name -> Track
+            mode: Default interpolation mode
+            track_modes: Optional per-track mode overrides
+        """
+        if mode not in INTERPOLATION_MODES:
+            raise ValueError(f"Unknown interpolation mode: {mode}")
+
+        named_tracks = list(tracks.iter_tracks()) if hasattr(tracks, 'iter_tracks') else list(tracks.items())
+        track_modes = track_modes or {}
+
+        self.layout: Dict[str, slice] = {}
+        self.groups: List[_TrackGroup] = []
+        self.duration = float(getattr(tracks, 'duration', 0.0))
+
+        self._build_groups(named_tracks, mode, track_modes)
+
+        self.pose_size = sum(group.values.shape[1] for group in self.groups) + self._empty_columns
+        self.pose = np.zeros(self.pose_size, dtype=np.float32)
+
+        # Per-group scratch rows so single-time evaluation allocates no buffers
+        self._scratch = [np.zeros((4, group.values.shape[1]), dtype=np.float32) for group in self.groups]
+
+    def _build_groups(self, named_tracks: List[Tuple[str, object]], default_mode: str,
+                      track_modes: Dict[str, str]):
+        """Bucket tracks by (time array, mode) and assign pose buffer slices"""
+        buckets: List[Tuple[np.ndarray, str, List[Tuple[str, object]]]] = []
+        empty_tracks = []
+
+        for name, track in named_tracks:
+            if len(track) == 0:
+                empty_tracks.append((name, track))
+                continue
+
+            mode = track_modes.get(name, default_mode)
+            if mode not in INTERPOLATION_MODES:
+                raise ValueError(f"Unknown interpolation mode for {name}: {mode}")
+
+            for times, bucket_mode, members in buckets:
+                if bucket_mode == mode and (times is track.times or np.array_equal(times, track.times)):
+                    members.append((name, track))
+                    break
+            else:
+                buckets.append((track.times, mode, [(name, track)]))
+
+        offset = 0
+        for times, mode, members in buckets:
+            values = np.ascontiguousarray(np.hstack([track.values for _, track in members]), dtype=np.float32)
+            start = offset
+            for name, track in members:
+                self.layout[name] = slice(offset, offset + track.dimensions)
+                offset += track.dimensions
+
+            self.groups.append(_TrackGroup(
+                times=np.ascontiguousarray(times, dtype=np.float64),
+                values=values,
+                tangents=self._compute_tangents(times, values) if mode == 'cubic' else None,
+                mode=mode,
+                pose_slice=slice(start, offset)
+            ))
+            self.duration = max(self.duration, float(times[-1]))
+
+        # Empty tracks still get a (zero) slot so consumers can rely on the layout
+        self._empty_columns = 0
+        for name, track in empty_tracks:
+            self.layout[name] = slice(offset, offset + track.dimensions)
+            offset += track.dimensions
+            self._empty_columns += track.dimensions
+
+    @staticmethod
+    def _compute_tangents(times: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Finite-difference tangents (per unit time) for Hermite interpolation"""
+        tangents = np.zeros_like(values)
+        if len(times) < 2:
+            return tangents
+
+        # Central differences inside, one-sided at the ends
+        tangents[1:-1] = (values[2:] - values[:-2]) / np.maximum(times[2:] - times[:-2], _MIN_KEY_SPAN)[:, np.newaxis]
+        tangents[0] = (values[1] - values[0]) / max(times[1] - times[0], _MIN_KEY_SPAN)
+        tangents[-1] = (values[-1] - values[-2]) / max(times[-1] - times[-2], _MIN_KEY_SPAN)
+        return tangents
+
+    def evaluate(self, t: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Evaluate every channel at time t
+
+        Writes into out (or the sampler's own pose buffer) and returns it.
+        Times outside a track's range clamp to its first/last key.
+        """
+        pose = self.pose if out is None else out
+
+        for group, scratch in zip(self.groups, self._scratch):
+            target = pose[group.pose_slice]
+            times = group.times
+            last = len(times) - 1
+
+            if last == 0 or t <= times[0]:
+                target[:] = group.values[0]
+                continue
+            if t >= times[last]:
+                target[:] = group.values[last]
+                continue
+
+            i = int(np.searchsorted(times, t, side='right')) - 1
+
+            if group.mode == 'step':
+                target[:] = group.values[i]
+                continue
+
+            span = max(times[i + 1] - times[i], _MIN_KEY_SPAN)
+            s = (t - times[i]) / span
+            v0 = group.values[i]
+            v1 = group.values[i + 1]
+
+            if group.mode == 'linear':
+                np.subtract(v1, v0, out=scratch[0])
+                np.multiply(scratch[0], s, out=scratch[0])
+                np.add(v0, scratch[0], out=target)
+            else:
+                s2 = s * s
+                s3 = s2 * s
+                h00 = 2 * s3 - 3 * s2 + 1
+                h10 = (s3 - 2 * s2 + s) * span
+                h01 = -2 * s3 + 3 * s2
+                h11 = (s3 - s2) * span
+                np.multiply(v0, h00, out=scratch[0])
+                np.multiply(group.tangents[i], h10, out=scratch[1])
+                np.multiply(v1, h01, out=scratch[2])
+                np.multiply(group.tangents[i + 1], h11, out=scratch[3])
+                np.add(scratch[0], scratch[1], out=scratch[0])
+                np.add(scratch[0], scratch[2], out=scratch[0])
+                np.add(scratch[0], scratch[3], out=target)
+
+        return pose
+
+    def evaluate_many(self, ts: Union[np.ndarray, List[float]], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Evaluate every channel at many times at once
+
+        Returns an (M, pose_size) array (written into out if given).
+        """
+        ts = np.asarray(ts, dtype=np.float64)
+        if out is None:
+            out = np.zeros((len(ts), self.pose_size), dtype=np.float32)
+
+        for group in self.groups:
+            target = out[:, group.pose_slice]
+            times = group.times
+            values = group.values
+
+            if len(times) == 1:
+                target[:] = values[0]
+                continue
+
+            clamped = np.clip(ts, times[0], times[-1])
+            i = np.clip(np.searchsorted(times, clamped, side='right') - 1, 0, len(times) - 2)
+
+            if group.mode == 'step':
+                # Exactly at (or past) the final key, hold the final value
+                i_step = np.where(clamped >= times[-1], len(times) - 1, i)
+                target[:] = values[i_step]
+                continue
+
+            span = np.maximum(times[i + 1] - times[i], _MIN_KEY_SPAN)
+            # At the final key s is 1 even when the last two keys share a time
+            s = np.where(clamped >= times[-1], 1.0, (clamped - times[i]) / span)[:, np.newaxis]
+
+            if group.mode == 'linear':
+                target[:] = values[i] + (values[i + 1] - values[i]) * s
+            else:
+                s2 = s * s
+                s3 = s2 * s
+                span = span[:, np.newaxis]
+                target[:] = ((2 * s3 - 3 * s2 + 1) * values[i]
+                             + (s3 - 2 * s2 + s) * span * group.tangents[i]
+                             + (-2 * s3 + 3 * s2) * values[i + 1]
+                             + (s3 - s2) * span * group.tangents[i + 1])
+
+        return out
+
+    def channel(self, pose: np.ndarray, name: str) -> np.ndarray:
+        """View of a single track's values inside a pose (or batch of poses)"""
+        return pose[..., self.layout[name]]
+
+    def sample_frames(self, fps: float) -> np.ndarray:
+        """Evaluate the whole sequence at a fixed frame rate"""
+        frame_count = max(1, int(round(self.duration * fps)) + 1)
+        return self.evaluate_many(np.arange(frame_count) / fps)
@@ -0,0 +1,176 @@
+"""
+Error-bounded compression of animation tracks
+Douglas-Peucker keyframe reduction plus a compact quantized binary encoding for export, caching and IPC
+"""
+
+import logging
+import struct
+from typing import Dict, Iterable, Tuple, Union
+
+import numpy as np
+
+from .tracks import Track
+
+logger = logging.getLogger(__name__)
+
+TRACKS_MAGIC = b'ATRK'
+TRACKS_FORMAT_VERSION = 1
+
+# Value storage codes: quantized unsigned integers, or raw float32 for lossless tracks
+_VALUE_DTYPES = {0: np.dtype('<u1'), 1: np.dtype('<u2'), 2: np.dtype('<f4')}
+
+_FILE_HEADER = struct.Struct('<4sBxHI')     # magic, version, reserved, reserved, track count
+_TRACK_HEADER = struct.Struct('<HBxHI')     # name length, value code, reserved, dimensions, key count
+
+
+def reduce_keyframes(times: np.ndarray, values: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Indices of the keys to keep so linear interpolation stays within tolerance
+
+    Douglas-Peucker over the whole (N, D) block: a segment is split at the key
+    whose worst channel deviates most from the straight line between the
+    segment ends, until every dropped key is within tolerance on every channel.
+    The first and last keys are always kept.
+    """
+    count = len(times)
+    if count <= 2 or values.shape[1] == 0:
+        return np.arange(count)
+
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    values = values.astype(np.float64, copy=False)
+
+    stack = [(0, count - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        s = (times[start + 1:end] - times[start]) / (times[end] - times[start])
+        line = values[start] + (values[end] - values[start]) * s[:, np.newaxis]
+        error = np.abs(values[start + 1:end] - line).max(axis=1)
+
+        worst = int(np.argmax(error))
+        if error[worst] > tolerance:
+            split = start + 1 + worst
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    return np.flatnonzero(keep)
+
+
+def reduce_track(track: Track, tolerance: float) -> Track:
+    """Track with redundant keys removed; linear playback stays within tolerance of the original"""
+    if len(track) <= 2:
+        return track
+
+    indices = reduce_keyframes(track.times, track.values, tolerance)
+    if len(indices) == len(track):
+        return track
+    return Track(track.times[indices], track.values[indices])
+
+
+def compress_sequence(sequence, tolerance: float):
+    """Apply reduce_track to every track of an AnimationSequence (anything with map_tracks())"""
+    compressed = sequence.map_tracks(lambda name, track: reduce_track(track, tolerance))
+    logger.debug(f"Compressed sequence {sequence.nbytes} -> {compressed.nbytes} bytes")
+    return compressed
+
+
+def _quantize(values: np.ndarray, step: float) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+    """Per-channel offset/step quantization; rounding error is at most step / 2"""
+    dimensions = values.shape[1]
+    if step <= 0 or len(values) == 0:
+        return 2, np.zeros(dimensions, np.float32), np.zeros(dimensions, np.float32), values.astype('<f4')
+
+    lows = values.min(axis=0).astype(np.float32)
+    levels = int(np.ceil(((values.max(axis=0) - lows) / step).max())) + 1 if dimensions else 1
+    if levels > 65536:
+        # Range too wide for 16 bits at this precision - store the channel data losslessly
+        return 2, np.zeros(dimensions, np.float32), np.zeros(dimensions, np.float32), values.astype('<f4')
+
+    code = 0 if levels <= 256 else 1
+    steps = np.full(dimensions, step, dtype=np.float32)
+    quantized = np.rint((values - lows) / steps).astype(_VALUE_DTYPES[code])
+    return code, lows, steps, quantized
+
+
+def encode_tracks(tracks: Union[Dict[str, Track], Iterable[Tuple[str, Track]]],
+                  tolerance: float = 1e-3) -> bytes:
+    """
+    Serialize named tracks into a compact little-endian blob
+
+    Half of the tolerance goes to keyframe reduction and half to value
+    quantization, so every channel decodes to within tolerance of the original
+    at the original key times. tolerance=0 stores every key losslessly as float32.
+    """
+    named_tracks = list(tracks.items()) if isinstance(tracks, dict) else list(tracks)
+    parts = [_FILE_HEADER.pack(TRACKS_MAGIC, TRACKS_FORMAT_VERSION, 0, len(named_tracks))]
+
+    for name, track in named_tracks:
+        if tolerance > 0:
+            track = reduce_track(track, tolerance / 2)
+        code, lows, steps, quantized = _quantize(track.values, tolerance)
+
+        encoded_name = name.encode('utf-8')
+        parts.append(_TRACK_HEADER.pack(len(encoded_name), code, track.dimensions, len(track)))
+        parts.append(encoded_name)
+        parts.append(track.times.astype('<f4').tobytes())
+        parts.append(lows.astype('<f4').tobytes())
+        parts.append(steps.astype('<f4').tobytes())
+        parts.append(np.ascontiguousarray(quantized).tobytes())
+
+    return b''.join(parts)
+
+
+def decode_tracks(data: bytes) -> Dict[str, Track]:
+    """Inverse of encode_tracks; the result can be fed straight to SequenceSampler"""
+    view = memoryview(data)
+    magic, version, _, count = _FILE_HEADER.unpack_from(view, 0)
+    if magic != TRACKS_MAGIC:
+        raise ValueError("Not an encoded track blob")
+    if version != TRACKS_FORMAT_VERSION:
+        raise ValueError(f"Unsupported track blob version: {version}")
+
+    offset = _FILE_HEADER.size
+    tracks: Dict[str, Track] = {}
+
+    for _ in range(count):
+        name_length, code, dimensions, keys = _TRACK_HEADER.unpack_from(view, offset)
+        offset += _TRACK_HEADER.size
+        name = bytes(view[offset:offset + name_length]).decode('utf-8')
+        offset += name_length
+
+        times = np.frombuffer(view, dtype='<f4', count=keys, offset=offset).astype(np.float64)
+        offset += keys * 4
+        lows = np.frombuffer(view, dtype='<f4', count=dimensions, offset=offset)
+        offset += dimensions * 4
+        steps = np.frombuffer(view, dtype='<f4', count=dimensions, offset=offset)
+        offset += dimensions * 4
+
+        value_dtype = _VALUE_DTYPES[code]
+        raw = np.frombuffer(view, dtype=value_dtype, count=keys * dimensions, offset=offset).reshape(keys, dimensions)
+        offset += raw.nbytes
+
+        if code == 2:
+            values = raw.astype(np.float32)
+        else:
+            values = (lows + raw * steps).astype(np.float32)
+        tracks[name] = Track(times, values)
+
+    return tracks
+
+
+def max_reconstruction_error(original: Track, decoded: Track) -> float:
+    """Largest absolute deviation of decoded (linearly interpolated) from original at its key times"""
+    if len(original) == 0:
+        return 0.0
+    if len(decoded) == 1:
+        resampled = np.broadcast_to(decoded.values[0], original.values.shape)
+    else:
+        resampled = np.column_stack([
+            np.interp(original.times, decoded.times, decoded.values[:, column])
+            for column in range(decoded.dimensions)
+        ]) if decoded.dimensions else original.values
+    return float(np.abs(resampled - original.values).max()) if original.values.size else 0.0
@@ -0,0 +1,79 @@
+"""
+Columnar animation track types
+Kept free of model dependencies so playback and renderer processes can use them directly
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+@dataclass
+class AnimationKeyframe:
+    time: float
+    position: np.ndarray
+    rotation: np.ndarray
+    scale: np.ndarray = None
+
+# Transform tracks store position xyz followed by rotation xyz in each row
+TRANSFORM_DIMENSIONS = 6
+
+@dataclass
+class Track:
+    """
+    Columnar animation channel
+    One contiguous (N,) times array and one (N, D) values array, a row per key
+    """
+    times: np.ndarray
+    values: np.ndarray
+
+    def __post_init__(self):
+        self.times = np.ascontiguousarray(self.times, dtype=np.float64)
+        values = np.asarray(self.values, dtype=np.float32)
+        if values.ndim == 1:
+            values = values[:, np.newaxis]
+        self.values = np.ascontiguousarray(values)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def dimensions(self) -> int:
+        return self.values.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.times.nbytes + self.values.nbytes
+
+    @classmethod
+    def empty(cls, dimensions: int = TRANSFORM_DIMENSIONS) -> 'Track':
+        return cls(np.zeros(0), np.zeros((0, dimensions)))
+
+    @classmethod
+    def transform(cls, times: np.ndarray, position: Optional[np.ndarray] = None,
+                  rotation: Optional[np.ndarray] = None) -> 'Track':
+        """Build a transform track from (N, 3) position/rotation columns (or broadcastable values)"""
+        values = np.zeros((len(times), TRANSFORM_DIMENSIONS), dtype=np.float32)
+        if position is not None:
+            values[:, :3] = position
+        if rotation is not None:
+            values[:, 3:] = rotation
+        return cls(times, values)
+
+    @property
+    def positions(self) -> np.ndarray:
+        """Position columns of a transform track"""
+        return self.values[:, :3]
+
+    @property
+    def rotations(self) -> np.ndarray:
+        """Rotation columns of a transform track"""
+        return self.values[:, 3:TRANSFORM_DIMENSIONS]
+
+    def to_keyframes(self) -> List[AnimationKeyframe]:
+        """Expand into per-key objects (for legacy consumers only)"""
+        if self.dimensions == TRANSFORM_DIMENSIONS:
+            return [AnimationKeyframe(time=float(t), position=row[:3].copy(), rotation=row[3:].copy())
+                    for t, row in zip(self.times, self.values)]
+        return [AnimationKeyframe(time=float(t), position=row.copy(), rotation=np.zeros(3))
+                for t, row in zip(self.times, self.values)]
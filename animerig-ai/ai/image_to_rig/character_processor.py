@@ -8,6 +8,9 @@ from pathlib import Path
 from PIL import Image
 import logging
 
+from ..animation.mesh_normals import vertex_normals
+from .humanoid_mesh import assign_vertex_groups, build_humanoid_mesh, spherical_uvs
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -185,21 +188,8 @@ class CharacterProcessor:
         try:
             logger.info("Processing image array for character generation...")
             
-            # Convert BGR to RGB if needed (OpenCV loads as BGR)
-            if len(image.shape) == 3 and image.shape[2] == 3:
-                rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            else:
-                rgb_image = image
-            
             # Extract features using simplified synchronous methods
-            features = {
-                'face': self._detect_face_features(rgb_image),
-                'pose': self._detect_pose(rgb_image),
-                'hands': self._detect_hands(rgb_image),
-                'hair': self._detect_hair_region(rgb_image),
-                'clothing': self._detect_clothing(rgb_image),
-                'body_proportions': self._analyze_body_proportions(rgb_image)
-            }
+            features = self.detect_features(image)
             
             # Generate 3D model from features
             model_3d = self.generate_3d_model(features)
@@ -208,21 +198,7 @@ class CharacterProcessor:
             rig = self.create_animation_rig(model_3d)
             
             # Package result for rendering
-            result = {
-                'vertices': model_3d.get('vertices', []),
-                'faces': model_3d.get('faces', []),
-                'materials': model_3d.get('materials', {}),
-                'textures': model_3d.get('textures', {}),
-                'bones': rig.get('bones', []),
-                'animations': rig.get('animations', {}),
-                'features': features,
-                'metadata': {
-                    'processing_device': self.device,
-                    'bone_count': len(rig.get('bones', [])),
-                    'vertex_count': len(model_3d.get('vertices', [])),
-                    'ready_for_rendering': True
-                }
-            }
+            result = self.package_character_data(model_3d, rig, features)
             
             logger.info(f"Image processing completed: {len(result['vertices'])} vertices, {len(result['bones'])} bones")
             return result
@@ -241,6 +217,49 @@ class CharacterProcessor:
                 'metadata': {'ready_for_rendering': False, 'error': str(e)}
             }
     
+    def detect_features(self, image: np.ndarray) -> Dict:
+        """
+        Detection stage of process_image - extract character features from a BGR image
+        
+        Args:
+            image: OpenCV image array (BGR format)
+            
+        Returns:
+            Dict of face, pose, hand, hair, clothing and proportion features
+        """
+        # Convert BGR to RGB if needed (OpenCV loads as BGR)
+        if len(image.shape) == 3 and image.shape[2] == 3:
+            rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        else:
+            rgb_image = image
+        
+        return {
+            'face': self._detect_face_features(rgb_image),
+            'pose': self._detect_pose(rgb_image),
+            'hands': self._detect_hands(rgb_image),
+            'hair': self._detect_hair_region(rgb_image),
+            'clothing': self._detect_clothing(rgb_image),
+            'body_proportions': self._analyze_body_proportions(rgb_image)
+        }
+    
+    def package_character_data(self, model_3d: Dict, rig: Dict, features: Dict) -> Dict:
+        """Package model, rig and features into the structure the renderer consumes"""
+        return {
+            'vertices': model_3d.get('vertices', []),
+            'faces': model_3d.get('faces', []),
+            'materials': model_3d.get('materials', {}),
+            'textures': model_3d.get('textures', {}),
+            'bones': rig.get('bones', []),
+            'animations': rig.get('animations', {}),
+            'features': features,
+            'metadata': {
+                'processing_device': self.device,
+                'bone_count': len(rig.get('bones', [])),
+                'vertex_count': len(model_3d.get('vertices', [])),
+                'ready_for_rendering': True
+            }
+        }
+    
     def _load_image(self, image_path: str) -> Optional[np.ndarray]:
         """Load and validate input image"""
         try:
@@ -1219,8 +1238,8 @@ class CharacterProcessor:
             }
         }
     
-    def generate_3d_model(self, features: Dict) -> Dict:
-        """Generate 3D model from extracted features"""
+    def generate_3d_model(self, features: Dict, resolution: float = 1.0) -> Dict:
+        """Generate 3D model from extracted features (resolution scales mesh density for LODs)"""
         logger.info("Generating 3D model from features...")
         
         try:
@@ -1230,7 +1249,7 @@ class CharacterProcessor:
                 features = self._get_default_character_features()
             
             # Generate basic humanoid mesh based on features
-            model_data = self._create_humanoid_mesh(features)
+            model_data = self._create_humanoid_mesh(features, resolution)
             
             # Add materials based on detected features
             materials = self._generate_materials(features)
@@ -1250,86 +1269,9 @@ class CharacterProcessor:
             # Return minimal fallback model
             return self._get_fallback_3d_model()
     
-    def _create_humanoid_mesh(self, features: Dict) -> Dict:
-        """Create basic humanoid mesh structure"""
-        # Handle None features gracefully
-        if features is None:
-            features = {}
-            
-        vertices = []
-        faces = []
-        
-        # Head vertices (simplified sphere)
-        head_center = [0.0, 1.6, 0.0]
-        head_radius = 0.12
-        for i in range(16):  # Latitude
-            for j in range(16):  # Longitude
-                lat = (i / 15.0) * np.pi - np.pi/2
-                lon = (j / 15.0) * 2 * np.pi
-                x = head_center[0] + head_radius * np.cos(lat) * np.cos(lon)
-                y = head_center[1] + head_radius * np.sin(lat)
-                z = head_center[2] + head_radius * np.cos(lat) * np.sin(lon)
-                vertices.append([x, y, z])
-        
-        # Body vertices (simplified cylinder)
-        body_segments = 8
-        body_height = 0.8
-        body_radius = 0.15
-        for i in range(body_segments + 1):
-            y = 1.4 - (i / body_segments) * body_height
-            for j in range(16):
-                angle = (j / 15.0) * 2 * np.pi
-                x = body_radius * np.cos(angle)
-                z = body_radius * np.sin(angle)
-                vertices.append([x, y, z])
-        
-        # Arm vertices
-        arm_length = 0.6
-        arm_radius = 0.04
-        for side in [-1, 1]:  # Left and right
-            shoulder_pos = [side * 0.2, 1.3, 0.0]
-            for i in range(8):  # Arm segments
-                t = i / 7.0
-                y = shoulder_pos[1] - t * arm_length
-                x = shoulder_pos[0] + side * t * 0.1  # Slight bend
-                z = shoulder_pos[2]
-                
-                for j in range(8):
-                    angle = (j / 7.0) * 2 * np.pi
-                    vx = x + arm_radius * np.cos(angle)
-                    vz = z + arm_radius * np.sin(angle)
-                    vertices.append([vx, y, vz])
-        
-        # Leg vertices
-        leg_length = 0.9
-        leg_radius = 0.06
-        for side in [-1, 1]:  # Left and right
-            hip_pos = [side * 0.1, 0.6, 0.0]
-            for i in range(10):  # Leg segments
-                t = i / 9.0
-                y = hip_pos[1] - t * leg_length
-                x = hip_pos[0]
-                z = hip_pos[2]
-                
-                for j in range(8):
-                    angle = (j / 7.0) * 2 * np.pi
-                    vx = x + leg_radius * np.cos(angle)
-                    vz = z + leg_radius * np.sin(angle)
-                    vertices.append([vx, y, vz])
-        
-        # Generate faces (simplified - would be more complex in real implementation)
-        face_count = len(vertices) // 4
-        for i in range(0, face_count - 1, 4):
-            if i + 3 < len(vertices):
-                faces.append([i, i+1, i+2])
-                faces.append([i, i+2, i+3])
-        
-        return {
-            'vertices': vertices,
-            'faces': faces,
-            'vertex_groups': self._assign_vertex_groups(vertices),
-            'topology': 'humanoid'
-        }
+    def _create_humanoid_mesh(self, features: Dict, resolution: float = 1.0) -> Dict:
+        """Create basic humanoid mesh structure (float32 vertices, int32 triangle faces)"""
+        return build_humanoid_mesh(resolution)
     
     def _generate_materials(self, features: Dict) -> Dict:
         """Generate materials based on detected features"""
@@ -1386,104 +1328,37 @@ class CharacterProcessor:
         
         return materials
     
-    def _generate_uv_coordinates(self, vertices: List) -> List:
-        """Generate UV texture coordinates"""
-        uv_coords = []
-        for vertex in vertices:
-            # Simple spherical mapping
-            x, y, z = vertex
-            u = 0.5 + np.arctan2(z, x) / (2 * np.pi)
-            v = 0.5 - np.arcsin(y) / np.pi
-            uv_coords.append([u, v])
-        return uv_coords
+    def _generate_uv_coordinates(self, vertices: np.ndarray) -> np.ndarray:
+        """Generate UV texture coordinates (spherical mapping)"""
+        return spherical_uvs(np.asarray(vertices, dtype=np.float32))
     
-    def _calculate_normals(self, vertices: List, faces: List) -> List:
+    def _calculate_normals(self, vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
         """Calculate vertex normals for lighting"""
-        normals = [[0.0, 0.0, 0.0] for _ in vertices]
-        
-        # Calculate face normals and accumulate
-        for face in faces:
-            if len(face) >= 3:
-                v1 = np.array(vertices[face[0]])
-                v2 = np.array(vertices[face[1]])
-                v3 = np.array(vertices[face[2]])
-                
-                # Calculate face normal
-                normal = np.cross(v2 - v1, v3 - v1)
-                normal_length = np.linalg.norm(normal)
-                if normal_length > 0:
-                    normal = normal / normal_length
-                    
-                    # Add to vertex normals
-                    for vertex_idx in face:
-                        for i in range(3):
-                            normals[vertex_idx][i] += normal[i]
-        
-        # Normalize vertex normals
-        for i, normal in enumerate(normals):
-            length = np.linalg.norm(normal)
-            if length > 0:
-                normals[i] = (np.array(normal) / length).tolist()
-            else:
-                normals[i] = [0.0, 1.0, 0.0]  # Default up normal
-        
-        return normals
+        return vertex_normals(vertices, faces)
     
-    def _assign_vertex_groups(self, vertices: List) -> Dict:
+    def _assign_vertex_groups(self, vertices: np.ndarray) -> Dict:
         """Assign vertices to body parts for rigging"""
-        vertex_groups = {
-            'head': [],
-            'neck': [],
-            'torso': [],
-            'left_arm': [],
-            'right_arm': [],
-            'left_leg': [],
-            'right_leg': []
-        }
-        
-        for i, vertex in enumerate(vertices):
-            x, y, z = vertex
-            
-            # Simple assignment based on position
-            if y > 1.45:  # Head
-                vertex_groups['head'].append(i)
-            elif y > 1.35:  # Neck
-                vertex_groups['neck'].append(i)
-            elif y > 0.6:  # Torso and arms
-                if abs(x) > 0.18:  # Arms
-                    if x < 0:
-                        vertex_groups['left_arm'].append(i)
-                    else:
-                        vertex_groups['right_arm'].append(i)
-                else:  # Torso
-                    vertex_groups['torso'].append(i)
-            else:  # Legs
-                if x < 0:
-                    vertex_groups['left_leg'].append(i)
-                else:
-                    vertex_groups['right_leg'].append(i)
-        
-        return vertex_groups
+        return assign_vertex_groups(np.asarray(vertices, dtype=np.float32))
     
     def _get_fallback_3d_model(self) -> Dict:
         """Get minimal fallback 3D model"""
         return {
-            'vertices': [
+            'vertices': np.array([
                 [-0.3, -0.5, 0], [0.3, -0.5, 0], [0.3, 0.5, 0], [-0.3, 0.5, 0],  # Front face
                 [-0.3, -0.5, -0.1], [0.3, -0.5, -0.1], [0.3, 0.5, -0.1], [-0.3, 0.5, -0.1]  # Back face
-            ],
-            'faces': [
+            ], dtype=np.float32),
+            'faces': np.array([
                 [0, 1, 2], [0, 2, 3],  # Front
                 [4, 7, 6], [4, 6, 5],  # Back
                 [0, 4, 5], [0, 5, 1],  # Bottom
                 [2, 6, 7], [2, 7, 3],  # Top
                 [0, 3, 7], [0, 7, 4],  # Left
                 [1, 5, 6], [1, 6, 2]   # Right
-            ],
-            'normals': [[0, 0, 1]] * 8,
-            'uv_coordinates': [[0, 0], [1, 0], [1, 1], [0, 1]] * 2,
+            ], dtype=np.int32),
+            'normals': np.tile(np.array([0, 0, 1], dtype=np.float32), (8, 1)),
+            'uv_coordinates': np.tile(np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=np.float32), (2, 1)),
             'materials': {'default': {'diffuse': [0.8, 0.6, 0.4], 'roughness': 0.5}},
-            'vertex_groups': {'body': list(range(8))},
+            'vertex_groups': {'body': np.arange(8, dtype=np.int32)},
             'metadata': {'quality': 'fallback', 'type': 'box'}
         }
     
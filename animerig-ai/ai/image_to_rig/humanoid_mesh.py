@@ -0,0 +1,157 @@
+"""
+Procedural humanoid mesh construction
+Head sphere and body/limb tubes built with broadcast NumPy, ring-to-ring quads split into outward-facing triangles
+"""
+
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Part name -> (rings, segments around) at resolution 1.0
+BASE_RESOLUTION = {
+    'head': (16, 16),
+    'body': (9, 16),
+    'arm': (8, 8),
+    'leg': (10, 8)
+}
+
+VERTEX_GROUPS = ('head', 'neck', 'torso', 'left_arm', 'right_arm', 'left_leg', 'right_leg')
+
+
+def _scaled(count: int, resolution: float, minimum: int) -> int:
+    return max(minimum, int(round(count * resolution)))
+
+
+def ring_faces(rings: int, segments: int, offset: int = 0) -> np.ndarray:
+    """
+    Triangles joining consecutive rings of a tube (rings x segments vertices, ring-major)
+
+    Each quad (r, s) -> (r + 1, s + 1) becomes two triangles; the seam wraps
+    around with a modulo instead of duplicating vertices.
+    """
+    r = np.arange(rings - 1)[:, np.newaxis]
+    s = np.arange(segments)[np.newaxis, :]
+    a = r * segments + s
+    b = r * segments + (s + 1) % segments
+    c = a + segments
+    d = b + segments
+    quads = np.stack([a, b, c, d], axis=-1).reshape(-1, 4)
+    faces = np.concatenate([quads[:, [0, 1, 2]], quads[:, [1, 3, 2]]])
+    return (faces + offset).astype(np.int32)
+
+
+def cap_faces(ring_start: int, segments: int, center: int, reverse: bool = False) -> np.ndarray:
+    """Triangle fan closing one ring against a single center vertex"""
+    s = np.arange(segments)
+    faces = np.column_stack([np.full(segments, center), ring_start + (s + 1) % segments, ring_start + s])
+    return (faces[:, [0, 2, 1]] if reverse else faces).astype(np.int32)
+
+
+def sphere_mesh(center: np.ndarray, radius: float, rings: int, segments: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Latitude/longitude sphere: rings - 2 interior rings plus one vertex per pole"""
+    latitude = np.linspace(-np.pi / 2, np.pi / 2, rings)[1:-1, np.newaxis]
+    longitude = np.arange(segments) * (2 * np.pi / segments)
+    # Rings from the top down so the tube winding rule applies unchanged
+    latitude = latitude[::-1]
+
+    ring_vertices = np.stack([
+        np.cos(latitude) * np.cos(longitude),
+        np.broadcast_to(np.sin(latitude), (rings - 2, segments)),
+        np.cos(latitude) * np.sin(longitude)
+    ], axis=-1).reshape(-1, 3)
+    vertices = np.vstack([ring_vertices, [[0.0, 1.0, 0.0]], [[0.0, -1.0, 0.0]]]) * radius + center
+
+    top = len(ring_vertices)
+    bottom = top + 1
+    faces = np.vstack([
+        ring_faces(rings - 2, segments),
+        cap_faces(0, segments, top),
+        cap_faces((rings - 3) * segments, segments, bottom, reverse=True)
+    ])
+    return vertices, faces
+
+
+def tube_mesh(path: np.ndarray, radius: float, segments: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Open tube of horizontal rings around a (rings, 3) path that runs top to bottom"""
+    angle = np.arange(segments) * (2 * np.pi / segments)
+    circle = radius * np.column_stack([np.cos(angle), np.zeros(segments), np.sin(angle)])
+    vertices = (path[:, np.newaxis, :] + circle[np.newaxis, :, :]).reshape(-1, 3)
+    return vertices, ring_faces(len(path), segments)
+
+
+def assign_vertex_groups(vertices: np.ndarray) -> Dict[str, np.ndarray]:
+    """Body part index arrays from vertex heights and sides"""
+    x = vertices[:, 0]
+    y = vertices[:, 1]
+    labels = np.select(
+        [y > 1.45, y > 1.35, (y > 0.6) & (np.abs(x) <= 0.18), (y > 0.6) & (x < 0), y > 0.6, x < 0],
+        [0, 1, 2, 3, 4, 5],
+        default=6
+    )
+    return {name: np.flatnonzero(labels == i).astype(np.int32) for i, name in enumerate(VERTEX_GROUPS)}
+
+
+def spherical_uvs(vertices: np.ndarray) -> np.ndarray:
+    """Spherical projection around the mesh's bounding-box center"""
+    center = (vertices.min(axis=0) + vertices.max(axis=0)) / 2
+    direction = vertices - center
+    direction /= np.maximum(np.linalg.norm(direction, axis=1, keepdims=True), 1e-9)
+
+    u = 0.5 + np.arctan2(direction[:, 2], direction[:, 0]) / (2 * np.pi)
+    v = 0.5 - np.arcsin(np.clip(direction[:, 1], -1.0, 1.0)) / np.pi
+    return np.column_stack([u, v]).astype(np.float32)
+
+
+def build_humanoid_mesh(resolution: float = 1.0) -> Dict[str, object]:
+    """
+    Head, body, arms and legs as one indexed triangle mesh
+
+    resolution scales ring and segment counts (0.5 gives a quarter of the
+    vertices for a low LOD). Returns float32 (V, 3) vertices, int32 (F, 3)
+    faces, per-part vertex groups and the (start, stop) vertex range of each
+    generated part.
+    """
+    head_rings, head_segments = BASE_RESOLUTION['head']
+    body_rings, body_segments = BASE_RESOLUTION['body']
+    arm_rings, arm_segments = BASE_RESOLUTION['arm']
+    leg_rings, leg_segments = BASE_RESOLUTION['leg']
+
+    parts: List[Tuple[str, np.ndarray, np.ndarray]] = []
+
+    # Head (sphere)
+    parts.append(('head', *sphere_mesh(np.array([0.0, 1.6, 0.0]), 0.12, _scaled(head_rings, resolution, 4),
+                                       _scaled(head_segments, resolution, 4))))
+
+    # Body (cylinder from the shoulders down to the hips)
+    rings = _scaled(body_rings, resolution, 2)
+    body_path = np.column_stack([np.zeros(rings), np.linspace(1.4, 0.6, rings), np.zeros(rings)])
+    parts.append(('body', *tube_mesh(body_path, 0.15, _scaled(body_segments, resolution, 4))))
+
+    # Arms (slightly splayed) and legs (straight)
+    for side_name, side in (('left', -1), ('right', 1)):
+        t = np.linspace(0.0, 1.0, _scaled(arm_rings, resolution, 2))
+        arm_path = np.column_stack([side * (0.2 + 0.1 * t), 1.3 - 0.6 * t, np.zeros_like(t)])
+        parts.append((f'{side_name}_arm', *tube_mesh(arm_path, 0.04, _scaled(arm_segments, resolution, 4))))
+
+    for side_name, side in (('left', -1), ('right', 1)):
+        t = np.linspace(0.0, 1.0, _scaled(leg_rings, resolution, 2))
+        leg_path = np.column_stack([np.full_like(t, side * 0.1), 0.6 - 0.9 * t, np.zeros_like(t)])
+        parts.append((f'{side_name}_leg', *tube_mesh(leg_path, 0.06, _scaled(leg_segments, resolution, 4))))
+
+    # Concatenate with per-part index offsets
+    counts = np.array([len(vertices) for _, vertices, _ in parts])
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    vertices = np.vstack([part_vertices for _, part_vertices, _ in parts]).astype(np.float32)
+    faces = np.vstack([part_faces + offset for (_, _, part_faces), offset in zip(parts, offsets)]).astype(np.int32)
+
+    logger.debug(f"Built humanoid mesh at resolution {resolution}: {len(vertices)} vertices, {len(faces)} faces")
+    return {
+        'vertices': vertices,
+        'faces': faces,
+        'vertex_groups': assign_vertex_groups(vertices),
+        'parts': {name: (int(offsets[i]), int(offsets[i + 1])) for i, (name, _, _) in enumerate(parts)},
+        'topology': 'humanoid'
+    }
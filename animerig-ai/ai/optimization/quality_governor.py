@@ -0,0 +1,140 @@
+"""
+Adaptive quality governor
+Steps rendering/simulation quality up or down from a rolling frame-time percentile, with hysteresis
+"""
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Every governor decision goes to this channel so it can be routed/recorded separately from app logs
+instrumentation = logging.getLogger('animerig.instrumentation.quality')
+
+
+@dataclass(frozen=True)
+class QualityStep:
+    """One rung of the quality ladder"""
+    mesh_level: str
+    physics_substeps: int
+    composite_scale: float
+    max_layers: Optional[int] = None  # None renders every layer
+
+
+# Cheapest first; the governor moves one rung at a time
+QUALITY_LADDER = (
+    QualityStep('low', 1, 0.5, 4),
+    QualityStep('low', 1, 0.75, 5),
+    QualityStep('medium', 1, 0.75),
+    QualityStep('high', 1, 1.0),
+    QualityStep('high', 2, 1.0),
+    QualityStep('ultra', 2, 1.0)
+)
+
+
+@dataclass
+class GovernorDecision:
+    """A quality change and the measurement that triggered it"""
+    timestamp: float
+    direction: str  # 'down' or 'up'
+    from_index: int
+    to_index: int
+    percentile_ms: float
+    target_ms: float
+    step: QualityStep
+
+
+class QualityGovernor:
+    """
+    Keeps frame time under a target by walking a quality ladder
+
+    Frame times go into a rolling window; each frame the chosen percentile of
+    that window is compared with the target. Quality drops after the
+    percentile has been over budget for down_patience consecutive frames and
+    rises only after it has stayed under up_threshold x target for the longer
+    up_patience. The window is cleared after every change so the next
+    decision is based only on frames rendered at the new level.
+    """
+
+    def __init__(self, target_frame_time: float, apply: Callable[[QualityStep], None],
+                 ladder: Sequence[QualityStep] = QUALITY_LADDER, start_index: Optional[int] = None,
+                 window: int = 60, percentile: float = 90.0, min_samples: int = 30,
+                 down_threshold: float = 1.0, up_threshold: float = 0.6,
+                 down_patience: int = 10, up_patience: int = 90):
+        self.target_frame_time = target_frame_time
+        self.apply = apply
+        self.ladder: List[QualityStep] = list(ladder)
+        self.index = len(self.ladder) - 1 if start_index is None else start_index
+
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.down_threshold = down_threshold
+        self.up_threshold = up_threshold
+        self.down_patience = down_patience
+        self.up_patience = up_patience
+
+        self.frame_times: Deque[float] = deque(maxlen=window)
+        self.decisions: Deque[GovernorDecision] = deque(maxlen=100)
+        self._over_budget = 0
+        self._under_budget = 0
+
+    @property
+    def step(self) -> QualityStep:
+        return self.ladder[self.index]
+
+    def reset(self):
+        """Forget measurements (after a level change or a load hitch)"""
+        self.frame_times.clear()
+        self._over_budget = 0
+        self._under_budget = 0
+
+    def record(self, frame_time: float) -> Optional[GovernorDecision]:
+        """Add one frame time (seconds); returns the decision if quality changed"""
+        self.frame_times.append(frame_time)
+        if len(self.frame_times) < self.min_samples:
+            return None
+
+        measured = float(np.percentile(self.frame_times, self.percentile))
+        if measured > self.target_frame_time * self.down_threshold:
+            self._over_budget += 1
+            self._under_budget = 0
+        elif measured < self.target_frame_time * self.up_threshold:
+            self._under_budget += 1
+            self._over_budget = 0
+        else:
+            self._over_budget = 0
+            self._under_budget = 0
+
+        if self._over_budget >= self.down_patience and self.index > 0:
+            return self._change(self.index - 1, 'down', measured)
+        if self._under_budget >= self.up_patience and self.index < len(self.ladder) - 1:
+            return self._change(self.index + 1, 'up', measured)
+        return None
+
+    def _change(self, index: int, direction: str, measured: float) -> GovernorDecision:
+        decision = GovernorDecision(
+            timestamp=time.time(),
+            direction=direction,
+            from_index=self.index,
+            to_index=index,
+            percentile_ms=measured * 1000,
+            target_ms=self.target_frame_time * 1000,
+            step=self.ladder[index]
+        )
+        self.index = index
+        self.apply(decision.step)
+        self.reset()
+
+        self.decisions.append(decision)
+        instrumentation.info(
+            f"quality {direction}: step {decision.from_index} -> {decision.to_index} "
+            f"(p{self.percentile:g} {decision.percentile_ms:.1f}ms, target {decision.target_ms:.1f}ms) "
+            f"mesh={decision.step.mesh_level} substeps={decision.step.physics_substeps} "
+            f"scale={decision.step.composite_scale} layers={decision.step.max_layers or 'all'}"
+        )
+        return decision
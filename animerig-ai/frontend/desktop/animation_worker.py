@@ -0,0 +1,288 @@
+"""
+Animation worker thread for the desktop app
+Runs ProfessionalAnimator off the Qt GUI thread and hands finished frames over through a ring buffer
+"""
+
+import logging
+import math
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FramePacket:
+    """A rendered frame plus the bookkeeping needed to present it"""
+    frame: np.ndarray
+    index: int
+    produced_at: float
+    sim_time: float
+
+
+class FrameRingBuffer:
+    """
+    Bounded single-producer / single-consumer frame queue.
+
+    The producer never blocks: when the buffer is full the oldest frame is
+    overwritten. The consumer only ever wants the newest frame, so anything
+    older is discarded on read. Both cases count as dropped frames.
+    """
+
+    def __init__(self, capacity: int = 3):
+        self.capacity = max(1, capacity)
+        self._frames: Deque[FramePacket] = deque(maxlen=self.capacity)
+        self._lock = threading.Lock()
+        self.dropped_frames = 0
+
+    def push(self, packet: FramePacket):
+        """Add a frame, overwriting the oldest one if the buffer is full"""
+        with self._lock:
+            if len(self._frames) == self.capacity:
+                self.dropped_frames += 1
+            self._frames.append(packet)
+
+    def pop_latest(self) -> Optional[FramePacket]:
+        """Take the newest frame and discard anything older"""
+        with self._lock:
+            if not self._frames:
+                return None
+            packet = self._frames.pop()
+            self.dropped_frames += len(self._frames)
+            self._frames.clear()
+            return packet
+
+    def clear(self):
+        """Drop all pending frames without counting them"""
+        with self._lock:
+            self._frames.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._frames)
+
+
+class FixedStepScheduler:
+    """
+    Fixed-timestep simulation clock with interpolated presentation.
+
+    Wall-clock time is accumulated and consumed in constant simulation steps, so
+    animation speed no longer depends on the presentation rate. The remainder is
+    exposed as alpha for blending the last two simulated states. When steps get
+    too expensive to catch up, the excess steps are skipped (time dilates) rather
+    than spiralling further behind.
+    """
+
+    def __init__(self, sim_rate: float = 120.0, present_rate: float = 60.0,
+                 max_catchup_steps: int = 8, jitter_window: int = 120):
+        self.step = 1.0 / sim_rate
+        self.present_interval = 1.0 / present_rate
+        self.max_catchup_steps = max(1, max_catchup_steps)
+
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.sim_time = 0.0
+        self._last_time: Optional[float] = None
+
+        # Smoothed cost of one simulation step, used to size the catch-up budget
+        self.step_cost = 0.0
+
+        # Statistics
+        self.total_steps = 0
+        self.skipped_steps = 0
+        self._intervals: Deque[float] = deque(maxlen=jitter_window)
+
+    def begin_frame(self, now: float) -> int:
+        """Advance the clock to now and return how many simulation steps to run"""
+        if self._last_time is None:
+            # First frame: one step so there is a state to present
+            self._last_time = now
+            self._commit_steps(1)
+            self.alpha = 1.0
+            return 1
+
+        elapsed = now - self._last_time
+        self._last_time = now
+        self._intervals.append(elapsed)
+        self.accumulator += elapsed
+
+        steps = int(self.accumulator // self.step)
+        budget = self.catchup_budget()
+        if steps > budget:
+            skipped = steps - budget
+            self.skipped_steps += skipped
+            self.accumulator -= skipped * self.step
+            steps = budget
+
+        self.accumulator -= steps * self.step
+        self._commit_steps(steps)
+        self.alpha = min(1.0, self.accumulator / self.step)
+        return steps
+
+    def record_step_cost(self, seconds: float):
+        """Feed back how long one simulation step took"""
+        if self.step_cost == 0.0:
+            self.step_cost = seconds
+        else:
+            self.step_cost += (seconds - self.step_cost) * 0.1
+
+    def catchup_budget(self) -> int:
+        """Most steps that fit into half a presentation interval"""
+        if self.step_cost <= 0.0:
+            return self.max_catchup_steps
+        affordable = int((self.present_interval * 0.5) / self.step_cost)
+        return max(1, min(self.max_catchup_steps, affordable))
+
+    @property
+    def jitter_ms(self) -> float:
+        """Standard deviation of frame-to-frame intervals in milliseconds"""
+        count = len(self._intervals)
+        if count < 2:
+            return 0.0
+        mean = sum(self._intervals) / count
+        variance = sum((i - mean) ** 2 for i in self._intervals) / count
+        return math.sqrt(variance) * 1000
+
+    def _commit_steps(self, steps: int):
+        self.total_steps += steps
+        self.sim_time += steps * self.step
+
+
+class AnimationWorker(threading.Thread):
+    """
+    Produces animation frames at target_fps on a background thread.
+
+    The animator is simulated at a fixed sim_rate and each frame presents the
+    state interpolated between the last two steps. The animator is owned by
+    this thread while it runs; the GUI talks to it only through submit(), which
+    queues a call to run before the next frame.
+    """
+
+    def __init__(self, animator, target_fps: float = 60.0, buffer_size: int = 3,
+                 sim_rate: float = 120.0):
+        super().__init__(name="AnimationWorker", daemon=True)
+        self.animator = animator
+        self.target_fps = target_fps
+        self.frame_interval = 1.0 / target_fps
+        self.frame_buffer = FrameRingBuffer(buffer_size)
+        self.scheduler = FixedStepScheduler(sim_rate=sim_rate, present_rate=target_fps)
+
+        self._commands: "queue.Queue[Callable[[Any], None]]" = queue.Queue()
+        self._stop_event = threading.Event()
+
+        # Statistics
+        self.produced_frames = 0
+        self.late_frames = 0
+        self.sim_time = 0.0
+        self.last_frame_cost = 0.0
+
+    def submit(self, method_name: str, *args, **kwargs):
+        """Queue an animator method call to run on the worker thread"""
+        self._commands.put(lambda animator: getattr(animator, method_name)(*args, **kwargs))
+
+    def submit_callable(self, fn: Callable[[Any], None]):
+        """Queue an arbitrary callable that receives the animator"""
+        self._commands.put(fn)
+
+    def replace_animator(self, animator):
+        """Swap in a new animator at the next frame boundary"""
+        def swap(_previous):
+            self.animator = animator
+            self.frame_buffer.clear()
+        self._commands.put(swap)
+
+    def stop(self, timeout: float = 1.0):
+        """Stop producing frames and wait for the thread to exit"""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    @property
+    def dropped_frames(self) -> int:
+        return self.frame_buffer.dropped_frames
+
+    @property
+    def skipped_steps(self) -> int:
+        return self.scheduler.skipped_steps
+
+    @property
+    def jitter_ms(self) -> float:
+        return self.scheduler.jitter_ms
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get worker frame statistics"""
+        return {
+            'produced_frames': self.produced_frames,
+            'dropped_frames': self.dropped_frames,
+            'late_frames': self.late_frames,
+            'frame_cost_ms': self.last_frame_cost * 1000,
+            'buffered_frames': len(self.frame_buffer),
+            'sim_steps': self.scheduler.total_steps,
+            'skipped_steps': self.scheduler.skipped_steps,
+            'jitter_ms': self.scheduler.jitter_ms
+        }
+
+    def run(self):
+        """Frame production loop"""
+        logger.info(f"Animation worker started at {self.target_fps:.0f} FPS")
+
+        next_deadline = time.perf_counter() + self.frame_interval
+
+        while not self._stop_event.is_set():
+            self._apply_commands()
+
+            now = time.perf_counter()
+            steps = self.scheduler.begin_frame(now)
+
+            try:
+                for _ in range(steps):
+                    step_start = time.perf_counter()
+                    self.animator.simulate(self.scheduler.step)
+                    self.scheduler.record_step_cost(time.perf_counter() - step_start)
+
+                frame = self.animator.present(self.scheduler.alpha)
+            except Exception as e:
+                logger.error(f"Animation update failed: {e}")
+                frame = None
+
+            finished = time.perf_counter()
+            self.last_frame_cost = finished - now
+            self.sim_time = self.scheduler.sim_time
+
+            if frame is not None and frame.size > 0:
+                self.frame_buffer.push(FramePacket(
+                    frame=frame,
+                    index=self.produced_frames,
+                    produced_at=finished,
+                    sim_time=self.sim_time
+                ))
+                self.produced_frames += 1
+
+            if finished > next_deadline:
+                # Missed the slot - count it and re-anchor instead of bursting to catch up
+                self.late_frames += 1
+                next_deadline = finished + self.frame_interval
+            else:
+                self._stop_event.wait(next_deadline - finished)
+                next_deadline += self.frame_interval
+
+        logger.info("Animation worker stopped")
+
+    def _apply_commands(self):
+        """Run queued animator calls on this thread"""
+        while True:
+            try:
+                command = self._commands.get_nowait()
+            except queue.Empty:
+                return
+
+            try:
+                command(self.animator)
+            except Exception as e:
+                logger.error(f"Animator command failed: {e}")
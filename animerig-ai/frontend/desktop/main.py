@@ -9,6 +9,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 
 import asyncio
 import json
+import dataclasses
 from pathlib import Path
 from typing import Optional, Dict, Any
 from dotenv import load_dotenv
@@ -51,6 +52,14 @@ except ImportError:
     OPENGL_AVAILABLE = False
     print("⚠ OpenGL not available - using software rendering only")
 
+# PBO frame streaming (needs OpenGL); a failure here must not be reported as missing OpenGL
+StreamingTexture = None
+if OPENGL_AVAILABLE:
+    try:
+        from frontend.desktop.texture_stream import StreamingTexture
+    except Exception as e:
+        print(f"⚠ Streaming texture unavailable - professional frames will not be drawn: {e}")
+
 # Configuration from environment variables
 class Config:
     """Application configuration from environment variables"""
@@ -110,6 +119,7 @@ from ai.animation_synthesis.motion_generator import MotionGenerator
 from ai.animation.live2d_animator import Live2DAnimator
 from ai.animation.professional_animator import ProfessionalAnimator
 from frontend.desktop.premium_ui_simple import PremiumUI, FloatingControlPanel, GestureQuickBar, EmotionWheel, AngleControlOrb, PerformanceMonitor
+from frontend.desktop.animation_worker import AnimationWorker
 import cv2
 import numpy as np
 import time
@@ -170,6 +180,16 @@ class CharacterViewport(QOpenGLWidget):
         # Rendering state
         self.use_professional_renderer = True
         self.character_loaded = False
+        self.frame_stream = None  # Created lazily once a GL context is current
+        
+        # Simulation and CPU rendering run on a worker thread; the GUI thread only presents
+        self.animation_worker = None
+        self.presented_frame = None
+        self.presented_frame_index = -1
+        
+        # Repaint timer - presents the newest worker frame
+        self.animation_timer = QTimer(self)
+        self.animation_timer.timeout.connect(self.update)
 
     def paintGL(self):
         """Professional OpenGL rendering with advanced animation"""
@@ -180,14 +200,11 @@ class CharacterViewport(QOpenGLWidget):
             self.render_loading_screen()
             return
         
-        # Calculate delta time for smooth animation
+        # Presentation interval - the animation itself is stepped at a fixed rate by the worker
         current_time = time.time()
         delta_time = current_time - self.last_frame_time
         self.last_frame_time = current_time
         
-        # Cap delta time to prevent large jumps
-        delta_time = min(delta_time, 1.0 / 30.0)  # Max 30 FPS minimum
-        
         if self.use_professional_renderer:
             self.render_professional_animation(delta_time)
         else:
@@ -197,18 +214,46 @@ class CharacterViewport(QOpenGLWidget):
         self.track_frame_performance(delta_time)
     
     def render_professional_animation(self, delta_time: float):
-        """Render using professional animation system"""
-        if not self.is_animating:
+        """Present the newest frame produced by the animation worker"""
+        if not self.is_animating or self.animation_worker is None:
             return
         
-        # Update professional animator
-        rendered_frame = self.professional_animator.update(delta_time)
-        
-        if rendered_frame is not None and rendered_frame.size > 0:
-            # Convert frame to OpenGL texture and render
-            self.render_frame_to_opengl(rendered_frame)
+        packet = self.animation_worker.frame_buffer.pop_latest()
+        
+        if packet is not None:
+            # New frame - upload and present it
+            self.presented_frame = packet.frame
+            self.presented_frame_index = packet.index
+            self.render_frame_to_opengl(packet.frame)
+            self.animation_frame += 1
+        elif self.presented_frame is not None:
+            # Worker hasn't finished the next frame yet - redraw without re-uploading
+            self.render_frame_to_opengl(self.presented_frame, dirty_rect=(0, 0, 0, 0))
+    
+    def send_to_animator(self, method_name: str, *args):
+        """Forward a call to the professional animator on the thread that owns it"""
+        if self.animation_worker is not None and self.animation_worker.is_alive():
+            self.animation_worker.submit(method_name, *args)
+            return
         
-        self.animation_frame += 1
+        try:
+            getattr(self.professional_animator, method_name)(*args)
+        except Exception as e:
+            print(f"⚠ Animator call {method_name} failed: {e}")
+    
+    def get_performance_metrics(self):
+        """Get animator metrics combined with frame pipeline counters"""
+        # The worker thread keeps rewriting the animator's metrics, so hand out a copy
+        metrics = self.professional_animator.get_performance_metrics()
+        if self.animation_worker is None:
+            return dataclasses.replace(metrics)
+        return dataclasses.replace(
+            metrics,
+            dropped_frames=self.animation_worker.dropped_frames,
+            late_frames=self.animation_worker.late_frames,
+            skipped_steps=self.animation_worker.skipped_steps,
+            frame_jitter_ms=self.animation_worker.jitter_ms
+        )
     
     def render_legacy_animation(self):
         """Render using legacy animation system (fallback)"""
@@ -240,8 +285,11 @@ class CharacterViewport(QOpenGLWidget):
             GL.glDisable(GL.GL_TEXTURE_2D)
             GL.glDisable(GL.GL_BLEND)
     
-    def render_frame_to_opengl(self, frame: np.ndarray):
-        """Render a frame buffer to OpenGL"""
+    def render_frame_to_opengl(self, frame: np.ndarray, dirty_rect: Optional[tuple] = None):
+        """Render a frame buffer to OpenGL through the streaming texture"""
+        if StreamingTexture is None:
+            return
+        
         height, width = frame.shape[:2]
         
         # Set up 2D orthographic projection
@@ -256,32 +304,14 @@ class CharacterViewport(QOpenGLWidget):
         GL.glEnable(GL.GL_BLEND)
         GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
         
-        # Create texture from frame
         GL.glEnable(GL.GL_TEXTURE_2D)
         
-        # Generate texture if needed
-        if not hasattr(self, 'frame_texture'):
-            self.frame_texture = GL.glGenTextures(1)
-        
-        GL.glBindTexture(GL.GL_TEXTURE_2D, self.frame_texture)
+        # Texture storage is allocated once; frames are streamed in BGR(A) via PBOs
+        if self.frame_stream is None:
+            self.frame_stream = StreamingTexture()
         
-        # Convert frame to OpenGL format
-        if len(frame.shape) == 3:
-            if frame.shape[2] == 3:
-                gl_format = GL.GL_RGB
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            elif frame.shape[2] == 4:
-                gl_format = GL.GL_RGBA
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2RGBA)
-        else:
-            gl_format = GL.GL_LUMINANCE
-        
-        # Upload texture data
-        GL.glTexImage2D(GL.GL_TEXTURE_2D, 0, gl_format, width, height, 0, 
-                       gl_format, GL.GL_UNSIGNED_BYTE, frame)
-        
-        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_LINEAR)
-        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_LINEAR)
+        self.frame_stream.upload(frame, dirty_rect)
+        self.frame_stream.bind()
         
         # Render textured quad
         GL.glBegin(GL.GL_QUADS)
@@ -420,14 +450,24 @@ class CharacterViewport(QOpenGLWidget):
         """Set character emotion"""
         self.current_emotion = emotion
         self.emotion_intensity = intensity
+        self.send_to_animator('set_emotion', emotion, intensity)
         print(f"🎭 Emotion set to: {emotion} (intensity: {intensity:.2f})")
         self.update()  # Trigger repaint
     
+    def set_emotion_mix(self, mixture: dict):
+        """Set a blend of emotions (called continuously while the emotion wheel is dragged)"""
+        if mixture:
+            self.current_emotion = max(mixture, key=mixture.get)
+            self.emotion_intensity = mixture[self.current_emotion]
+        self.send_to_animator('set_emotion_mix', mixture)
+        self.update()
+    
     def set_head_rotation(self, x: float, y: float, z: float = 0.0):
         """Set head rotation angles"""
         self.head_rotation_x = x
         self.head_rotation_y = y
         self.head_rotation_z = z
+        self.send_to_animator('set_head_rotation', x, y, z)
         print(f"🔄 Head rotation set to: ({x:.1f}, {y:.1f}, {z:.1f})")
         self.update()
     
@@ -435,6 +475,7 @@ class CharacterViewport(QOpenGLWidget):
         """Trigger a gesture animation"""
         self.current_gesture = gesture_name
         self.gesture_time = 0.0
+        self.send_to_animator('trigger_gesture', gesture_name)
         print(f"👋 Gesture triggered: {gesture_name}")
         self.update()
     
@@ -480,6 +521,15 @@ class CharacterViewport(QOpenGLWidget):
     def start_animation(self):
         """Start character animation"""
         self.is_animating = True
+        
+        # Start the frame producer (threads can't be restarted, so create a fresh one)
+        if self.animation_worker is None or not self.animation_worker.is_alive():
+            self.animation_worker = AnimationWorker(
+                self.professional_animator,
+                target_fps=self.professional_animator.target_fps
+            )
+            self.animation_worker.start()
+        
         if not self.animation_timer.isActive():
             self.animation_timer.start(16)  # ~60 FPS
         print("🎬 Animation started")
@@ -487,6 +537,8 @@ class CharacterViewport(QOpenGLWidget):
     def stop_animation(self):
         """Stop character animation"""
         self.is_animating = False
+        if self.animation_worker is not None:
+            self.animation_worker.stop()
         if self.animation_timer.isActive():
             self.animation_timer.stop()
         print("⏹ Animation stopped")
@@ -496,6 +548,126 @@ class CharacterViewport(QOpenGLWidget):
         self.character_data = character_data
         print("📊 Character data set")
         self.update()
+    
+    def swap_character(self, animator: ProfessionalAnimator, character_data: Dict[str, Any]):
+        """Atomically replace the animated character with a fully prepared one"""
+        # Carry the current UI state over before the new animator goes live
+        animator.set_emotion(self.current_emotion, self.emotion_intensity)
+        
+        if self.animation_worker is not None and self.animation_worker.is_alive():
+            # The worker swaps at a frame boundary, so the old character keeps animating until then
+            self.animation_worker.replace_animator(animator)
+        
+        self.professional_animator = animator
+        self.character_data = character_data
+        self.character_loaded = True
+        print("🔁 Character swapped in")
+        self.update()
+    
+    def cleanup(self):
+        """Stop the animation worker and release GPU resources owned by the viewport"""
+        if self.animation_worker is not None:
+            self.animation_worker.stop()
+            self.animation_worker = None
+        
+        if self.frame_stream is not None:
+            self.makeCurrent()
+            self.frame_stream.release()
+            self.doneCurrent()
+            self.frame_stream = None
+
+
+class CharacterLoadThread(QThread):
+    """Background character import: detect -> mesh -> rig -> bind"""
+    
+    stage_changed = pyqtSignal(str, int)  # stage name, percent
+    character_ready = pyqtSignal(object, dict)  # bound ProfessionalAnimator, character data
+    load_failed = pyqtSignal(str)
+    load_cancelled = pyqtSignal()
+    
+    STAGES = [
+        ('detect', 10),
+        ('mesh', 40),
+        ('rig', 60),
+        ('bind', 80)
+    ]
+    
+    def __init__(self, image_path: str, character_processor=None, motion_generator=None,
+                 target_fps: int = 60, parent=None):
+        super().__init__(parent)
+        self.image_path = image_path
+        self.character_processor = character_processor
+        self.motion_generator = motion_generator
+        self.target_fps = target_fps
+        self.animator = None
+    
+    def cancel(self):
+        """Request cancellation; takes effect at the next stage boundary"""
+        self.requestInterruption()
+    
+    def run(self):
+        """Load and prepare the character without touching the GUI thread"""
+        try:
+            # Heavy constructors run here too, not in the UI callback
+            if self.character_processor is None:
+                self.character_processor = CharacterProcessor()
+            if self.motion_generator is None:
+                self.motion_generator = MotionGenerator()
+            
+            # Read once, keeping alpha for the animator; the processor works on BGR
+            image = cv2.imread(self.image_path, cv2.IMREAD_UNCHANGED)
+            if image is None:
+                raise ValueError("Could not load image")
+            
+            # Built once; 'detect' feeds it the image and 'bind' finishes it
+            self.animator = ProfessionalAnimator(target_fps=self.target_fps)
+            
+            results = {}
+            for stage, percent in self.STAGES:
+                if self.isInterruptionRequested():
+                    self.load_cancelled.emit()
+                    return
+                
+                self.stage_changed.emit(stage, percent)
+                results[stage] = self._run_stage(stage, image, results)
+            
+            if self.isInterruptionRequested():
+                self.load_cancelled.emit()
+                return
+            
+            character_data = self.character_processor.package_character_data(
+                results['mesh'], results['rig'], results['detect']
+            )
+            
+            self.stage_changed.emit('ready', 100)
+            self.character_ready.emit(results['bind'], character_data)
+            
+        except Exception as e:
+            self.load_failed.emit(str(e))
+    
+    def _run_stage(self, stage: str, image: np.ndarray, results: Dict[str, Any]):
+        """Run a single loading stage"""
+        if stage == 'detect':
+            self.animator.set_character_image(image)
+            return self.character_processor.detect_features(self._to_bgr(image))
+        elif stage == 'mesh':
+            return self.character_processor.generate_3d_model(results['detect'])
+        elif stage == 'rig':
+            return self.character_processor.create_animation_rig(results['mesh'])
+        elif stage == 'bind':
+            # The replacement animator is finished off-thread; the viewport swaps it in when done
+            self.animator.prepare_character()
+            return self.animator
+        raise ValueError(f"Unknown loading stage: {stage}")
+    
+    @staticmethod
+    def _to_bgr(image: np.ndarray) -> np.ndarray:
+        """3-channel copy of a grayscale/BGR/BGRA image (what cv2.imread gives by default)"""
+        if image.ndim == 2:
+            return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        if image.shape[2] == 4:
+            return cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+        return image
 
 
 class AnimeRigMainWindow(QMainWindow):
@@ -506,6 +678,7 @@ class AnimeRigMainWindow(QMainWindow):
         self.character_processor = None
         self.motion_generator = None
         self.is_processing = False
+        self.load_thread = None
         
         # Initialize premium UI components
         self.premium_ui_manager = None
@@ -584,6 +757,7 @@ class AnimeRigMainWindow(QMainWindow):
         if self.premium_ui:
             # Connect emotion wheel to viewport
             self.premium_ui.emotionChanged.connect(self.viewport.set_emotion)
+            self.premium_ui.emotionMixChanged.connect(self.viewport.set_emotion_mix)
             
             # Connect angle control to viewport
             self.premium_ui.angleChanged.connect(self.viewport.set_head_rotation)
@@ -608,6 +782,12 @@ class AnimeRigMainWindow(QMainWindow):
         load_action.triggered.connect(self.load_character_image)
         file_menu.addAction(load_action)
         
+        # Cancel loading action
+        cancel_load_action = QAction('&Cancel Character Loading', self)
+        cancel_load_action.setShortcut('Ctrl+.')
+        cancel_load_action.triggered.connect(self.cancel_character_loading)
+        file_menu.addAction(cancel_load_action)
+        
         # Export animation action
         export_action = QAction('&Export Animation...', self)
         export_action.setShortcut('Ctrl+E')
@@ -679,6 +859,13 @@ class AnimeRigMainWindow(QMainWindow):
         """Create status bar with performance indicators"""
         self.status_bar = self.statusBar()
         
+        # Character loading progress
+        self.load_progress = QProgressBar()
+        self.load_progress.setMaximumWidth(160)
+        self.load_progress.setRange(0, 100)
+        self.load_progress.hide()
+        self.status_bar.addPermanentWidget(self.load_progress)
+        
         # FPS indicator
         self.fps_label = QLabel("FPS: --")
         self.fps_label.setMinimumWidth(70)
@@ -752,53 +939,83 @@ class AnimeRigMainWindow(QMainWindow):
             self.load_character(file_path)
     
     def load_character(self, image_path: str):
-        """Load and process character from image file"""
+        """Load and process character from image file in the background"""
         if not os.path.exists(image_path):
             QMessageBox.warning(self, "File Not Found", f"Could not find image file:\n{image_path}")
             return
         
+        # A newer request supersedes any load still in flight
+        self.cancel_character_loading()
+        
         self.status_bar.showMessage(f"Loading character from {os.path.basename(image_path)}...")
+        self.is_processing = True
+        
+        self.load_thread = CharacterLoadThread(
+            image_path,
+            character_processor=self.character_processor,
+            motion_generator=self.motion_generator,
+            target_fps=self.viewport.professional_animator.target_fps,
+            parent=self
+        )
+        self.load_thread.stage_changed.connect(self.on_load_stage_changed)
+        self.load_thread.character_ready.connect(
+            lambda animator, data, path=image_path: self.on_character_ready(animator, data, path)
+        )
+        self.load_thread.load_failed.connect(self.on_character_load_failed)
+        self.load_thread.load_cancelled.connect(self.on_character_load_cancelled)
+        self.load_thread.finished.connect(self.on_load_thread_finished)
         
-        try:
-            # Initialize processors if needed
-            if not self.character_processor:
-                self.character_processor = CharacterProcessor()
-            if not self.motion_generator:
-                self.motion_generator = MotionGenerator()
-            
-            # Process character image
-            self.is_processing = True
-            
-            # Load image
-            import cv2
-            image = cv2.imread(image_path)
-            if image is None:
-                raise ValueError("Could not load image")
-            
-            # Process character (this would normally be async)
-            character_data = self.character_processor.process_image(image)
-            
-            # Set character data in viewport
-            if hasattr(self.viewport, 'set_character_data'):
-                self.viewport.set_character_data(character_data)
-            
-            # Enable character rendering
-            self.viewport.character_loaded = True
-            
-            # Start animation automatically
-            self.start_animation()
-            
-            self.status_bar.showMessage(f"Character loaded: {os.path.basename(image_path)}", 3000)
-            
-            print(f"✅ Character loaded successfully from {image_path}")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Character Loading Error", f"Failed to load character:\n{str(e)}")
-            self.status_bar.showMessage("Character loading failed", 3000)
-            print(f"❌ Character loading failed: {e}")
+        self.load_progress.setValue(0)
+        self.load_progress.show()
+        self.load_thread.start()
+    
+    def cancel_character_loading(self):
+        """Cancel the in-flight character load, if any"""
+        if self.load_thread is not None and self.load_thread.isRunning():
+            self.load_thread.cancel()
+            # Ignore progress, results and errors from the cancelled load
+            self.load_thread.stage_changed.disconnect()
+            self.load_thread.character_ready.disconnect()
+            self.load_thread.load_failed.disconnect()
+            self.status_bar.showMessage("Cancelling character loading...", 2000)
+    
+    def on_load_stage_changed(self, stage: str, percent: int):
+        """Show loading stage progress"""
+        self.load_progress.setValue(percent)
+        self.status_bar.showMessage(f"Loading character: {stage}...")
+    
+    def on_character_ready(self, animator: ProfessionalAnimator, character_data: Dict, image_path: str):
+        """Swap the freshly prepared character into the viewport"""
+        self.viewport.swap_character(animator, character_data)
+        
+        # Start animation automatically
+        self.start_animation()
         
-        finally:
+        self.status_bar.showMessage(f"Character loaded: {os.path.basename(image_path)}", 3000)
+        print(f"✅ Character loaded successfully from {image_path}")
+    
+    def on_character_load_failed(self, error: str):
+        """Report a failed character load"""
+        QMessageBox.critical(self, "Character Loading Error", f"Failed to load character:\n{error}")
+        self.status_bar.showMessage("Character loading failed", 3000)
+        print(f"❌ Character loading failed: {error}")
+    
+    def on_character_load_cancelled(self):
+        """Report a cancelled character load"""
+        self.status_bar.showMessage("Character loading cancelled", 3000)
+        print("⏹ Character loading cancelled")
+    
+    def on_load_thread_finished(self):
+        """Keep the processors built by the loader and reset loading state"""
+        thread = self.sender()
+        if thread is not None:
+            self.character_processor = self.character_processor or thread.character_processor
+            self.motion_generator = self.motion_generator or thread.motion_generator
+        
+        if thread is self.load_thread:
+            self.load_thread = None
             self.is_processing = False
+            self.load_progress.hide()
     
     def auto_load_default_character(self):
         """Auto-load default character if available"""
@@ -875,6 +1092,9 @@ class AnimeRigMainWindow(QMainWindow):
         if hasattr(self.viewport, 'is_animating'):
             status = "Running" if self.viewport.is_animating else "Stopped"
             self.animation_status_label.setText(f"Animation: {status}")
+        
+        # Refresh dropped/late frame counters in the performance panel
+        self.update_performance_display()
     
     def update_performance_display(self):
         """Update performance display from viewport signals"""
@@ -957,6 +1177,11 @@ class AnimeRigMainWindow(QMainWindow):
     
     def closeEvent(self, event):
         """Handle application close event"""
+        # Abandon any character load in progress
+        if self.load_thread is not None and self.load_thread.isRunning():
+            self.load_thread.cancel()
+            self.load_thread.wait(2000)
+        
         # Stop animation
         if hasattr(self.viewport, 'is_animating') and self.viewport.is_animating:
             self.stop_animation()
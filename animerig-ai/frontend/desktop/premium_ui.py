@@ -130,6 +130,7 @@ class EmotionWheel(QWidget):
     """원형 감정 선택기"""
     
     emotionChanged = pyqtSignal(str, float)  # emotion, intensity
+    emotionMixChanged = pyqtSignal(dict)  # {emotion: weight}, emitted continuously while dragging
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -256,7 +257,20 @@ class EmotionWheel(QWidget):
                 self.current_emotion = closest_emotion
                 self.emotionChanged.emit(closest_emotion, self.intensity)
             
+            self.emotionMixChanged.emit(self.mixture_at(angle, self.intensity))
             self.update()
+    
+    def mixture_at(self, angle: float, intensity: float) -> dict:
+        """Blend the two emotions either side of angle, weighted by angular distance"""
+        ordered = sorted(self.emotions.items(), key=lambda item: item[1]['angle'])
+        for i, (emotion, props) in enumerate(ordered):
+            next_emotion, next_props = ordered[(i + 1) % len(ordered)]
+            span = (next_props['angle'] - props['angle']) % 360 or 360
+            offset = (angle - props['angle']) % 360
+            if offset <= span:
+                t = offset / span
+                return {emotion: (1.0 - t) * intensity, next_emotion: t * intensity}
+        return {self.current_emotion: intensity}
 
 class AngleControlOrb(QWidget):
     """3D 각도 제어 오브"""
@@ -489,6 +503,7 @@ class PremiumUI(QWidget):
     """메인 프리미엄 UI"""
     
     emotionChanged = pyqtSignal(str, float)
+    emotionMixChanged = pyqtSignal(dict)
     angleChanged = pyqtSignal(float, float)
     gestureTriggered = pyqtSignal(str)
     
@@ -515,6 +530,7 @@ class PremiumUI(QWidget):
         
         # Connect signals
         self.floating_panel.emotion_wheel.emotionChanged.connect(self.emotionChanged)
+        self.floating_panel.emotion_wheel.emotionMixChanged.connect(self.emotionMixChanged)
         self.floating_panel.angle_orb.angleChanged.connect(self.angleChanged)
         
         # Gesture quick bar (bottom)
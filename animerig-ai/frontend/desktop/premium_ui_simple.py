@@ -13,7 +13,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import (
     Qt, QTimer, QPropertyAnimation, QEasingCurve, QRect,
-    pyqtSignal, QPoint, QSize, QParallelAnimationGroup
+    pyqtSignal, QPoint, QPointF, QSize, QParallelAnimationGroup, QEvent
 )
 from PyQt6.QtGui import (
     QPainter, QPen, QBrush, QColor, QLinearGradient,
@@ -72,15 +72,18 @@ class GlassmorphismPanel(QFrame):
 
 
 class EmotionWheel(QWidget):
-    """Simple emotion selector"""
+    """Simple emotion selector (click an emotion, or drag from one towards another to blend them)"""
     
     emotionChanged = pyqtSignal(str, float)  # emotion, intensity
+    emotionMixChanged = pyqtSignal(dict)  # {emotion: weight}, emitted continuously while dragging
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setFixedSize(200, 200)
         self.current_emotion = 'happy'
         self.intensity = 0.5
+        self.buttons = {}
+        self.dragging = False
         
         # Simple grid layout with emotion buttons
         layout = QGridLayout(self)
@@ -98,7 +101,10 @@ class EmotionWheel(QWidget):
         for i, (emoji, emotion, color) in enumerate(emotions):
             btn = NeonButton(emoji, color)
             btn.setFixedSize(60, 60)
-            btn.clicked.connect(lambda checked, e=emotion: self.set_emotion(e))
+            btn.clicked.connect(lambda checked, e=emotion: self.on_button_clicked(e))
+            # The pressed button grabs the mouse, so drags are picked up from its events
+            btn.installEventFilter(self)
+            self.buttons[emotion] = btn
             row, col = divmod(i, 3)
             layout.addWidget(btn, row, col)
     
@@ -106,6 +112,38 @@ class EmotionWheel(QWidget):
         """Set current emotion"""
         self.current_emotion = emotion
         self.emotionChanged.emit(emotion, self.intensity)
+    
+    def on_button_clicked(self, emotion):
+        """Pick a single emotion, unless the click ended a drag (the blend stays)"""
+        if not self.dragging:
+            self.set_emotion(emotion)
+    
+    def eventFilter(self, obj, event):
+        """Blend emotions while a button is dragged"""
+        if event.type() == QEvent.Type.MouseButtonPress:
+            self.dragging = False
+        elif (event.type() == QEvent.Type.MouseMove and event.buttons() & Qt.MouseButton.LeftButton
+                and obj in self.buttons.values()):
+            self.dragging = True
+            mixture = self.mixture_at(obj.mapTo(self, event.position().toPoint()))
+            dominant = max(mixture, key=mixture.get)
+            if dominant != self.current_emotion:
+                self.current_emotion = dominant
+                self.emotionChanged.emit(dominant, self.intensity)
+            self.emotionMixChanged.emit(mixture)
+        return super().eventFilter(obj, event)
+    
+    def mixture_at(self, pos: QPoint) -> dict:
+        """Blend the two emotion buttons nearest pos, weighted by inverse distance"""
+        distances = []
+        for emotion, btn in self.buttons.items():
+            offset = QPointF(pos) - QPointF(btn.geometry().center())
+            distances.append((math.hypot(offset.x(), offset.y()), emotion))
+        (near, first), (far, second) = sorted(distances)[:2]
+        if near < 1e-6:
+            return {first: self.intensity}
+        t = near / (near + far)
+        return {first: (1.0 - t) * self.intensity, second: t * self.intensity}
 
 
 class AngleControlOrb(QWidget):
@@ -223,6 +261,7 @@ class PremiumUI(QWidget):
     """Main premium UI (simplified)"""
     
     emotionChanged = pyqtSignal(str, float)
+    emotionMixChanged = pyqtSignal(dict)
     angleChanged = pyqtSignal(float, float)
     gestureTriggered = pyqtSignal(str)
     
@@ -241,6 +280,7 @@ class PremiumUI(QWidget):
         
         # Connect signals
         self.floating_panel.emotion_wheel.emotionChanged.connect(self.emotionChanged)
+        self.floating_panel.emotion_wheel.emotionMixChanged.connect(self.emotionMixChanged)
         self.floating_panel.angle_orb.angleChanged.connect(self.angleChanged)
         
         # Gesture quick bar (bottom)
@@ -274,6 +314,9 @@ class PerformanceMonitor(GlassmorphismPanel):
         # Performance data
         self.fps = 0.0
         self.frame_time = 0.0
+        self.dropped_frames = 0
+        self.late_frames = 0
+        self.frame_jitter = 0.0
         
         # Update timer
         self.update_timer = QTimer()
@@ -303,6 +346,19 @@ class PerformanceMonitor(GlassmorphismPanel):
         self.frame_time_label.setStyleSheet("color: rgba(255, 255, 255, 0.9); font-size: 9px;")
         layout.addWidget(self.frame_time_label)
         
+        # Frame pipeline counters
+        self.dropped_label = QLabel("Dropped: 0")
+        self.dropped_label.setStyleSheet("color: rgba(255, 255, 255, 0.9); font-size: 9px;")
+        layout.addWidget(self.dropped_label)
+        
+        self.late_label = QLabel("Late: 0")
+        self.late_label.setStyleSheet("color: rgba(255, 255, 255, 0.9); font-size: 9px;")
+        layout.addWidget(self.late_label)
+        
+        self.jitter_label = QLabel("Jitter: --ms")
+        self.jitter_label.setStyleSheet("color: rgba(255, 255, 255, 0.9); font-size: 9px;")
+        layout.addWidget(self.jitter_label)
+        
         layout.addStretch()
     
     def update_metrics(self, metrics):
@@ -311,6 +367,12 @@ class PerformanceMonitor(GlassmorphismPanel):
             self.fps = metrics.fps
         if hasattr(metrics, 'frame_time'):
             self.frame_time = metrics.frame_time * 1000  # Convert to ms
+        if hasattr(metrics, 'dropped_frames'):
+            self.dropped_frames = metrics.dropped_frames
+        if hasattr(metrics, 'late_frames'):
+            self.late_frames = metrics.late_frames
+        if hasattr(metrics, 'frame_jitter_ms'):
+            self.frame_jitter = metrics.frame_jitter_ms
         
         self.update_display()
     
@@ -323,6 +385,11 @@ class PerformanceMonitor(GlassmorphismPanel):
         
         # Update frame time
         self.frame_time_label.setText(f"Frame: {self.frame_time:.1f}ms")
+        
+        # Update frame pipeline counters
+        self.dropped_label.setText(f"Dropped: {self.dropped_frames}")
+        self.late_label.setText(f"Late: {self.late_frames}")
+        self.jitter_label.setText(f"Jitter: {self.frame_jitter:.1f}ms")
 
 
 # Demo application
@@ -0,0 +1,201 @@
+"""
+Streaming texture upload for the desktop viewport
+Keeps a single GPU texture alive and feeds it through an orphaned pixel buffer object
+"""
+
+import ctypes
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+from OpenGL import GL
+
+logger = logging.getLogger(__name__)
+
+# (internal format, pixel format) per channel count.
+# OpenCV frames are BGR/BGRA, so they are handed to the driver as-is - no cvtColor copy.
+_UPLOAD_FORMATS = {
+    1: (GL.GL_LUMINANCE, GL.GL_LUMINANCE),
+    3: (GL.GL_RGB8, GL.GL_BGR),
+    4: (GL.GL_RGBA8, GL.GL_BGRA),
+}
+
+
+class StreamingTexture:
+    """
+    GPU texture that is allocated once and updated in place with glTexSubImage2D.
+
+    Uploads go through one pixel buffer object whose storage is orphaned before
+    every write, so the CPU gets fresh memory while the driver may still be
+    reading the previous frame, and the texture shows the frame it was given
+    with no added latency. Callers can pass a dirty sub-rectangle to upload
+    only the part of the frame that changed.
+    """
+
+    def __init__(self, use_pbo: bool = True):
+        self.texture_id = None
+        self.width = 0
+        self.height = 0
+        self.channels = 0
+
+        # Pixel unpack buffer (orphaned on every upload)
+        self.use_pbo = use_pbo
+        self.pbo_id = None
+        self.pbo_size = 0
+
+        # Statistics
+        self.allocations = 0
+        self.uploaded_bytes = 0
+
+    def upload(self, frame: np.ndarray, dirty_rect: Optional[Tuple[int, int, int, int]] = None):
+        """
+        Upload a BGR/BGRA/grayscale frame into the texture
+
+        Args:
+            frame: uint8 image as produced by OpenCV
+            dirty_rect: Optional (x, y, width, height) region that changed since the last upload
+        """
+        height, width = frame.shape[:2]
+        channels = 1 if frame.ndim == 2 else frame.shape[2]
+
+        if channels not in _UPLOAD_FORMATS:
+            raise ValueError(f"Unsupported channel count for texture upload: {channels}")
+
+        if frame.dtype != np.uint8:
+            frame = frame.astype(np.uint8)
+
+        # (Re)allocate storage only when the frame layout changes
+        if self.texture_id is None or (width, height, channels) != (self.width, self.height, self.channels):
+            self._allocate(width, height, channels)
+            dirty_rect = None  # Fresh storage needs a full upload
+
+        x, y, w, h = self._clip_rect(dirty_rect)
+        if w <= 0 or h <= 0:
+            return
+
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self.texture_id)
+        GL.glPixelStorei(GL.GL_UNPACK_ALIGNMENT, 1)
+
+        if self.use_pbo and self.pbo_id is not None:
+            self._upload_via_pbo(frame, x, y, w, h)
+        else:
+            self._upload_direct(frame, x, y, w, h)
+
+        self.uploaded_bytes += w * h * channels
+
+    def bind(self):
+        """Bind the texture for drawing"""
+        if self.texture_id is not None:
+            GL.glBindTexture(GL.GL_TEXTURE_2D, self.texture_id)
+
+    def release(self):
+        """Free GPU resources (requires the owning GL context to be current)"""
+        if self.pbo_id is not None:
+            GL.glDeleteBuffers(1, [self.pbo_id])
+            self.pbo_id = None
+        if self.texture_id is not None:
+            GL.glDeleteTextures([self.texture_id])
+            self.texture_id = None
+        self.width = self.height = self.channels = 0
+
+    def _allocate(self, width: int, height: int, channels: int):
+        """Allocate immutable-size texture storage and a matching PBO"""
+        if self.texture_id is None:
+            self.texture_id = GL.glGenTextures(1)
+
+        internal_format, pixel_format = _UPLOAD_FORMATS[channels]
+
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self.texture_id)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_LINEAR)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_LINEAR)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_S, GL.GL_CLAMP_TO_EDGE)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_T, GL.GL_CLAMP_TO_EDGE)
+        GL.glTexImage2D(GL.GL_TEXTURE_2D, 0, internal_format, width, height, 0,
+                        pixel_format, GL.GL_UNSIGNED_BYTE, None)
+
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.allocations += 1
+
+        if self.use_pbo:
+            self._allocate_pbo(width * height * channels)
+
+        logger.info(f"Streaming texture allocated: {width}x{height}x{channels} (PBO: {self.pbo_id is not None})")
+
+    def _allocate_pbo(self, size: int):
+        """Create (or resize) the pixel unpack buffer"""
+        try:
+            if self.pbo_id is None:
+                self.pbo_id = int(np.atleast_1d(GL.glGenBuffers(1))[0])
+
+            GL.glBindBuffer(GL.GL_PIXEL_UNPACK_BUFFER, self.pbo_id)
+            GL.glBufferData(GL.GL_PIXEL_UNPACK_BUFFER, size, None, GL.GL_STREAM_DRAW)
+            GL.glBindBuffer(GL.GL_PIXEL_UNPACK_BUFFER, 0)
+
+            self.pbo_size = size
+
+        except Exception as e:
+            # Pixel buffer objects need GL 2.1 - fall back to direct uploads
+            logger.warning(f"PBO streaming unavailable, using direct uploads: {e}")
+            self.pbo_id = None
+            self.use_pbo = False
+
+    def _upload_via_pbo(self, frame: np.ndarray, x: int, y: int, w: int, h: int):
+        """Copy the dirty region into freshly orphaned PBO storage and DMA it into the texture"""
+        region_size = w * h * self.channels
+
+        GL.glBindBuffer(GL.GL_PIXEL_UNPACK_BUFFER, self.pbo_id)
+        # Orphan the old storage so the driver never blocks on the previous frame's transfer
+        GL.glBufferData(GL.GL_PIXEL_UNPACK_BUFFER, self.pbo_size, None, GL.GL_STREAM_DRAW)
+
+        pointer = GL.glMapBufferRange(GL.GL_PIXEL_UNPACK_BUFFER, 0, region_size,
+                                      GL.GL_MAP_WRITE_BIT | GL.GL_MAP_INVALIDATE_BUFFER_BIT)
+        if not pointer:
+            GL.glBindBuffer(GL.GL_PIXEL_UNPACK_BUFFER, 0)
+            self._upload_direct(frame, x, y, w, h)
+            return
+
+        # Single packed copy of the region straight into driver memory
+        address = pointer.value if isinstance(pointer, ctypes.c_void_p) else int(pointer)
+        mapped = np.ctypeslib.as_array((ctypes.c_ubyte * region_size).from_address(address))
+        mapped = mapped.reshape(frame[y:y + h, x:x + w].shape)
+        np.copyto(mapped, frame[y:y + h, x:x + w])
+        GL.glUnmapBuffer(GL.GL_PIXEL_UNPACK_BUFFER)
+
+        _, pixel_format = _UPLOAD_FORMATS[self.channels]
+        GL.glTexSubImage2D(GL.GL_TEXTURE_2D, 0, x, y, w, h,
+                           pixel_format, GL.GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+
+        GL.glBindBuffer(GL.GL_PIXEL_UNPACK_BUFFER, 0)
+
+    def _upload_direct(self, frame: np.ndarray, x: int, y: int, w: int, h: int):
+        """Upload from client memory, using unpack skips so the frame is not repacked"""
+        _, pixel_format = _UPLOAD_FORMATS[self.channels]
+
+        if not frame.flags['C_CONTIGUOUS']:
+            frame = np.ascontiguousarray(frame)
+
+        GL.glPixelStorei(GL.GL_UNPACK_ROW_LENGTH, self.width)
+        GL.glPixelStorei(GL.GL_UNPACK_SKIP_PIXELS, x)
+        GL.glPixelStorei(GL.GL_UNPACK_SKIP_ROWS, y)
+
+        GL.glTexSubImage2D(GL.GL_TEXTURE_2D, 0, x, y, w, h,
+                           pixel_format, GL.GL_UNSIGNED_BYTE, frame)
+
+        GL.glPixelStorei(GL.GL_UNPACK_ROW_LENGTH, 0)
+        GL.glPixelStorei(GL.GL_UNPACK_SKIP_PIXELS, 0)
+        GL.glPixelStorei(GL.GL_UNPACK_SKIP_ROWS, 0)
+
+    def _clip_rect(self, rect: Optional[Tuple[int, int, int, int]]) -> Tuple[int, int, int, int]:
+        """Clamp a dirty rectangle to the texture bounds (None means the whole frame)"""
+        if rect is None:
+            return 0, 0, self.width, self.height
+
+        x, y, w, h = (int(v) for v in rect)
+        x1 = max(0, x)
+        y1 = max(0, y)
+        x2 = min(self.width, x + w)
+        y2 = min(self.height, y + h)
+
+        return x1, y1, x2 - x1, y2 - y1
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Adaptive mesh tests
+Triangles cover the character's silhouette and are denser around facial features
+"""
+
+import os
+import sys
+
+import cv2
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from ai.animation.adaptive_mesh import build_adaptive_mesh, triangulate_in_mask
+from ai.animation.professional_animator import ProfessionalAnimator
+
+REGIONS = {
+    'left_eye': (0.38, 0.18, 0.46, 0.24),
+    'right_eye': (0.54, 0.18, 0.62, 0.24),
+    'mouth': (0.45, 0.3, 0.55, 0.35)
+}
+
+
+def character_image(width=400, height=600):
+    """BGRA figure: a head on a body, on a transparent background"""
+    image = np.zeros((height, width, 4), dtype=np.uint8)
+    cv2.circle(image, (width // 2, int(height * 0.22)), int(width * 0.18), (200, 180, 170, 255), -1)
+    cv2.rectangle(image, (int(width * 0.3), int(height * 0.38)), (int(width * 0.7), int(height * 0.95)),
+                  (90, 60, 160, 255), -1)
+    cv2.rectangle(image, (int(width * 0.47), int(height * 0.3)), (int(width * 0.53), int(height * 0.4)),
+                  (200, 180, 170, 255), -1)
+    return image
+
+
+def rasterize(mesh, shape):
+    covered = np.zeros(shape, dtype=np.uint8)
+    for triangle in mesh['vertices'][mesh['triangles']]:
+        cv2.fillConvexPoly(covered, np.rint(triangle).astype(np.int32), 255)
+    return covered > 0
+
+
+def test_mesh_covers_silhouette():
+    image = character_image()
+    mesh = build_adaptive_mesh(image, REGIONS, mesh_density=40)
+    mask = image[:, :, 3] > 0
+    covered = rasterize(mesh, mask.shape)
+
+    assert (covered & mask).sum() / mask.sum() > 0.97
+    # Very little spills onto the background
+    assert (covered & ~mask).sum() / mask.sum() < 0.03
+    assert mesh['triangles'].max() < len(mesh['vertices'])
+
+
+def test_feature_regions_are_denser_than_the_body():
+    image = character_image()
+    height, width = image.shape[:2]
+    mesh = build_adaptive_mesh(image, REGIONS, mesh_density=40)
+    vertices = mesh['vertices']
+
+    def density(x1, y1, x2, y2):
+        inside = ((vertices[:, 0] >= x1 * width) & (vertices[:, 0] <= x2 * width)
+                  & (vertices[:, 1] >= y1 * height) & (vertices[:, 1] <= y2 * height))
+        return inside.sum() / ((x2 - x1) * width * (y2 - y1) * height)
+
+    # Interior of the body, away from its outline
+    body = density(0.4, 0.5, 0.6, 0.85)
+    for name, box in REGIONS.items():
+        assert density(*box) > 3 * body, name
+
+
+def tiny_blob_image(size=256, blob=4):
+    image = np.zeros((size, size, 4), dtype=np.uint8)
+    start = size // 2
+    image[start:start + blob, start:start + blob] = 255
+    return image
+
+
+def test_foreground_smaller_than_a_cell_has_no_adaptive_mesh():
+    assert triangulate_in_mask(np.zeros((2, 2)), np.full((4, 4), 255, np.uint8)).shape == (0, 3)
+    assert triangulate_in_mask(np.column_stack([np.arange(5.0), np.arange(5.0)]),
+                               np.full((8, 8), 255, np.uint8)).shape == (0, 3)
+    assert build_adaptive_mesh(tiny_blob_image(), REGIONS, mesh_density=25) is None
+
+
+def test_animator_falls_back_to_grid_for_tiny_foreground(tmp_path):
+    path = str(tmp_path / 'blob.png')
+    cv2.imwrite(path, tiny_blob_image())
+
+    animator = ProfessionalAnimator()
+    assert animator.load_character(path)
+    assert all(mesh['layout'] == 'grid' for mesh in animator.mesh_lods.values())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Gesture clip tests
+Layered clip player bindings and release of held gestures
+"""
+
+import os
+import sys
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from ai.animation.gesture_clips import GestureClip, LayeredClipPlayer, compile_gestures, default_gesture_specs
+
+BONES = ['head', 'right_upper_arm', 'right_forearm']
+
+
+def raise_clip(name, bone, hold=False, hold_time=None):
+    spec = {'duration': 1.0, 'hold': hold, 'hold_time': hold_time,
+            'keyframes': {bone: [(0.0, np.zeros(3)), (1.0, np.array([0.0, 0.0, 1.0]))]}}
+    return GestureClip.from_keyframes(name, spec)
+
+
+def run(player, seconds, dt=0.1):
+    for _ in range(int(round(seconds / dt))):
+        player.update(dt)
+
+
+def test_clips_sharing_a_name_bind_separately():
+    player = LayeredClipPlayer(BONES)
+    player.play(raise_clip('custom', 'head', hold=True), layer=0, fade_in=0.0)
+    player.play(raise_clip('custom', 'right_forearm', hold=True), layer=1, fade_in=0.0)
+    run(player, 1.0)
+
+    pose = player.evaluate(np.zeros((len(BONES), 3), dtype=np.float32))
+    np.testing.assert_allclose(pose[:, 2], [1.0, 0.0, 1.0], atol=1e-6)
+
+
+def test_hold_releases_after_hold_time():
+    player = LayeredClipPlayer(BONES)
+    player.play(raise_clip('hold', 'head', hold=True, hold_time=0.5), fade_out=0.2)
+    run(player, 1.6)
+    assert player.active
+    run(player, 0.2)
+    assert not player.active
+
+
+def test_next_gesture_releases_a_held_one():
+    player = LayeredClipPlayer(BONES)
+    player.play(raise_clip('hold', 'head', hold=True), layer=1, fade_out=0.2)
+    run(player, 2.0)
+    assert player.active
+
+    player.play(raise_clip('wave', 'right_upper_arm'), layer=0)
+    run(player, 0.3)
+    assert list(player.layers) == [0]
+
+
+def test_hold_presets_time_out():
+    clips = compile_gestures(default_gesture_specs())
+    held = [clip for clip in clips.values() if clip.hold]
+    assert held and all(clip.hold_time is not None for clip in held)
+
+
+def test_finished_clips_release_their_bindings():
+    player = LayeredClipPlayer(BONES)
+    shared = raise_clip('shared', 'head', hold=True)
+    player.play(shared, layer=0, fade_in=0.0)
+    player.play(shared, layer=1, mode='additive', fade_in=0.0)
+    player.play(raise_clip('replaced', 'right_forearm'), layer=2)
+    player.play(raise_clip('wave', 'right_upper_arm'), layer=2, fade_out=0.0)
+
+    player.stop(0, fade_out=0.0)
+    assert id(shared) in player._bindings
+    player.stop(1, fade_out=0.0)
+    run(player, 1.5)
+
+    assert not player.active
+    assert player._bindings == {} and player._samples == {}
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Mesh normal tests
+Incremental normal updates against a full recomputation
+"""
+
+import os
+import sys
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from ai.animation.mesh_normals import IncrementalNormals, vertex_normals
+
+
+def wavy_grid(size=20):
+    u, v = np.meshgrid(np.linspace(0.0, 1.0, size), np.linspace(0.0, 1.0, size))
+    vertices = np.column_stack([u.ravel(), v.ravel(), 0.1 * np.sin(6.0 * u.ravel()) * np.cos(4.0 * v.ravel())])
+    i = (np.arange(size - 1)[:, np.newaxis] * size + np.arange(size - 1)).ravel()
+    faces = np.concatenate([np.column_stack([i, i + 1, i + size]), np.column_stack([i + 1, i + size + 1, i + size])])
+    return vertices, faces
+
+
+def test_incremental_updates_match_full_recompute():
+    vertices, faces = wavy_grid()
+    normals = IncrementalNormals(faces, len(vertices))
+    np.testing.assert_allclose(normals.update(vertices), vertex_normals(vertices, faces), atol=1e-6)
+
+    rng = np.random.default_rng(11)
+    for step in range(20):
+        moved = rng.choice(len(vertices), 15, replace=False)
+        vertices = vertices.copy()
+        vertices[moved] += rng.normal(scale=0.02, size=(15, 3))
+
+        # Alternate between detected and explicitly listed moved vertices
+        result = normals.update(vertices, moved if step % 2 else None)
+        np.testing.assert_allclose(result, vertex_normals(vertices, faces), atol=1e-5)
+        assert 0 < normals.last_updated_faces < len(faces)
+
+
+def test_unchanged_mesh_updates_no_faces():
+    vertices, faces = wavy_grid()
+    normals = IncrementalNormals(faces, len(vertices))
+    normals.update(vertices)
+    normals.update(vertices.copy())
+    assert normals.last_updated_faces == 0
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Mesh warp tests
+Piecewise-affine warping of images by a deformed mesh
+"""
+
+import os
+import sys
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from ai.animation.mesh_warp import triangle_affines, warp_image
+
+
+def square_mesh(size=40.0, origin=(20.0, 20.0)):
+    x, y = origin
+    vertices = np.array([[x, y], [x + size, y], [x + size, y + size], [x, y + size]])
+    return vertices, np.array([[0, 1, 2], [0, 2, 3]])
+
+
+def test_affines_map_target_corners_to_source():
+    rng = np.random.default_rng(7)
+    source = rng.uniform(0, 100, (3, 2))
+    target = source + rng.uniform(-10, 10, (3, 2))
+    affine = triangle_affines(source, target, np.array([[0, 1, 2]]))[0]
+
+    mapped = target @ affine[:, :2].T + affine[:, 2]
+    np.testing.assert_allclose(mapped, source, atol=1e-9)
+
+
+def test_unmoved_mesh_returns_image_unchanged():
+    image = np.random.default_rng(1).integers(0, 255, (100, 100, 4), dtype=np.uint8)
+    vertices, triangles = square_mesh()
+    assert warp_image(image, vertices, vertices.copy(), triangles) is image
+
+
+def test_translated_mesh_moves_its_pixels():
+    image = np.zeros((100, 100, 4), dtype=np.uint8)
+    image[30:50, 30:50] = 255
+    vertices, triangles = square_mesh()
+
+    warped = warp_image(image, vertices, vertices + [15.0, 0.0], triangles)
+
+    assert warped[40, 50:60].min() == 255
+    # Uncovered pixels inside the rest square become transparent
+    assert warped[40, 25, 3] == 0
+    # Pixels the mesh never covered are untouched
+    assert warped[5, 5, 3] == image[5, 5, 3]
+
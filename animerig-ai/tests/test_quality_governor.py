@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Quality governor tests
+Stepping down on sustained overruns, stepping up only after a longer quiet period
+"""
+
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from ai.optimization.quality_governor import QUALITY_LADDER, QualityGovernor
+
+TARGET = 1 / 60
+
+
+def make_governor(**kwargs):
+    applied = []
+    governor = QualityGovernor(TARGET, applied.append, **kwargs)
+    return governor, applied
+
+
+def feed(governor, frame_time, frames):
+    return [decision for decision in (governor.record(frame_time) for _ in range(frames)) if decision]
+
+
+def test_steps_down_after_patience():
+    governor, applied = make_governor(min_samples=30, down_patience=10)
+    top = governor.index
+    assert feed(governor, TARGET * 1.5, 38) == []
+
+    decisions = feed(governor, TARGET * 1.5, 1)
+    assert [d.direction for d in decisions] == ['down']
+    assert governor.index == top - 1 and applied == [QUALITY_LADDER[top - 1]]
+
+
+def test_isolated_spikes_do_not_step_down():
+    # One slow frame in twenty never reaches the 90th percentile
+    governor, _ = make_governor()
+    for _ in range(20):
+        feed(governor, TARGET * 0.8, 19)
+        feed(governor, TARGET * 3.0, 1)
+    assert governor.index == len(QUALITY_LADDER) - 1
+
+
+def test_hysteresis_band_holds_level():
+    governor, _ = make_governor(start_index=2)
+    # Between up_threshold and the target: neither faster nor slower is justified
+    assert feed(governor, TARGET * 0.8, 500) == []
+    assert governor.index == 2
+
+
+def test_steps_up_only_after_longer_patience():
+    governor, applied = make_governor(start_index=2, min_samples=30, up_patience=90)
+    assert feed(governor, TARGET * 0.3, 29 + 89) == []
+
+    decisions = feed(governor, TARGET * 0.3, 1)
+    assert [d.direction for d in decisions] == ['up']
+    assert applied == [QUALITY_LADDER[3]]
+
+    # Measurements restart after a change
+    assert len(governor.frame_times) == 0
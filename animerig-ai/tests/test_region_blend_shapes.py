@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Region blend shape tests
+Procedural facial blend shape offsets derived from the eye and mouth boxes
+"""
+
+import os
+import sys
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from ai.animation.region_blend_shapes import GAZE_SHAPES, region_blend_deltas
+
+REGIONS = {
+    'left_eye': (0.3, 0.3, 0.4, 0.4),
+    'right_eye': (0.6, 0.3, 0.7, 0.4),
+    'mouth': (0.4, 0.6, 0.6, 0.7)
+}
+
+
+def test_region_blend_deltas_cover_face_shapes():
+    vertices = np.stack(np.meshgrid(np.arange(0, 200, 4.0), np.arange(0, 200, 4.0)), axis=-1).reshape(-1, 2)
+    names, deltas = region_blend_deltas(vertices, REGIONS, (200, 200))
+
+    assert deltas.shape == (len(names), len(vertices), 2)
+    for name in ('eye_blink_L', 'eye_blink_R', 'brow_up_L', 'mouth_open', 'viseme_a', 'mouth_smile_R') + GAZE_SHAPES:
+        assert np.abs(deltas[names.index(name)]).max() > 1.0, name
+
+    # Blinking the image-left eye leaves the right one alone
+    blink = np.abs(deltas[names.index('eye_blink_L')]).max(axis=1)
+    near_right_eye = np.linalg.norm(vertices - [130.0, 70.0], axis=1) < 8.0
+    assert blink[near_right_eye].max() == 0.0
+
+
+def test_regions_missing_give_no_shapes():
+    names, deltas = region_blend_deltas(np.zeros((5, 2)), {}, (100, 100))
+    assert names == [] and deltas.shape == (0, 5, 2)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Skin binding tests
+Vectorized binder against the per-vertex reference and binding of a loaded character
+"""
+
+import os
+import sys
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from ai.animation.professional_animator import ProfessionalAnimator
+from ai.animation.skin_binding import bind_skin_weights, rig_to_image_matrix
+
+CHARACTER_IMAGE = os.path.join(project_root, 'assets', 'images', 'start_character.png')
+
+
+def reference_weights(vertices, bone_positions, radius, max_influences=4):
+    """The original per-vertex binding loop"""
+    weights = np.zeros((len(vertices), max_influences))
+    indices = np.zeros((len(vertices), max_influences), dtype=int)
+    for v, vertex in enumerate(vertices):
+        influences = []
+        for b, bone in enumerate(bone_positions):
+            distance = np.linalg.norm(vertex - bone)
+            if distance < radius:
+                influences.append((1.0 - distance / radius, b))
+        influences.sort(reverse=True)
+        influences = influences[:max_influences]
+        total = sum(weight for weight, _ in influences)
+        for slot, (weight, b) in enumerate(influences):
+            weights[v, slot] = weight / total
+            indices[v, slot] = b
+    return weights, indices
+
+
+def test_binder_matches_reference_loop():
+    rng = np.random.default_rng(3)
+    vertices = rng.uniform(0, 200, (300, 2))
+    bones = rng.uniform(0, 200, (24, 2))
+
+    weights, indices = bind_skin_weights(vertices, bones, 50.0)
+    expected_weights, expected_indices = reference_weights(vertices, bones, 50.0)
+
+    np.testing.assert_allclose(weights, expected_weights, atol=1e-6)
+    used = expected_weights > 0
+    np.testing.assert_array_equal(indices[used], expected_indices[used])
+
+
+def test_nearest_fallback_binds_unreached_vertices():
+    vertices = np.array([[0.0, 0.0], [1000.0, 0.0]])
+    bones = np.array([[0.0, 1.0], [900.0, 0.0]])
+
+    weights, _ = bind_skin_weights(vertices, bones, 5.0)
+    assert weights[1].sum() == 0.0
+
+    weights, indices = bind_skin_weights(vertices, bones, 5.0, nearest_fallback=True)
+    assert weights[1, 0] == 1.0 and indices[1, 0] == 1
+
+
+def test_rig_to_image_matrix_fills_box():
+    bones = np.array([[0.0, 0.0, 0.0], [0.0, 2.0, 0.0], [0.5, 1.0, 0.0]])
+    mapped = (rig_to_image_matrix(bones, (100, 50, 200, 400)) @ np.column_stack([bones, np.ones(3)]).T).T
+
+    # Rig bottom at the box bottom, rig top at the box top (image y points down)
+    np.testing.assert_allclose(mapped[0, :2], [150.0, 450.0])
+    np.testing.assert_allclose(mapped[1, :2], [150.0, 50.0])
+
+
+def test_loaded_character_is_bound_and_deforms():
+    animator = ProfessionalAnimator()
+    assert animator.load_character(CHARACTER_IMAGE)
+
+    height, width = animator.character_image.shape[:2]
+    for level, mesh in animator.mesh_lods.items():
+        bound = mesh['bone_weights'].sum(axis=1) > 0
+        assert bound.mean() > 0.9, level
+
+    # The bind pose leaves the mesh where it is
+    rest = animator.character_mesh['vertices']
+    deformed = animator._apply_skeletal_deformation(rest, animator.skeletal_system.get_bone_transforms())
+    np.testing.assert_allclose(deformed, rest, atol=1e-2)
+
+    # A pose moves it, and it stays on the image instead of collapsing to the origin
+    animator.set_pose('wave')
+    for _ in range(30):
+        animator.update(1 / 60)
+    deformed = animator._apply_skeletal_deformation(rest, animator.skeletal_system.get_bone_transforms())
+    assert np.abs(deformed - rest).max() > 1.0
+    assert np.abs(deformed).max() > 0.1 * max(width, height)
+
+
+def test_unbound_vertices_keep_rest_position():
+    animator = ProfessionalAnimator()
+    vertices = np.array([[10.0, 20.0], [30.0, 40.0]], dtype=np.float32)
+    animator.character_mesh = {
+        'vertices': vertices,
+        'bone_weights': np.zeros((2, 4), dtype=np.float32),
+        'bone_indices': np.zeros((2, 4), dtype=np.int32)
+    }
+    deformed = animator._apply_skeletal_deformation(vertices, animator.skeletal_system.get_bone_transforms())
+    np.testing.assert_array_equal(deformed, vertices)
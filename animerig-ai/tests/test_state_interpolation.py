@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+State interpolation tests
+Bone transforms blended between fixed simulation steps keep rigid rotations
+"""
+
+import os
+import sys
+
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from ai.animation.professional_animator import _blend_transforms
+
+
+def transform(degrees, translation, scale=1.0):
+    matrix = np.eye(4)
+    matrix[:3, :3] = Rotation.from_euler('z', degrees, degrees=True).as_matrix() * scale
+    matrix[:3, 3] = translation
+    return matrix
+
+
+def test_endpoints_are_exact():
+    start = np.stack([transform(10, [0, 0, 0]), transform(-30, [1, 2, 3], 2.0)])
+    end = np.stack([transform(100, [4, 0, 0]), transform(60, [0, 0, 0], 1.0)])
+    np.testing.assert_allclose(_blend_transforms(start, end, 0.0), start, atol=1e-9)
+    np.testing.assert_allclose(_blend_transforms(start, end, 1.0), end, atol=1e-9)
+
+
+def test_midpoint_slerps_rotation_and_lerps_translation():
+    start = transform(0, [0, 0, 0])[np.newaxis]
+    end = transform(90, [2, 4, 0])[np.newaxis]
+    blended = _blend_transforms(start, end, 0.5)[0]
+
+    np.testing.assert_allclose(blended, transform(45, [1, 2, 0]), atol=1e-9)
+    # A component-wise lerp would shrink the rotation to cos(45) ~ 0.71
+    np.testing.assert_allclose(np.linalg.norm(blended[:3, 0]), 1.0)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Track compression tests
+Keyframe reduction and the quantized encoding stay within their error bound
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from ai.animation_synthesis.track_compression import (decode_tracks, encode_tracks, max_reconstruction_error,
+                                                      reduce_track)
+from ai.animation_synthesis.tracks import Track
+
+
+def motion_track(keys=240, seed=0):
+    rng = np.random.default_rng(seed)
+    times = np.linspace(0.0, 4.0, keys)
+    values = np.column_stack([np.sin(times * (axis + 1)) + 1e-4 * rng.normal(size=keys) for axis in range(6)])
+    values[:, 5] = 50.0 * times  # wide-range channel
+    return Track(times, values)
+
+
+@pytest.mark.parametrize('tolerance', [1e-1, 1e-2, 1e-3])
+def test_reduce_track_within_tolerance(tolerance):
+    track = motion_track()
+    reduced = reduce_track(track, tolerance)
+    assert len(reduced) < len(track)
+    assert max_reconstruction_error(track, reduced) <= tolerance + 1e-6
+
+
+@pytest.mark.parametrize('tolerance', [1e-1, 1e-2, 1e-3])
+def test_encoded_tracks_within_tolerance(tolerance):
+    tracks = {'arm': motion_track(seed=1), 'leg': motion_track(seed=2), 'still': Track(np.zeros(1), np.ones((1, 3)))}
+    blob = encode_tracks(tracks, tolerance)
+    decoded = decode_tracks(blob)
+
+    assert set(decoded) == set(tracks)
+    for name, track in tracks.items():
+        # Times are stored as float32, so allow for their rounding too
+        assert max_reconstruction_error(track, decoded[name]) <= tolerance * (1 + 1e-3) + 1e-5, name
+    assert len(blob) < sum(track.nbytes for track in tracks.values())
+
+
+def test_zero_tolerance_is_lossless():
+    track = motion_track()
+    decoded = decode_tracks(encode_tracks({'arm': track}, 0.0))['arm']
+    assert len(decoded) == len(track)
+    np.testing.assert_array_equal(decoded.values, track.values)